@@ -0,0 +1,70 @@
+<?php
+// api_client.php - API helpers shared by index.php and entity.php
+// Expects session_start() and API_URL from the including page.
+
+// Every API call is made from this server, so the API would see one IP for all users.
+// Pass the browser's IP along; the API honours it only from its trusted proxies.
+function forwardedFor() {
+    return 'X-Forwarded-For: ' . ($_SERVER['REMOTE_ADDR'] ?? '');
+}
+
+// Swap the refresh token for a new access/refresh pair; false if the session is over
+function refreshToken() {
+    if (empty($_SESSION['refresh_token'])) return false;
+    
+    $ch = curl_init(API_URL . '/auth/refresh');
+    curl_setopt($ch, CURLOPT_RETURNTRANSFER, true);
+    curl_setopt($ch, CURLOPT_POST, true);
+    curl_setopt($ch, CURLOPT_HTTPHEADER, ['Content-Type: application/json', forwardedFor()]);
+    curl_setopt($ch, CURLOPT_POSTFIELDS, json_encode(['refresh_token' => $_SESSION['refresh_token']]));
+    
+    $response = curl_exec($ch);
+    $httpCode = curl_getinfo($ch, CURLINFO_HTTP_CODE);
+    curl_close($ch);
+    
+    if ($httpCode !== 200) {
+        unset($_SESSION['refresh_token']);
+        return false;
+    }
+    $data = json_decode($response, true);
+    $_SESSION['token'] = $data['access_token'];
+    $_SESSION['refresh_token'] = $data['refresh_token'];
+    return true;
+}
+
+// Authenticated request: ['code' => HTTP status, 'data' => decoded body].
+// Access tokens are short-lived: on 401/403 the token is renewed once and the call retried.
+// If it can't be renewed the session token is dropped, so the page can send the user to log in.
+function apiRequest($endpoint, $method = 'GET', $data = null, $retry = true) {
+    if (!isset($_SESSION['token'])) return ['code' => 401, 'data' => null];
+    
+    $ch = curl_init(API_URL . $endpoint);
+    curl_setopt($ch, CURLOPT_RETURNTRANSFER, true);
+    curl_setopt($ch, CURLOPT_HTTPHEADER, [
+        'Authorization: Bearer ' . $_SESSION['token'],
+        'Content-Type: application/json',
+        forwardedFor()
+    ]);
+    
+    if ($method === 'POST') {
+        curl_setopt($ch, CURLOPT_POST, true);
+        curl_setopt($ch, CURLOPT_POSTFIELDS, json_encode($data));
+    } elseif ($method === 'PUT') {
+        curl_setopt($ch, CURLOPT_CUSTOMREQUEST, 'PUT');
+        curl_setopt($ch, CURLOPT_POSTFIELDS, json_encode($data));
+    } elseif ($method === 'DELETE') {
+        curl_setopt($ch, CURLOPT_CUSTOMREQUEST, 'DELETE');
+    }
+    
+    $response = curl_exec($ch);
+    $httpCode = curl_getinfo($ch, CURLINFO_HTTP_CODE);
+    curl_close($ch);
+    
+    if (($httpCode === 401 || $httpCode === 403) && $retry) {
+        if (refreshToken()) {
+            return apiRequest($endpoint, $method, $data, false);
+        }
+        unset($_SESSION['token']);
+    }
+    return ['code' => $httpCode, 'data' => json_decode($response, true)];
+}
@@ -1,11 +1,12 @@
 # app/api/v1/absence_requests.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.config.database import get_db
 from app.schemas.absence_request_schema import AbsenceRequestCreate, AbsenceRequestOut
 from app.repositories.absence_request_repository import AbsenceRequestRepository
 from app.core.auth_bearer import JWTBearer
+from app.core.pagination import PageParams, paginate
 
 router = APIRouter()
 repo = AbsenceRequestRepository()
@@ -16,8 +17,8 @@ def create_absence_request(payload: AbsenceRequestCreate, db: Session = Depends(
     return db_obj
 
 @router.get("/", response_model=List[AbsenceRequestOut], dependencies=[Depends(JWTBearer())])
-def list_absence_requests(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return repo.get_multi(db=db, skip=skip, limit=limit)
+def list_absence_requests(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(repo, db, response, page, schema=AbsenceRequestOut)
 
 @router.get("/{id}", response_model=AbsenceRequestOut, dependencies=[Depends(JWTBearer())])
 def get_absence_request(id: int, db: Session = Depends(get_db)):
@@ -1,11 +1,12 @@
 # app/api/v1/approval_history.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.config.database import get_db
 from app.schemas.approval_history_schema import ApprovalHistoryCreate, ApprovalHistoryOut
 from app.repositories.approval_history_repository import ApprovalHistoryRepository
 from app.core.auth_bearer import JWTBearer
+from app.core.pagination import PageParams, paginate
 
 router = APIRouter()
 repo = ApprovalHistoryRepository()
@@ -16,8 +17,8 @@ def create_approval_history(payload: ApprovalHistoryCreate, db: Session = Depend
     return db_obj
 
 @router.get("/", response_model=List[ApprovalHistoryOut], dependencies=[Depends(JWTBearer())])
-def list_approval_history(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return repo.get_multi(db=db, skip=skip, limit=limit)
+def list_approval_history(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(repo, db, response, page, schema=ApprovalHistoryOut)
 
 @router.get("/{id}", response_model=ApprovalHistoryOut, dependencies=[Depends(JWTBearer())])
 def get_approval_history(id: int, db: Session = Depends(get_db)):
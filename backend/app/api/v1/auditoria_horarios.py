@@ -1,11 +1,12 @@
 # app/api/v1/auditoria_horarios.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.config.database import get_db
 from app.schemas.auditoria_horarios_schema import AuditoriaHorariosCreate, AuditoriaHorariosOut
 from app.repositories.auditoria_horarios_repository import AuditoriaHorariosRepository
 from app.core.auth_bearer import JWTBearer
+from app.core.pagination import PageParams, paginate
 
 router = APIRouter()
 repo = AuditoriaHorariosRepository()
@@ -16,8 +17,8 @@ def create_auditoria_horarios(payload: AuditoriaHorariosCreate, db: Session = De
     return db_obj
 
 @router.get("/", response_model=List[AuditoriaHorariosOut], dependencies=[Depends(JWTBearer())])
-def list_auditoria_horarios(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return repo.get_multi(db=db, skip=skip, limit=limit)
+def list_auditoria_horarios(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(repo, db, response, page, schema=AuditoriaHorariosOut)
 
 @router.get("/{id}", response_model=AuditoriaHorariosOut, dependencies=[Depends(JWTBearer())])
 def get_auditoria_horarios(id: int, db: Session = Depends(get_db)):
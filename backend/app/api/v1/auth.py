@@ -1,24 +1,113 @@
 # app/api/v1/auth.py
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
 from app.config.database import get_db
-from app.schemas.auth_schema import LoginRequest, TokenResponse
+from app.schemas.auth_schema import LoginRequest, RefreshRequest, TokenResponse
 from app.repositories.user_repository import UserRepository
-from app.core.security import verify_password, create_access_token
-from datetime import timedelta
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.models.refresh_token import RefreshToken
+from fastapi.concurrency import run_in_threadpool
+from app.core.hashing import password_hasher
+from app.core.security import (
+    ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS,
+    create_access_token, create_refresh_token, hash_refresh_token
+)
+from app.core.auth_bearer import JWTBearer
+from app.core.revocation import REVOKING_STATUSES, revocations
+from app.core.token_cache import token_cache
+from datetime import datetime, timedelta
+from typing import Optional
+import uuid
 from app.config.settings import settings
 
 router = APIRouter()
 user_repo = UserRepository()
+refresh_repo = RefreshTokenRepository()
+
+
+def _new_refresh_token(db: Session, user_id: int, family_id: str) -> str:
+    """Añade a la sesión un refresh token de ``family_id`` (sin commit) y devuelve el token en claro"""
+    token, token_hash = create_refresh_token(family_id)
+    db.add(RefreshToken(
+        user_id=user_id,
+        family_id=family_id,
+        token_hash=token_hash,
+        expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    ))
+    return token
 
-@router.post("/login", response_model=TokenResponse)
-def login(form: LoginRequest, response: Response, db: Session = Depends(get_db)):
-    user = user_repo.get_by_email(db=db, email=form.email)
-    if not user or not verify_password(form.password, user.password_hash):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciales inválidas")
 
+def _login_session(db: Session, user_id: int) -> str:
+    token = _new_refresh_token(db, user_id, family_id=uuid.uuid4().hex)
+    db.commit()
+    return token
+
+
+def _token_response(user, refresh_token: str, response: Response) -> dict:
     token = create_access_token({"sub": str(user.id), "email": user.email, "role": user.role})
     # Opción: devolver el JWT también como cookie httpOnly (más seguro)
     if settings.JWT_SET_COOKIE:
         response.set_cookie(key="access_token", value=token, httponly=True, secure=settings.ENVIRONMENT=="production", samesite="lax")
-    return {"access_token": token, "token_type": "bearer", "expires_in": 60*24*60}
+    return {
+        "access_token": token,
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        "refresh_token": refresh_token
+    }
+
+
+@router.post("/login", response_model=TokenResponse)
+async def login(form: LoginRequest, response: Response, db: Session = Depends(get_db)):
+    # bcrypt corre en el pool de hashing; solo las consultas usan el threadpool
+    user = await run_in_threadpool(user_repo.get_by_email, db=db, email=form.email)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciales inválidas")
+    valid, new_hash = await password_hasher.verify_and_update(form.password, user.password_hash)
+    if not valid:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciales inválidas")
+    if user.employee_status in REVOKING_STATUSES:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Usuario dado de baja")
+    if new_hash:
+        # Hash con un costo distinto al de BCRYPT_ROUNDS: se guarda el recalculado
+        await run_in_threadpool(user_repo.update, db=db, db_obj=user, obj_in={"password_hash": new_hash})
+
+    refresh_token = await run_in_threadpool(_login_session, db, user.id)
+    return _token_response(user, refresh_token, response)
+
+@router.post("/refresh", response_model=TokenResponse)
+def refresh(payload: RefreshRequest, response: Response, db: Session = Depends(get_db)):
+    """Cambia un refresh token por un access token nuevo y otro refresh token (rotación)"""
+    now = datetime.utcnow()
+    stored = refresh_repo.get_by_hash(db, hash_refresh_token(payload.refresh_token), for_update=True)
+    if not stored or stored.revoked_at is not None or stored.expires_at <= now:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token inválido o expirado")
+    if stored.used_at is not None:
+        # Un token ya rotado vuelve a usarse: alguien más lo tiene, se revoca toda la familia
+        refresh_repo.revoke_family(db, stored.family_id)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token reutilizado, sesión revocada")
+
+    user = user_repo.get(db=db, id=stored.user_id)
+    if not user or user.employee_status in REVOKING_STATUSES:
+        refresh_repo.revoke_family(db, stored.family_id)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token inválido o expirado")
+
+    stored.used_at = now
+    refresh_token = _new_refresh_token(db, user.id, family_id=stored.family_id)
+    db.commit()
+    return _token_response(user, refresh_token, response)
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    request: Request,
+    payload: Optional[RefreshRequest] = None,
+    token: str = Depends(JWTBearer()),
+    db: Session = Depends(get_db)
+):
+    # El token queda revocado en todos los workers hasta su expiración
+    revocations.revoke_token(request.state.user)
+    token_cache.invalidate(token)
+    # Con el refresh token se cierra también la sesión de larga duración
+    if payload:
+        stored = refresh_repo.get_by_hash(db, hash_refresh_token(payload.refresh_token))
+        if stored and str(stored.user_id) == str(request.state.user.get("sub")):
+            refresh_repo.revoke_family(db, stored.family_id)
@@ -1,11 +1,12 @@
 # app/api/v1/dependents.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.config.database import get_db
 from app.schemas.dependent_schema import DependentCreate, DependentOut
 from app.repositories.dependent_repository import DependentRepository
 from app.core.auth_bearer import JWTBearer
+from app.core.pagination import PageParams, paginate
 
 router = APIRouter()
 repo = DependentRepository()
@@ -16,8 +17,8 @@ def create_dependent(payload: DependentCreate, db: Session = Depends(get_db)):
     return db_obj
 
 @router.get("/", response_model=List[DependentOut], dependencies=[Depends(JWTBearer())])
-def list_dependents(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return repo.get_multi(db=db, skip=skip, limit=limit)
+def list_dependents(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(repo, db, response, page, schema=DependentOut)
 
 @router.get("/{id}", response_model=DependentOut, dependencies=[Depends(JWTBearer())])
 def get_dependent(id: int, db: Session = Depends(get_db)):
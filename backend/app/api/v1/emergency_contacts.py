@@ -1,11 +1,12 @@
 # app/api/v1/emergency_contacts.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.config.database import get_db
 from app.schemas.emergency_contact_schema import EmergencyContactCreate, EmergencyContactOut
 from app.repositories.emergency_contact_repository import EmergencyContactRepository
 from app.core.auth_bearer import JWTBearer
+from app.core.pagination import PageParams, paginate
 
 router = APIRouter()
 repo = EmergencyContactRepository()
@@ -16,8 +17,8 @@ def create_emergency_contact(payload: EmergencyContactCreate, db: Session = Depe
     return db_obj
 
 @router.get("/", response_model=List[EmergencyContactOut], dependencies=[Depends(JWTBearer())])
-def list_emergency_contacts(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return repo.get_multi(db=db, skip=skip, limit=limit)
+def list_emergency_contacts(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(repo, db, response, page, schema=EmergencyContactOut)
 
 @router.get("/{id}", response_model=EmergencyContactOut, dependencies=[Depends(JWTBearer())])
 def get_emergency_contact(id: int, db: Session = Depends(get_db)):
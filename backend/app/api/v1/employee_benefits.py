@@ -1,11 +1,13 @@
 # app/api/v1/employee_benefits.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.config.database import get_db
 from app.schemas.employee_benefit_schema import EmployeeBenefitCreate, EmployeeBenefitOut
 from app.repositories.employee_benefit_repository import EmployeeBenefitRepository
 from app.core.auth_bearer import JWTBearer
+from app.core.pagination import PageParams, paginate
+from app.core.response_cache import response_cache
 
 router = APIRouter()
 repo = EmployeeBenefitRepository()
@@ -16,8 +18,8 @@ def create_employee_benefit(payload: EmployeeBenefitCreate, db: Session = Depend
     return db_obj
 
 @router.get("/", response_model=List[EmployeeBenefitOut], dependencies=[Depends(JWTBearer())])
-def list_employee_benefits(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return repo.get_multi(db=db, skip=skip, limit=limit)
+def list_employee_benefits(request: Request, response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return response_cache.serve(request, db, ("employee_benefits",), lambda: paginate(repo, db, response, page, schema=EmployeeBenefitOut))
 
 @router.get("/{id}", response_model=EmployeeBenefitOut, dependencies=[Depends(JWTBearer())])
 def get_employee_benefit(id: int, db: Session = Depends(get_db)):
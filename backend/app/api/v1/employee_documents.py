@@ -1,11 +1,12 @@
 # app/api/v1/employee_documents.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.config.database import get_db
 from app.schemas.employee_document_schema import EmployeeDocumentCreate, EmployeeDocumentOut
 from app.repositories.employee_document_repository import EmployeeDocumentRepository
 from app.core.auth_bearer import JWTBearer
+from app.core.pagination import PageParams, paginate
 
 router = APIRouter()
 repo = EmployeeDocumentRepository()
@@ -16,8 +17,8 @@ def create_employee_document(payload: EmployeeDocumentCreate, db: Session = Depe
     return db_obj
 
 @router.get("/", response_model=List[EmployeeDocumentOut], dependencies=[Depends(JWTBearer())])
-def list_employee_documents(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return repo.get_multi(db=db, skip=skip, limit=limit)
+def list_employee_documents(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(repo, db, response, page, schema=EmployeeDocumentOut)
 
 @router.get("/{id}", response_model=EmployeeDocumentOut, dependencies=[Depends(JWTBearer())])
 def get_employee_document(id: int, db: Session = Depends(get_db)):
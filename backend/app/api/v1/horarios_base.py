@@ -1,11 +1,14 @@
 # app/api/v1/horarios_base.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.config.database import get_db
 from app.schemas.horario_base_schema import HorarioBaseCreate, HorarioBaseUpdate, HorarioBaseOut
 from app.repositories.horario_base_repository import HorarioBaseRepository
+from app.core.pagination import PageParams, paginate
+from app.core.response_cache import response_cache
+from app.core.turno_catalog import turno_catalog
 
 # Si usas auth JWT:
 # from app.core.auth_bearer import JWTBearer
@@ -15,8 +18,8 @@ router = APIRouter()
 repo = HorarioBaseRepository()
 
 @router.get("/", response_model=List[HorarioBaseOut])
-def list_horarios(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return repo.get_multi(db=db, skip=skip, limit=limit)
+def list_horarios(request: Request, response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return response_cache.serve(request, db, ("horarios_base",), lambda: paginate(repo, db, response, page, schema=HorarioBaseOut))
 
 @router.get("/by-empleado/{empleado_id}", response_model=List[HorarioBaseOut])
 def list_by_empleado(empleado_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
@@ -31,7 +34,9 @@ def get_horario(id: int, db: Session = Depends(get_db)):
 
 @router.post("/", response_model=HorarioBaseOut, status_code=status.HTTP_201_CREATED)
 def create_horario(payload: HorarioBaseCreate, db: Session = Depends(get_db)):
-    # puedes validar que empleado y turno existan (FK)
+    # puedes validar que empleado exista (FK); el turno se valida contra el catálogo en memoria
+    if not turno_catalog.get(payload.turno_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Turno not found")
     return repo.create(db=db, obj_in=payload)
 
 @router.put("/{id}", response_model=HorarioBaseOut)
@@ -39,6 +44,8 @@ def update_horario(id: int, payload: HorarioBaseUpdate, db: Session = Depends(ge
     obj = repo.get(db=db, id=id)
     if not obj:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Horario not found")
+    if payload.turno_id is not None and not turno_catalog.get(payload.turno_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Turno not found")
     updated = repo.update(db=db, db_obj=obj, obj_in=payload.dict(exclude_unset=True))
     return updated
 
@@ -1,11 +1,12 @@
 # app/api/v1/job_history.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.config.database import get_db
 from app.schemas.job_history_schema import JobHistoryCreate, JobHistoryOut
 from app.repositories.job_history_repository import JobHistoryRepository
 from app.core.auth_bearer import JWTBearer
+from app.core.pagination import PageParams, paginate
 
 router = APIRouter()
 repo = JobHistoryRepository()
@@ -27,19 +28,16 @@ def create_job_history(user_id: int, payload: JobHistoryCreate, db: Session = De
     return db_obj
 
 @router.get("/", response_model=List[JobHistoryOut], dependencies=[Depends(JWTBearer())])
-def list_job_history(user_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def list_job_history(user_id: int, response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
     """
     List all job history records for a specific user.
-    Filters by user_id (employee_id) automatically.
+    Filters by user_id (employee_id) in the query, so pagination is per user.
     """
-    # If your repository has a method to filter by employee_id, use it:
-    # return repo.get_by_employee(db=db, employee_id=user_id, skip=skip, limit=limit)
-    
-    # Otherwise, get all and filter (less efficient):
-    all_records = repo.get_multi(db=db, skip=skip, limit=limit)
-    # Filter by employee_id if your model has this field
-    filtered = [r for r in all_records if getattr(r, 'employee_id', None) == user_id]
-    return filtered
+    return paginate(
+        repo, db, response,
+        page, schema=JobHistoryOut,
+        filters={"employee_id": user_id},
+    )
 
 @router.get("/{id}", response_model=JobHistoryOut, dependencies=[Depends(JWTBearer())])
 def get_job_history(user_id: int, id: int, db: Session = Depends(get_db)):
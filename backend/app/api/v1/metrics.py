@@ -0,0 +1,20 @@
+# app/api/v1/metrics.py
+import hmac
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+from app.config.settings import settings
+from app.core.metrics import CONTENT_TYPE, metrics_registry
+
+router = APIRouter()
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    """Métricas de todos los workers en formato de exposición de Prometheus"""
+    # Sin token solo se sirve en desarrollo
+    if not settings.METRICS_TOKEN and settings.ENVIRONMENT != "development":
+        raise HTTPException(status_code=403, detail="No autorizado")
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not hmac.compare_digest(request.headers.get("authorization", ""), expected):
+            raise HTTPException(status_code=403, detail="No autorizado")
+    return Response(content=await metrics_registry.render(), media_type=CONTENT_TYPE)
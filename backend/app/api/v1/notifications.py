@@ -1,11 +1,12 @@
 # app/api/v1/notifications.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.config.database import get_db
 from app.schemas.notification_schema import NotificationCreate, NotificationOut
 from app.repositories.notification_repository import NotificationRepository
 from app.core.auth_bearer import JWTBearer
+from app.core.pagination import PageParams, paginate
 
 router = APIRouter()
 repo = NotificationRepository()
@@ -16,8 +17,8 @@ def create_notification(payload: NotificationCreate, db: Session = Depends(get_d
     return db_obj
 
 @router.get("/", response_model=List[NotificationOut], dependencies=[Depends(JWTBearer())])
-def list_notifications(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return repo.get_multi(db=db, skip=skip, limit=limit)
+def list_notifications(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(repo, db, response, page, schema=NotificationOut)
 
 @router.get("/{id}", response_model=NotificationOut, dependencies=[Depends(JWTBearer())])
 def get_notification(id: int, db: Session = Depends(get_db)):
@@ -1,11 +1,13 @@
 # app/api/v1/payroll_history.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.config.database import get_db
 from app.schemas.payroll_history_schema import PayrollHistoryCreate, PayrollHistoryOut
 from app.repositories.payroll_history_repository import PayrollHistoryRepository
 from app.core.auth_bearer import JWTBearer
+from app.core.pagination import PageParams, paginate
+from app.core.streaming import iter_rows, ndjson_response
 
 router = APIRouter()
 repo = PayrollHistoryRepository()
@@ -16,8 +18,14 @@ def create_payroll_history(payload: PayrollHistoryCreate, db: Session = Depends(
     return db_obj
 
 @router.get("/", response_model=List[PayrollHistoryOut], dependencies=[Depends(JWTBearer())])
-def list_payroll_history(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return repo.get_multi(db=db, skip=skip, limit=limit)
+def list_payroll_history(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(repo, db, response, page, schema=PayrollHistoryOut)
+
+@router.get("/export", dependencies=[Depends(JWTBearer())])
+def export_payroll_history(employee_id: Optional[int] = None, chunk_size: int = Query(1000, ge=1, le=10000)):
+    filters = {"employee_id": employee_id} if employee_id is not None else None
+    rows = iter_rows(repo, filters=filters, chunk_size=chunk_size)
+    return ndjson_response(rows, PayrollHistoryOut, filename="payroll_history.ndjson")
 
 @router.get("/{id}", response_model=PayrollHistoryOut, dependencies=[Depends(JWTBearer())])
 def get_payroll_history(id: int, db: Session = Depends(get_db)):
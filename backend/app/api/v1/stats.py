@@ -0,0 +1,13 @@
+# app/api/v1/stats.py
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.config.database import get_db
+from app.core.auth_bearer import JWTBearer
+from app.core.stats import stats_cache
+
+router = APIRouter()
+
+@router.get("/summary", dependencies=[Depends(JWTBearer())])
+def get_stats_summary(db: Session = Depends(get_db)):
+    """Total por entidad y desglose por estado, sin recorrer los listados"""
+    return stats_cache.summary(db)
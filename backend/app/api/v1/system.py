@@ -0,0 +1,47 @@
+# app/api/v1/system.py
+from fastapi import APIRouter, Depends, Query
+from app.config.database import active_engines, replicas
+from app.core.audit import audit_sink
+from app.core.auth_bearer import JWTBearer
+from app.core.pool_metrics import pool_status
+from app.core.response_cache import response_cache
+from app.core.slow_queries import slow_query_log
+from app.core.token_cache import token_cache
+from app.core.turno_catalog import turno_catalog
+
+router = APIRouter()
+
+@router.get("/db-pool", dependencies=[Depends(JWTBearer())])
+def get_db_pool_status():
+    """Conexiones en uso / libres y espera acumulada al pedir una conexión, por motor"""
+    return {name: pool_status(engine) for name, engine in active_engines().items()}
+
+@router.get("/db-replicas", dependencies=[Depends(JWTBearer())])
+def get_db_replicas_status():
+    """Réplicas de lectura configuradas, su último retraso medido y si están en rotación"""
+    return replicas.status()
+
+@router.get("/token-cache", dependencies=[Depends(JWTBearer())])
+def get_token_cache_stats():
+    """Aciertos / fallos de la caché de tokens verificados de este proceso"""
+    return token_cache.stats()
+
+@router.get("/audit-log", dependencies=[Depends(JWTBearer())])
+def get_audit_log_stats():
+    """Registros de auditoría en cola, escritos y descartados por este proceso"""
+    return audit_sink.stats()
+
+@router.get("/slow-queries", dependencies=[Depends(JWTBearer())])
+def get_slow_queries(limit: int = Query(20, ge=1, le=200)):
+    """Consultas lentas de este proceso agrupadas por fingerprint, por tiempo total"""
+    return {"threshold_seconds": slow_query_log.threshold, "fingerprints": slow_query_log.top(limit)}
+
+@router.get("/response-cache", dependencies=[Depends(JWTBearer())])
+def get_response_cache_stats():
+    """Entradas, aciertos y respuestas 304 de la caché de catálogos de este proceso"""
+    return response_cache.stats()
+
+@router.get("/turno-catalog", dependencies=[Depends(JWTBearer())])
+def get_turno_catalog_stats():
+    """Turnos en memoria de este proceso, versión cargada y número de recargas"""
+    return turno_catalog.stats()
@@ -1,11 +1,12 @@
 # app/api/v1/time_off_balances.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.config.database import get_db
 from app.schemas.time_off_balance_schema import TimeOffBalanceCreate, TimeOffBalanceOut
 from app.repositories.time_off_balance_repository import TimeOffBalanceRepository
 from app.core.auth_bearer import JWTBearer
+from app.core.pagination import PageParams, paginate
 
 router = APIRouter()
 repo = TimeOffBalanceRepository()
@@ -16,8 +17,8 @@ def create_time_off_balance(payload: TimeOffBalanceCreate, db: Session = Depends
     return db_obj
 
 @router.get("/", response_model=List[TimeOffBalanceOut], dependencies=[Depends(JWTBearer())])
-def list_time_off_balances(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return repo.get_multi(db=db, skip=skip, limit=limit)
+def list_time_off_balances(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(repo, db, response, page, schema=TimeOffBalanceOut)
 
 @router.get("/{id}", response_model=TimeOffBalanceOut, dependencies=[Depends(JWTBearer())])
 def get_time_off_balance(id: int, db: Session = Depends(get_db)):
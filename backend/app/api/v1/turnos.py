@@ -1,30 +1,34 @@
 # app/api/v1/turnos.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.config.database import get_db
 from app.schemas.turno_schema import TurnoCreate, TurnoOut
 from app.repositories.turno_repository import TurnoRepository
 from app.core.auth_bearer import JWTBearer
+from app.core.pagination import PageParams, paginate
+from app.core.response_cache import response_cache
+from app.core.turno_catalog import turno_catalog
 
 router = APIRouter()
 repo = TurnoRepository()
 
 @router.post("/", response_model=TurnoOut, status_code=status.HTTP_201_CREATED, dependencies=[Depends(JWTBearer())])
 def create_turno(payload: TurnoCreate, db: Session = Depends(get_db)):
+    # Se decide con la base de datos: el catálogo puede ir por detrás de otro worker
     existing = repo.get_by_codigo(db=db, codigo=payload.codigo)
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Código de turno ya registrado")
     db_obj = repo.create(db=db, obj_in=payload)
-    return db_obj
+    return turno_catalog.put(db_obj)
 
 @router.get("/", response_model=List[TurnoOut], dependencies=[Depends(JWTBearer())])
-def list_turnos(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return repo.get_multi(db=db, skip=skip, limit=limit)
+def list_turnos(request: Request, response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return response_cache.serve(request, db, ("turnos",), lambda: paginate(repo, db, response, page, schema=TurnoOut))
 
 @router.get("/{id}", response_model=TurnoOut, dependencies=[Depends(JWTBearer())])
-def get_turno(id: int, db: Session = Depends(get_db)):
-    obj = repo.get(db=db, id=id)
+def get_turno(id: int):
+    obj = turno_catalog.get(id)
     if not obj:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Turno no encontrado")
     return obj
@@ -35,7 +39,7 @@ def update_turno(id: int, payload: TurnoCreate, db: Session = Depends(get_db)):
     if not obj:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Turno no encontrado")
     obj = repo.update(db=db, db_obj=obj, obj_in=payload)
-    return obj
+    return turno_catalog.put(obj)
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(JWTBearer())])
 def delete_turno(id: int, db: Session = Depends(get_db)):
@@ -43,4 +47,5 @@ def delete_turno(id: int, db: Session = Depends(get_db)):
     if not obj:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Turno no encontrado")
     repo.delete(db=db, id=id)
+    turno_catalog.remove(id)
     return
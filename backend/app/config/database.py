@@ -1,25 +1,123 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from typing import AsyncIterator, Dict, Optional
 from app.config.settings import settings
+from app.config.replicas import RecentWrites, ReplicaSet, RoutingSession, track_writes
+from app.core.pool_metrics import InstrumentedAsyncPool, InstrumentedQueuePool, instrumented_pool_class
+
+# --- Opciones del pool, compartidas por los motores sync y async ---
+# pool_recycle queda por debajo del wait_timeout de MariaDB y de los proxies;
+# con LIFO las conexiones sobrantes se quedan ociosas y el recycle las cierra.
+POOL_OPTIONS = dict(
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    pool_use_lifo=settings.DATABASE_POOL_USE_LIFO,
+    echo=settings.DATABASE_ECHO
+)
 
 # --- Crear motor de base de datos ---
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=settings.DEBUG
+    poolclass=InstrumentedQueuePool,
+    **POOL_OPTIONS
 )
 
 # --- Crear base declarativa para modelos ---
 Base = declarative_base()
 
+# --- Réplicas de lectura (vacío = todo va al primario) ---
+replicas = ReplicaSet(
+    settings.DATABASE_URL,
+    settings.DB_REPLICA_HOSTS,
+    max_lag=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.DB_REPLICA_CHECK_INTERVAL,
+    engine_options=POOL_OPTIONS,
+    poolclass_factory=instrumented_pool_class
+)
+recent_writes = RecentWrites(settings.DB_READ_YOUR_WRITES_SECONDS)
+
 # --- Crear fábrica de sesiones ---
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
+track_writes(SessionLocal, recent_writes)
+
+# --- Motor y sesiones asíncronas ---
+# El motor se crea al primer uso: así las instalaciones sin aiomysql/asyncmy
+# siguen arrancando mientras ninguna ruta use get_async_db.
+# expire_on_commit=False evita recargas implícitas (no permitidas en async)
+# al serializar objetos después del commit.
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+_async_engine: Optional[AsyncEngine] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            settings.ASYNC_DATABASE_URL,
+            poolclass=InstrumentedAsyncPool,
+            **POOL_OPTIONS
+        )
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+
+def active_engines() -> Dict[str, Engine]:
+    """Motores con pool abierto, para métricas (el async solo si ya se creó)"""
+    engines = {"sync": engine}
+    for host, replica in replicas.engines.items():
+        engines[f"replica:{host}"] = replica
+    if _async_engine is not None:
+        engines["async"] = _async_engine.sync_engine
+    return engines
+
+
+async def dispose_async_engine():
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
 
 
 # --- Dependencia para FastAPI ---
-def get_db():
+READ_METHODS = ("GET", "HEAD")
+
+
+def _user_key(request: Request) -> Optional[str]:
+    user = getattr(request.state, "user", None)
+    if user and user.get("sub"):
+        return f"user:{user['sub']}"
+    return f"ip:{request.client.host}" if request.client else None
+
+
+def read_session() -> RoutingSession:
+    """Sesión de solo lectura que usa una réplica si hay alguna disponible"""
     db = SessionLocal()
+    db.info["replica"] = replicas.choose()
+    return db
+
+
+def get_db(request: Request = None):
+    # GET/HEAD leen de una réplica, salvo que el usuario haya escrito hace poco.
+    # Fuera de una petición (scripts) todo va al primario.
+    db = SessionLocal()
+    if request is not None:
+        user_key = _user_key(request)
+        db.info["user_key"] = user_key
+        if request.method in READ_METHODS and replicas and not recent_writes.is_recent(user_key):
+            db.info["replica"] = replicas.choose()
     try:
         yield db
     finally:
         db.close()
+
+
+# --- Dependencia asíncrona para rutas `async def` ---
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
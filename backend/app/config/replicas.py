@@ -0,0 +1,171 @@
+# app/config/replicas.py
+import logging
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+from sqlalchemy import Engine, create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Delete, Insert, Update
+from sqlalchemy.sql.elements import TextClause
+
+logger = logging.getLogger(__name__)
+
+# Prefijos de SQL literal (text()) que se consideran lecturas
+_READ_ONLY_SQL = ("SELECT", "SHOW", "EXPLAIN", "WITH")
+
+
+class ReplicaSet:
+    """
+    Réplicas de lectura de MariaDB con control de retraso.
+
+    El retraso (``Seconds_Behind_Master``) se consulta como mucho una vez cada
+    ``check_interval`` segundos por réplica, en el hilo de la petición que elige
+    réplica. Las réplicas con más de ``max_lag`` segundos, con la replicación
+    detenida o que no responden se saltan hasta la siguiente comprobación.
+    """
+
+    def __init__(
+        self,
+        primary_url: str,
+        hosts: List[str],
+        max_lag: float,
+        check_interval: float,
+        engine_options: Optional[dict] = None,
+        poolclass_factory=None,
+    ):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.engines: Dict[str, Engine] = {}
+        url = make_url(primary_url)
+        for host in hosts:
+            name, _, port = host.partition(":")
+            options = dict(engine_options or {})
+            if poolclass_factory is not None:
+                options["poolclass"] = poolclass_factory()
+            self.engines[host] = create_engine(
+                url.set(host=name, port=int(port) if port else url.port), **options
+            )
+        self._healthy: Dict[str, bool] = {host: True for host in self.engines}
+        self._lag: Dict[str, Optional[float]] = {host: None for host in self.engines}
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def choose(self) -> Optional[Engine]:
+        """Una réplica sana al azar, o None para usar el primario"""
+        if not self.engines:
+            return None
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.refresh()
+        healthy = [host for host, ok in self._healthy.items() if ok]
+        if not healthy:
+            return None
+        return self.engines[random.choice(healthy)]
+
+    def refresh(self) -> None:
+        """Vuelve a medir el retraso de cada réplica (solo un hilo a la vez)"""
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            for host, engine in self.engines.items():
+                lag = self._measure_lag(host, engine)
+                self._lag[host] = lag
+                healthy = lag is not None and lag <= self.max_lag
+                if healthy != self._healthy[host]:
+                    logger.warning(f"Replica {host} {'back in rotation' if healthy else 'skipped'} (lag={lag})")
+                self._healthy[host] = healthy
+            self._checked_at = time.monotonic()
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def _measure_lag(host: str, engine: Engine) -> Optional[float]:
+        if engine.dialect.name not in ("mysql", "mariadb"):
+            return 0.0
+        try:
+            with engine.connect() as conn:
+                row = conn.execute(text("SHOW SLAVE STATUS")).mappings().first()
+        except Exception as exc:
+            logger.warning(f"Replica {host} unreachable: {exc}")
+            return None
+        if row is None:
+            # El servidor no está configurado como réplica
+            return None
+        lag = row.get("Seconds_Behind_Master")
+        return float(lag) if lag is not None else None
+
+    def status(self) -> Dict[str, dict]:
+        return {
+            host: {"healthy": self._healthy[host], "lag_seconds": self._lag[host]}
+            for host in self.engines
+        }
+
+
+class RecentWrites:
+    """
+    Cuándo escribió cada usuario por última vez, para leer del primario
+    durante ``window`` segundos después (read-your-writes).
+
+    Vive en memoria del proceso: con varios workers, una lectura atendida por
+    otro worker dentro de la ventana puede ir a una réplica, acotada por
+    ``DB_REPLICA_MAX_LAG_SECONDS``.
+    """
+
+    def __init__(self, window: float, max_entries: int = 10000):
+        self.window = window
+        self.max_entries = max_entries
+        self._writes: Dict[str, float] = {}
+
+    def record(self, key: Optional[str]) -> None:
+        if not key or self.window <= 0:
+            return
+        now = time.monotonic()
+        if len(self._writes) >= self.max_entries:
+            self._writes = {k: t for k, t in self._writes.items() if now - t < self.window}
+        self._writes[key] = now
+
+    def is_recent(self, key: Optional[str]) -> bool:
+        if not key:
+            return False
+        written = self._writes.get(key)
+        return written is not None and time.monotonic() - written < self.window
+
+
+def is_write(clause) -> bool:
+    if isinstance(clause, (Insert, Update, Delete)):
+        return True
+    if isinstance(clause, TextClause):
+        return not clause.text.lstrip().upper().startswith(_READ_ONLY_SQL)
+    return False
+
+
+class RoutingSession(Session):
+    """
+    Sesión que envía lecturas a ``info["replica"]`` cuando se le asigna una.
+
+    En cuanto la sesión escribe (flush o INSERT/UPDATE/DELETE explícito) deja
+    de usar la réplica, así que las lecturas posteriores de la misma petición
+    (p. ej. el ``refresh`` tras ``create``) ven lo que acaba de escribir.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or is_write(clause):
+            self.info["wrote"] = True
+            self.info.pop("replica", None)
+        replica = self.info.get("replica")
+        if replica is not None:
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+def track_writes(session_class, recent_writes: RecentWrites) -> None:
+    """Registra en ``recent_writes`` al usuario de cada sesión que confirma escrituras"""
+
+    @event.listens_for(session_class, "after_commit")
+    def _after_commit(session):
+        if session.info.pop("wrote", False):
+            recent_writes.record(session.info.get("user_key"))
@@ -8,8 +8,107 @@ class Settings(BaseSettings):
     DB_NAME: str
     DB_USER: str
     DB_PASSWORD: str
+    # Driver asíncrono para get_async_db (aiomysql o asyncmy)
+    DB_ASYNC_DRIVER: str = "aiomysql"
+
+    # Pool de conexiones (por proceso: workers * (size + overflow) <= max_connections)
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_TIMEOUT: int = 30
+    DATABASE_POOL_USE_LIFO: bool = True
+    DATABASE_POOL_WARMUP: bool = True
+    DATABASE_ECHO: bool = False
+
+    # Réplicas de lectura ("host" o "host:puerto", mismas credenciales que el primario)
+    DB_REPLICA_HOSTS: List[str] = []
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5
+    DB_REPLICA_CHECK_INTERVAL: float = 10
+    # Tras escribir, el mismo usuario lee del primario durante este tiempo
+    DB_READ_YOUR_WRITES_SECONDS: float = 10
+
+    # Cada cuánto se recalculan los conteos de /stats/summary desde la base de datos
+    STATS_RECONCILE_SECONDS: float = 60
     JWT_SECRET: str
     JWT_SET_COOKIE: bool = False
+    JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Tokens ya verificados que JWTBearer recuerda (0 = verificar siempre)
+    JWT_CACHE_MAX_SIZE: int = 10000
+    # Archivo compartido por los workers con los tokens revocados ("" = directorio temporal)
+    TOKEN_REVOCATION_FILE: str = ""
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 1
+
+    # Costo de bcrypt y pool de hashing (0 hilos = uno por núcleo)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 0
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Límite de solicitudes (cubetas de tokens compartidas por los workers de la máquina)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_MINUTE: int = 60
+    RATE_LIMIT_PER_HOUR: int = 1000
+    # /auth/login, por IP del cliente y email: contra la fuerza bruta sobre una cuenta
+    RATE_LIMIT_LOGIN_PER_MINUTE: int = 10
+    RATE_LIMIT_LOGIN_PER_HOUR: int = 60
+    # /auth/login, tope por IP para todos los emails. Holgado: con NAT, todos los empleados
+    # de una planta comparten IP y en el cambio de turno inician sesión a la vez
+    RATE_LIMIT_LOGIN_IP_PER_MINUTE: int = 1000
+    RATE_LIMIT_LOGIN_IP_PER_HOUR: int = 10000
+    # /auth/refresh, por sesión (familia del refresh token; por IP si el token no la lleva)
+    RATE_LIMIT_REFRESH_PER_MINUTE: int = 10
+    RATE_LIMIT_REFRESH_PER_HOUR: int = 120
+    # Proxies (IPs o redes) cuyo X-Forwarded-For se acepta como IP del cliente, p. ej. el servidor PHP
+    RATE_LIMIT_TRUSTED_PROXIES: List[str] = []
+    # Archivo en memoria compartida ("" = /dev/shm o directorio temporal)
+    RATE_LIMIT_FILE: str = ""
+    RATE_LIMIT_SLOTS: int = 65536
+    RATE_LIMIT_STRIPES: int = 64
+
+    # Auditoría: cola en memoria volcada por lotes a la tabla audit_log
+    AUDIT_LOG_ENABLED: bool = True
+    AUDIT_LOG_RETENTION_DAYS: int = 365
+    AUDIT_LOG_QUEUE_SIZE: int = 10000
+    AUDIT_LOG_BATCH_SIZE: int = 500
+    AUDIT_LOG_FLUSH_SECONDS: float = 1
+    # Con la cola llena: "drop" descarta el registro, "block" hace esperar a la solicitud
+    AUDIT_LOG_FULL_POLICY: str = "drop"
+
+    # Detección de N+1 fuera de producción: misma SELECT repetida en una solicitud
+    QUERY_N_PLUS_ONE_THRESHOLD: int = 5
+    # "warn" (log), "raise" (la solicitud falla) u "off"
+    QUERY_N_PLUS_ONE_ACTION: str = "warn"
+    # Sentencias más lentas que esto se registran con su EXPLAIN (0 = desactivado)
+    SLOW_QUERY_SECONDS: float = 0.5
+    SLOW_QUERY_EXPLAIN: bool = True
+    # Encabezado Server-Timing con tiempo y número de consultas SQL
+    SERVER_TIMING_ENABLED: bool = True
+
+    # Métricas en /metrics; cada worker vuelca las suyas a METRICS_DIR ("" = directorio temporal)
+    METRICS_ENABLED: bool = True
+    METRICS_DIR: str = ""
+    METRICS_SYNC_SECONDS: float = 5
+    # /metrics exige "Authorization: Bearer <METRICS_TOKEN>"; sin token solo responde en
+    # desarrollo, y en producción la aplicación no arranca con METRICS_ENABLED sin él
+    METRICS_TOKEN: str = ""
+
+    # Routers importados en la primera solicitud a su prefijo (arranque más rápido)
+    LAZY_ROUTERS: bool = True
+    # Cargar en segundo plano los que falten poco después del arranque
+    LAZY_ROUTERS_PRELOAD: bool = True
+
+    # Caché de respuestas de catálogos con ETag; invalidada por versión de tabla
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    # Red de seguridad para cambios hechos fuera de la API
+    RESPONSE_CACHE_TTL_SECONDS: float = 300
+    # Versiones compartidas entre workers en un archivo mapeado ("" = /dev/shm/mdm_entity_versions)
+    RESPONSE_CACHE_SHARED: bool = True
+    RESPONSE_CACHE_VERSIONS_FILE: str = ""
+
+    # Recarga completa del catálogo de turnos en memoria, para cambios hechos fuera de la API
+    TURNO_CATALOG_MAX_AGE_SECONDS: float = 300
 
     ENVIRONMENT: str = "development"
     DEBUG: bool = True
@@ -25,6 +124,10 @@ class Settings(BaseSettings):
     def DATABASE_URL(self):
         return f"{self.DB_TYPE}+pymysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def ASYNC_DATABASE_URL(self):
+        return f"{self.DB_TYPE}+{self.DB_ASYNC_DRIVER}://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
     class Config:
         env_file = "/home/amb/MDM/backend/.env"
 
@@ -0,0 +1,206 @@
+# app/core/audit.py
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from fastapi.concurrency import run_in_threadpool
+from starlette.types import Scope
+from app.config.database import engine
+from app.config.settings import settings
+from app.core.rate_limit import client_address
+from app.models.audit_log import AuditLog
+
+logger = logging.getLogger(__name__)
+
+# Políticas cuando la cola está llena
+DROP = "drop"
+BLOCK = "block"
+
+# Cada cuánto se borran registros más antiguos que la retención
+PURGE_INTERVAL_SECONDS = 3600
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _user_id(scope: Scope) -> Optional[int]:
+    # JWTBearer guarda el payload en request.state.user, que vive en scope["state"]
+    user = scope.get("state", {}).get("user")
+    if not user:
+        return None
+    try:
+        return int(user.get("sub"))
+    except (TypeError, ValueError):
+        return None
+
+
+class AuditSink:
+    """
+    Registro de auditoría asíncrono y por lotes.
+
+    ``record`` solo encola una fila (sin E/S en el camino de la solicitud).
+    Una tarea en segundo plano junta hasta ``batch_size`` filas, o lo que haya
+    tras ``flush_interval`` segundos, y las inserta en ``audit_log`` con un
+    único INSERT multi-fila desde el threadpool. Con la cola llena, la política
+    ``drop`` descarta la fila (y la cuenta) y ``block`` hace esperar a la
+    solicitud hasta ``block_timeout`` segundos antes de descartarla.
+
+    La IP de cada fila sale de ``client_address`` (por defecto, el par de la
+    conexión), para registrar la del usuario y no la del proxy.
+    """
+
+    def __init__(
+        self,
+        table,
+        max_queue: int,
+        batch_size: int,
+        flush_interval: float,
+        policy: str = DROP,
+        block_timeout: float = 1.0,
+        retention_days: int = 0,
+        client_address: Optional[Callable[[Scope], str]] = None,
+    ):
+        if policy not in (DROP, BLOCK):
+            raise ValueError(f"Unknown audit queue policy: {policy}")
+        self.table = table
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.retention_days = retention_days
+        self.client_address = client_address
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._purged_at = 0.0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    # --- Ciclo de vida (startup / shutdown) ---
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run(), name="audit-log-flusher")
+
+    async def stop(self) -> None:
+        """Detiene el flusher y escribe lo que quede en la cola"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        batch = self._drain(self._queue.qsize())
+        if batch:
+            await run_in_threadpool(self._write, batch)
+
+    # --- Camino de la solicitud ---
+
+    async def record(self, scope: Scope, status: int, elapsed: float) -> None:
+        """Completion hook de HTTPObserverMiddleware"""
+        queue = self._queue
+        if queue is None:
+            return
+        if self.client_address is not None:
+            client_ip = self.client_address(scope)
+        else:
+            client = scope.get("client")
+            client_ip = client[0] if client else None
+        user_agent = _header(scope, b"user-agent")
+        row = {
+            "user_id": _user_id(scope),
+            "method": scope["method"],
+            "path": scope["path"][:500],
+            "status_code": status,
+            "latency_ms": round(elapsed * 1000, 3),
+            "client_ip": client_ip[:45] if client_ip else None,
+            "user_agent": user_agent[:255] if user_agent else None,
+            "created_at": datetime.utcnow(),
+        }
+        try:
+            queue.put_nowait(row)
+            return
+        except asyncio.QueueFull:
+            if self.policy == DROP:
+                self.dropped += 1
+                return
+        try:
+            await asyncio.wait_for(queue.put(row), self.block_timeout)
+        except asyncio.TimeoutError:
+            self.dropped += 1
+
+    # --- Flusher ---
+
+    def _drain(self, limit: int) -> List[Dict[str, Any]]:
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                first = await asyncio.wait_for(self._queue.get(), self.flush_interval)
+            except asyncio.TimeoutError:
+                first = None
+            if first is not None:
+                batch = [first] + self._drain(self.batch_size - 1)
+                await run_in_threadpool(self._write, batch)
+            if self.retention_days > 0 and time.monotonic() - self._purged_at >= PURGE_INTERVAL_SECONDS:
+                self._purged_at = time.monotonic()
+                await run_in_threadpool(self._purge)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            # executemany: el driver lo envía como un INSERT ... VALUES (...), (...)
+            with engine.begin() as conn:
+                conn.execute(self.table.insert(), batch)
+            self.written += len(batch)
+        except Exception as exc:
+            self.failed += len(batch)
+            logger.error(f"Could not write {len(batch)} audit log rows: {exc}")
+
+    def _purge(self) -> None:
+        cutoff = datetime.utcnow() - timedelta(days=self.retention_days)
+        try:
+            with engine.begin() as conn:
+                deleted = conn.execute(self.table.delete().where(self.table.c.created_at < cutoff)).rowcount
+            if deleted:
+                logger.info(f"Purged {deleted} audit log rows older than {self.retention_days} days")
+        except Exception as exc:
+            logger.error(f"Could not purge audit log: {exc}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self._task is not None,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "policy": self.policy,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+audit_sink = AuditSink(
+    AuditLog.__table__,
+    max_queue=settings.AUDIT_LOG_QUEUE_SIZE,
+    batch_size=settings.AUDIT_LOG_BATCH_SIZE,
+    flush_interval=settings.AUDIT_LOG_FLUSH_SECONDS,
+    policy=settings.AUDIT_LOG_FULL_POLICY,
+    retention_days=settings.AUDIT_LOG_RETENTION_DAYS,
+    client_address=client_address,
+)
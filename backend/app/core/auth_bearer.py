@@ -2,7 +2,8 @@
 from fastapi import Request, HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError
-from app.core.security import decode_access_token
+from app.core.revocation import revocations
+from app.core.token_cache import token_cache
 
 class JWTBearer(HTTPBearer):
     def __init__(self, auto_error: bool = True):
@@ -13,7 +14,9 @@ class JWTBearer(HTTPBearer):
         if credentials:
             token = credentials.credentials
             try:
-                payload = decode_access_token(token)
+                payload = token_cache.decode(token)
+                if revocations.is_revoked(payload):
+                    raise HTTPException(status_code=403, detail="Token revocado")
                 # Guardamos la info del usuario en request.state para usarla en endpoints
                 request.state.user = payload
                 return credentials.credentials
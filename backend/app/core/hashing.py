@@ -0,0 +1,72 @@
+# app/core/hashing.py
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
+from app.config.settings import settings
+from app.core.security import pwd_ctx
+
+# Segundos que se sugiere esperar al cliente cuando el pool está lleno
+RETRY_AFTER_SECONDS = 1
+
+
+class PasswordHasher:
+    """
+    Pool dedicado para bcrypt, separado del threadpool de AnyIO.
+
+    bcrypt libera el GIL mientras calcula, así que ``workers`` hilos usan
+    ``workers`` núcleos. Como mucho ``max_pending`` operaciones (en curso más
+    en cola) se aceptan a la vez; el resto recibe 429 de inmediato, de modo
+    que una avalancha de logins no deja sin hilos al resto de la API.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.rejected = 0
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Demasiadas solicitudes de autenticación, intente de nuevo",
+                    headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+                )
+            self._pending += 1
+        future = self._executor.submit(fn, *args)
+        # El hueco se libera cuando termina bcrypt, aunque el cliente ya se haya ido
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_ctx.hash, password)
+
+    async def verify_and_update(self, plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verifica la contraseña; si el hash usa otro costo o esquema que el
+        configurado devuelve también el hash nuevo para guardarlo.
+        """
+        return await self._run(pwd_ctx.verify_and_update, plain, hashed)
+
+    def pending(self) -> int:
+        return self._pending
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,118 @@
+# app/core/lazy_routers.py
+import asyncio
+import importlib
+import logging
+import re
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+from fastapi import FastAPI
+from starlette._utils import get_route_path
+from starlette.routing import BaseRoute, Match
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Segundos tras el arranque antes de cargar en segundo plano los routers que falten
+PRELOAD_DELAY_SECONDS = 1.0
+
+
+class PendingRouter(BaseRoute):
+    """
+    Ocupa el lugar de un router aún no importado.
+
+    Coincide con cualquier ruta bajo ``prefix``; al recibir la primera
+    solicitud importa el módulo, pone sus rutas en su lugar (mismo orden que
+    con la carga inmediata) y vuelve a despachar la solicitud.
+    """
+
+    def __init__(self, routers: "LazyRouters", module: str, prefix: str, tags: List[str]):
+        self.routers = routers
+        self.module = module
+        self.prefix = prefix
+        self.tags = tags
+        # /api/v1/users/{user_id}/job-history -> ^/api/v1/users/[^/]+/job-history(/.*)?$
+        pattern = re.sub(r"\\\{\w+\\\}", "[^/]+", re.escape(prefix))
+        self.path_regex = re.compile(f"^{pattern}(/.*)?$")
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if scope["type"] in ("http", "websocket") and self.path_regex.match(get_route_path(scope)):
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.routers.load(self)
+        await self.routers.app.router(scope, receive, send)
+
+    def __repr__(self) -> str:
+        return f"PendingRouter(module={self.module!r}, prefix={self.prefix!r})"
+
+
+class LazyRouters:
+    """
+    Registro de los routers de la API.
+
+    Con ``lazy`` cada router se importa la primera vez que se pide una ruta
+    suya (o al generar el OpenAPI, o con ``preload``), así que el worker
+    arranca sin pagar los esquemas, repositorios y la construcción de rutas
+    de toda la API. Sin ``lazy`` se comporta como ``app.include_router``.
+    """
+
+    def __init__(self, app: FastAPI, lazy: bool):
+        self.app = app
+        self.lazy = lazy
+        self.pending: List[PendingRouter] = []
+        # Segundos que tardó cada módulo en importarse y registrarse
+        self.load_times: Dict[str, float] = {}
+        if lazy:
+            openapi = app.openapi
+
+            def openapi_with_all_routers():
+                self.load_all()
+                return openapi()
+
+            app.openapi = openapi_with_all_routers
+
+    def include(self, module: str, prefix: str, tags: List[str]) -> None:
+        if not self.lazy:
+            self._include(module, prefix, tags)
+            return
+        placeholder = PendingRouter(self, module, prefix, tags)
+        self.pending.append(placeholder)
+        self.app.router.routes.append(placeholder)
+
+    def _include(self, module: str, prefix: str, tags: List[str]) -> List[BaseRoute]:
+        started = perf_counter()
+        router = importlib.import_module(module).router
+        routes = self.app.router.routes
+        before = len(routes)
+        self.app.include_router(router, prefix=prefix, tags=tags)
+        added = routes[before:]
+        self.load_times[module] = perf_counter() - started
+        return added
+
+    def load(self, placeholder: PendingRouter) -> None:
+        """Importa el router de ``placeholder`` y pone sus rutas donde estaba"""
+        if placeholder not in self.pending:
+            return
+        added = self._include(placeholder.module, placeholder.prefix, placeholder.tags)
+        routes = self.app.router.routes
+        del routes[len(routes) - len(added):]
+        index = routes.index(placeholder)
+        routes[index:index + 1] = added
+        self.pending.remove(placeholder)
+        logger.info(f"Router {placeholder.module} loaded in {self.load_times[placeholder.module] * 1000:.1f}ms")
+
+    def load_all(self) -> None:
+        for placeholder in list(self.pending):
+            self.load(placeholder)
+
+    async def preload(self, delay: Optional[float] = None) -> None:
+        """Carga los routers pendientes de uno en uno, cediendo el event loop entre ellos"""
+        await asyncio.sleep(PRELOAD_DELAY_SECONDS if delay is None else delay)
+        for placeholder in list(self.pending):
+            try:
+                self.load(placeholder)
+            except Exception as exc:
+                # Se reintentará (y fallará con su traza) en la primera solicitud
+                logger.error(f"Preloading router {placeholder.module} failed: {exc}")
+            await asyncio.sleep(0)
@@ -0,0 +1,479 @@
+# app/core/metrics.py
+import asyncio
+import fcntl
+import glob
+import json
+import logging
+import math
+import os
+import re
+import tempfile
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from starlette.types import Scope
+from app.config.database import active_engines
+from app.config.settings import settings
+from app.core import query_counter
+from app.core.pool_metrics import pool_status
+
+logger = logging.getLogger(__name__)
+
+# Histograma de latencia log-lineal (estilo HDR): error relativo <= LATENCY_PRECISION
+LATENCY_PRECISION = 0.02
+_LOG_BASE = math.log1p(LATENCY_PRECISION)
+_MIN_LATENCY = 1e-6
+QUANTILES: Tuple[float, ...] = (0.5, 0.95, 0.99)
+
+# Límites del histograma de consultas SQL por solicitud
+QUERY_BUCKETS: Tuple[int, ...] = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Etiqueta para solicitudes que no corresponden a ninguna ruta (404)
+UNMATCHED_ROUTE = "unmatched"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Archivos dentro de METRICS_DIR
+_SNAPSHOT_NAME = re.compile(r"metrics_(\d+)(?:_(\d+))?\.json$")
+ARCHIVE_FILE = "archived.json"
+MASTER_FILE = "master"
+LOCK_FILE = ".lock"
+
+
+class LatencyHistogram:
+    """
+    Conteos por cubeta en escala logarítmica desde 1 µs.
+
+    Cada cubeta es un ``LATENCY_PRECISION`` más ancha que la anterior, así que
+    los percentiles salen con ~2 % de error en cualquier rango (µs o minutos)
+    con unos pocos cientos de cubetas como mucho. Solo se guardan las cubetas
+    usadas, y dos histogramas se combinan sumando conteos.
+    """
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        index = int(math.log(max(seconds, _MIN_LATENCY) / _MIN_LATENCY) / _LOG_BASE)
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        for index, n in data["counts"].items():
+            self.counts[int(index)] += n
+        self.count += data["count"]
+        self.sum += data["sum"]
+        self.max = max(self.max, data["max"])
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                # Punto medio (geométrico) de la cubeta
+                return min(_MIN_LATENCY * (1 + LATENCY_PRECISION) ** (index + 0.5), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"counts": dict(self.counts), "count": self.count, "sum": self.sum, "max": self.max}
+
+
+class QueryHistogram:
+    """Consultas SQL por solicitud, en cubetas acumulables al estilo Prometheus"""
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self):
+        self.buckets = [0] * len(QUERY_BUCKETS)
+        self.count = 0
+        self.sum = 0
+
+    def record(self, queries: int) -> None:
+        for i, bound in enumerate(QUERY_BUCKETS):
+            if queries <= bound:
+                self.buckets[i] += 1
+                break
+        self.count += 1
+        self.sum += queries
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        for i, n in enumerate(data["buckets"]):
+            self.buckets[i] += n
+        self.count += data["count"]
+        self.sum += data["sum"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"buckets": list(self.buckets), "count": self.count, "sum": self.sum}
+
+
+def _route(scope: Scope) -> str:
+    # FastAPI deja la ruta resuelta en el scope; se usa su plantilla (/users/{user_id})
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: Any) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(round(value, 6)) if isinstance(value, float) else str(value)
+
+
+def _process_start(pid: int) -> Optional[int]:
+    """Instante de arranque del proceso (ticks desde el boot), o None sin /proc"""
+    try:
+        with open(f"/proc/{pid}/stat") as source:
+            stat = source.read()
+    except OSError:
+        return None
+    # El nombre del proceso (campo 2) puede tener espacios: se corta tras el último ")"
+    return int(stat.rsplit(")", 1)[1].split()[19])
+
+
+# Sin /proc, el arranque propio se aproxima con la hora del import
+_IMPORT_TIME = int(time.time() * 1000)
+
+
+def _own_start() -> int:
+    return _process_start(os.getpid()) or _IMPORT_TIME
+
+
+def _pid_alive(pid: int, start: Optional[int] = None) -> bool:
+    """
+    Si el proceso ``pid`` sigue vivo. Con ``start`` además debe ser el mismo
+    proceso y no otro que reutilizó el pid.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    if start is None:
+        return True
+    current = _process_start(pid)
+    return current is None or current == start
+
+
+def _fold(archive: Dict[str, Any], snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Suma los contadores de ``snapshot`` a ``archive`` (los gauges se descartan)"""
+    requests: Counter = Counter()
+    latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+    queries: Dict[Tuple[str, str], QueryHistogram] = {}
+    pools: Dict[str, Counter] = {}
+    for source in (archive, snapshot):
+        for method, route, status, n in source["requests"]:
+            requests[(method, route, status)] += n
+        for method, route, data in source["latency"]:
+            latency.setdefault((method, route), LatencyHistogram()).merge(data)
+        for method, route, data in source["queries"]:
+            queries.setdefault((method, route), QueryHistogram()).merge(data)
+        for name, status in source["pools"].items():
+            pool = pools.setdefault(name, Counter())
+            for key in ("checkouts", "timeouts", "wait_seconds_sum"):
+                pool[key] += status.get(key, 0)
+    return {
+        "pid": 0,
+        "in_flight": 0,
+        "requests": [[method, route, status, n] for (method, route, status), n in requests.items()],
+        "latency": [[method, route, h.to_dict()] for (method, route), h in latency.items()],
+        "queries": [[method, route, h.to_dict()] for (method, route), h in queries.items()],
+        "pools": {name: dict(pool) for name, pool in pools.items()},
+    }
+
+
+_EMPTY_ARCHIVE: Dict[str, Any] = {"pid": 0, "in_flight": 0, "requests": [], "latency": [], "queries": [], "pools": {}}
+
+
+class MetricsRegistry:
+    """
+    Métricas HTTP y de base de datos de este worker.
+
+    Los hooks del middleware las actualizan en el event loop, sin locks ni
+    E/S. Cada ``sync_interval`` segundos el worker vuelca una instantánea a
+    ``<directory>/metrics_<pid>_<arranque>.json``; ``/metrics`` suma las de
+    todos los workers. El arranque del proceso en el nombre evita que un
+    worker nuevo que reutiliza el pid pise el archivo de uno muerto.
+
+    Los contadores de workers ya terminados se conservan (un contador no
+    debe bajar), pero sus gauges no: la primera lectura que encuentra un
+    worker muerto suma sus contadores a ``archived.json`` y borra su archivo.
+    El primer worker de un proceso maestro nuevo (otro despliegue) vacía el
+    directorio, porque Prometheus ya cuenta con el reinicio de los contadores.
+    """
+
+    def __init__(self, directory: str, sync_interval: float):
+        self.directory = directory
+        self.sync_interval = sync_interval
+        self.in_flight = 0
+        self.requests: Counter = Counter()
+        self.latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.queries: Dict[Tuple[str, str], QueryHistogram] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    # --- Hooks de HTTPObserverMiddleware ---
+
+    def start_request(self, scope: Scope) -> None:
+        self.in_flight += 1
+
+    def finish_request(self, scope: Scope, status: int, elapsed: float) -> None:
+        self.in_flight -= 1
+        key = (scope["method"], _route(scope))
+        self.requests[key + (status,)] += 1
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = LatencyHistogram()
+            self.queries[key] = QueryHistogram()
+        histogram.record(elapsed)
+        stats = query_counter.current()
+        self.queries[key].record(stats.count if stats is not None else 0)
+
+    # --- Instantáneas compartidas entre workers ---
+
+    @property
+    def path(self) -> str:
+        # Se evalúa cada vez: con fork tras importar, el pid no es el del import
+        return os.path.join(self.directory, f"metrics_{os.getpid()}_{_own_start()}.json")
+
+    def _locked(self):
+        # Serializa entre procesos el archivado y la limpieza del directorio
+        os.makedirs(self.directory, exist_ok=True)
+        lock = open(os.path.join(self.directory, LOCK_FILE), "a")
+        fcntl.lockf(lock, fcntl.LOCK_EX)
+        return lock
+
+    def claim(self) -> None:
+        """
+        Vacía el directorio si el proceso maestro (el padre de este worker)
+        no es el que lo usó por última vez, es decir, en cada despliegue.
+        """
+        parent = os.getppid()
+        master = f"{parent}:{_process_start(parent)}"
+        marker = os.path.join(self.directory, MASTER_FILE)
+        try:
+            with self._locked():
+                try:
+                    with open(marker) as source:
+                        if source.read() == master:
+                            return
+                except OSError:
+                    pass
+                for path in glob.glob(os.path.join(self.directory, "metrics_*.json")):
+                    os.unlink(path)
+                archive = os.path.join(self.directory, ARCHIVE_FILE)
+                if os.path.exists(archive):
+                    os.unlink(archive)
+                with open(marker, "w") as target:
+                    target.write(master)
+        except OSError as exc:
+            logger.error(f"Could not reset metrics directory: {exc}")
+
+    def archive(self, dead: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Suma a ``archived.json`` los contadores de las instantáneas de workers
+        muertos, borra sus archivos y devuelve el archivo actualizado.
+        """
+        archive_path = os.path.join(self.directory, ARCHIVE_FILE)
+        with self._locked():
+            archive = self._read(archive_path) or dict(_EMPTY_ARCHIVE)
+            # Otro worker pudo archivarlas mientras se esperaba el lock
+            dead = [(path, snapshot) for path, snapshot in dead if os.path.exists(path)]
+            if not dead:
+                return archive
+            for _, snapshot in dead:
+                archive = _fold(archive, snapshot)
+            self._replace(archive, archive_path)
+            for path, _ in dead:
+                os.unlink(path)
+        return archive
+
+    @staticmethod
+    def _read(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path) as source:
+                return json.load(source)
+        except (OSError, ValueError):
+            return None
+
+    def _replace(self, data: Dict[str, Any], path: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".metrics")
+        with os.fdopen(fd, "w") as target:
+            json.dump(data, target, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copia serializable del estado actual (tomarla en el event loop)"""
+        return {
+            "pid": os.getpid(),
+            "start": _own_start(),
+            "in_flight": self.in_flight,
+            "requests": [[method, route, status, n] for (method, route, status), n in self.requests.items()],
+            "latency": [[method, route, h.to_dict()] for (method, route), h in self.latency.items()],
+            "queries": [[method, route, h.to_dict()] for (method, route), h in self.queries.items()],
+            "pools": {name: pool_status(engine) for name, engine in active_engines().items()},
+        }
+
+    def write(self, snapshot: Dict[str, Any]) -> None:
+        try:
+            self._replace(snapshot, self.path)
+        except OSError as exc:
+            logger.error(f"Could not write metrics snapshot: {exc}")
+
+    def collect(self, own: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Instantánea propia (recién tomada), la última de cada otro worker vivo
+        y el archivo con los contadores de los que ya terminaron.
+        """
+        self.write(own)
+        own["alive"] = True
+        snapshots = [own]
+        dead = []
+        for path in glob.glob(os.path.join(self.directory, "metrics_*.json")):
+            match = _SNAPSHOT_NAME.search(os.path.basename(path))
+            if path == self.path or match is None:
+                continue
+            snapshot = self._read(path)
+            if snapshot is None:
+                continue
+            pid, start = int(match.group(1)), match.group(2)
+            if _pid_alive(pid, int(start) if start else None):
+                snapshot["alive"] = True
+                snapshots.append(snapshot)
+            else:
+                dead.append((path, snapshot))
+        try:
+            archive = self.archive(dead) if dead else self._read(os.path.join(self.directory, ARCHIVE_FILE))
+        except OSError as exc:
+            logger.error(f"Could not archive metrics snapshots: {exc}")
+            archive = None
+            for _, snapshot in dead:
+                snapshot["alive"] = False
+                snapshots.append(snapshot)
+        if archive is not None:
+            archive["alive"] = False
+            snapshots.append(archive)
+        return snapshots
+
+    async def start(self) -> None:
+        if self._task is None:
+            await run_in_threadpool(self.claim)
+            self._task = asyncio.create_task(self._run(), name="metrics-sync")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await run_in_threadpool(self.write, self.snapshot())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            await run_in_threadpool(self.write, self.snapshot())
+
+    async def render(self) -> str:
+        own = self.snapshot()
+        return await run_in_threadpool(lambda: render(self.collect(own)))
+
+
+def render(snapshots: Iterable[Dict[str, Any]]) -> str:
+    """Suma las instantáneas y las escribe en formato de exposición de Prometheus"""
+    requests: Counter = Counter()
+    latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+    queries: Dict[Tuple[str, str], QueryHistogram] = {}
+    pools: Dict[str, Counter] = {}
+    in_flight = 0
+    workers = 0
+
+    for snapshot in snapshots:
+        for method, route, status, n in snapshot["requests"]:
+            requests[(method, route, status)] += n
+        for method, route, data in snapshot["latency"]:
+            latency.setdefault((method, route), LatencyHistogram()).merge(data)
+        for method, route, data in snapshot["queries"]:
+            queries.setdefault((method, route), QueryHistogram()).merge(data)
+        alive = snapshot.get("alive", True)
+        for name, status in snapshot["pools"].items():
+            pool = pools.setdefault(name, Counter())
+            pool["checkouts"] += status.get("checkouts", 0)
+            pool["timeouts"] += status.get("timeouts", 0)
+            pool["wait_seconds"] += status.get("wait_seconds_sum", 0.0)
+            if alive:
+                pool["checked_out"] += status.get("checked_out", 0)
+                pool["idle"] += status.get("checked_in", 0)
+                pool["overflow"] += status.get("overflow", 0)
+        if alive:
+            in_flight += snapshot["in_flight"]
+            workers += 1
+
+    lines: List[str] = []
+
+    def metric(name: str, kind: str, help_text: str, samples: Iterable[Tuple[str, str, Any]]):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for suffix, labels, value in samples:
+            lines.append(f"{name}{suffix}{labels} {_number(value)}")
+
+    metric("app_workers", "gauge", "Worker processes reporting metrics.", [("", "", workers)])
+    metric("http_requests_in_flight", "gauge", "Requests currently being served.", [("", "", in_flight)])
+    metric(
+        "http_requests_total", "counter", "Requests by method, route template and status.",
+        [("", _labels(method=m, route=r, status=s), n) for (m, r, s), n in sorted(requests.items())],
+    )
+
+    samples = []
+    for (method, route), histogram in sorted(latency.items()):
+        for q in QUANTILES:
+            samples.append(("", _labels(method=method, route=route, quantile=q), histogram.quantile(q)))
+        samples.append(("_sum", _labels(method=method, route=route), histogram.sum))
+        samples.append(("_count", _labels(method=method, route=route), histogram.count))
+    metric("http_request_duration_seconds", "summary", "Request latency by route (p50/p95/p99).", samples)
+
+    samples = []
+    for (method, route), histogram in sorted(queries.items()):
+        cumulative = 0
+        for bound, n in zip(QUERY_BUCKETS, histogram.buckets):
+            cumulative += n
+            samples.append(("_bucket", _labels(method=method, route=route, le=bound), cumulative))
+        samples.append(("_bucket", _labels(method=method, route=route, le="+Inf"), histogram.count))
+        samples.append(("_sum", _labels(method=method, route=route), histogram.sum))
+        samples.append(("_count", _labels(method=method, route=route), histogram.count))
+    metric("http_request_db_queries", "histogram", "SQL queries executed per request.", samples)
+
+    for key, name, kind, help_text in (
+        ("checked_out", "db_pool_connections_in_use", "gauge", "Connections checked out of the pool."),
+        ("idle", "db_pool_connections_idle", "gauge", "Open connections waiting in the pool."),
+        ("overflow", "db_pool_overflow", "gauge", "Connections opened beyond the pool size."),
+        ("checkouts", "db_pool_checkouts_total", "counter", "Successful connection checkouts."),
+        ("timeouts", "db_pool_checkout_timeouts_total", "counter", "Checkouts that hit the pool timeout."),
+        ("wait_seconds", "db_pool_checkout_wait_seconds_total", "counter", "Time spent waiting for a connection."),
+    ):
+        metric(name, kind, help_text, [("", _labels(engine=engine), pool[key]) for engine, pool in sorted(pools.items())])
+
+    return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry(
+    settings.METRICS_DIR or os.path.join(tempfile.gettempdir(), "mdm_metrics"),
+    sync_interval=settings.METRICS_SYNC_SECONDS,
+)
@@ -1,33 +1,120 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-import time
-
-
-class AuditMiddleware(BaseHTTPMiddleware):
-    """Middleware que registra las solicitudes para auditoría básica."""
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = round(time.time() - start_time, 3)
-        method = request.method
-        path = request.url.path
-        status = response.status_code
-        user_agent = request.headers.get("user-agent", "unknown")
-
-        print(f"[AUDIT] {method} {path} - {status} ({process_time}s) | {user_agent}")
-        return response
-
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware que añade encabezados de seguridad a todas las respuestas."""
-    async def dispatch(self, request: Request, call_next):
-        response: Response = await call_next(request)
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(), microphone=(), camera=(), payment=()"
-        )
-        return response
+# app/core/middleware.py
+import inspect
+from time import perf_counter
+from typing import Awaitable, Callable, Dict, Iterable, List, MutableMapping, Optional, Tuple, Union
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core import query_counter
+
+# Encabezados de seguridad que se añaden a todas las respuestas
+SECURITY_HEADERS: Dict[str, str] = {
+    "X-Frame-Options": "DENY",
+    "X-Content-Type-Options": "nosniff",
+    "X-XSS-Protection": "1; mode=block",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Permissions-Policy": "geolocation=(), microphone=(), camera=(), payment=()",
+}
+
+RawHeaders = List[Tuple[bytes, bytes]]
+
+# (scope) al recibir la solicitud, en el mismo contexto que la aplicación
+StartHook = Callable[[Scope], None]
+# (scope, encabezados crudos de la respuesta, segundos hasta el inicio de la respuesta)
+HeaderHook = Callable[[Scope, RawHeaders, float], None]
+# (scope, código de estado, segundos hasta el último byte del cuerpo); puede ser async
+CompletionHook = Callable[[Scope, int, float], Union[None, Awaitable[None]]]
+
+
+def security_headers(headers: Optional[Dict[str, str]] = None) -> HeaderHook:
+    """Añade ``headers`` (por defecto SECURITY_HEADERS) salvo los que la respuesta ya trae"""
+    encoded = [(name.lower().encode("latin-1"), value.encode("latin-1"))
+               for name, value in (headers or SECURITY_HEADERS).items()]
+
+    def hook(scope: Scope, raw: RawHeaders, elapsed: float) -> None:
+        present = {name.lower() for name, _ in raw}
+        raw.extend(header for header in encoded if header[0] not in present)
+
+    return hook
+
+
+def process_time_header(name: str = "X-Process-Time") -> HeaderHook:
+    """Segundos que tardó la aplicación en empezar a responder"""
+    key = name.lower().encode("latin-1")
+
+    def hook(scope: Scope, raw: RawHeaders, elapsed: float) -> None:
+        raw.append((key, str(elapsed).encode("latin-1")))
+
+    return hook
+
+
+def server_timing_header() -> HeaderHook:
+    """Tiempo en base de datos (y número de consultas) y tiempo total, para las DevTools"""
+
+    def hook(scope: Scope, raw: RawHeaders, elapsed: float) -> None:
+        stats = query_counter.current()
+        parts = []
+        if stats is not None:
+            parts.append(f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"')
+        parts.append(f"app;dur={elapsed * 1000:.2f}")
+        raw.append((b"server-timing", ", ".join(parts).encode("latin-1")))
+
+    return hook
+
+
+class HTTPObserverMiddleware:
+    """
+    Middleware ASGI puro para todo lo que observa o decora respuestas HTTP.
+
+    Sustituye a la pila de ``BaseHTTPMiddleware``: no crea tareas ni copia el
+    cuerpo, solo envuelve ``send``. Los ``start_hooks`` se llaman al recibir
+    la solicitud (lo que fijen en contextvars lo ve la aplicación). Los
+    ``header_hooks`` modifican los encabezados en ``http.response.start``;
+    los ``completion_hooks`` reciben el estado y la latencia total cuando
+    termina el cuerpo (o la solicitud falla, con estado 500) y pueden ser
+    corrutinas. Las respuestas en streaming no se bufferizan.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        start_hooks: Iterable[StartHook] = (),
+        header_hooks: Iterable[HeaderHook] = (),
+        completion_hooks: Iterable[CompletionHook] = (),
+    ):
+        self.app = app
+        self.start_hooks = tuple(start_hooks)
+        self.header_hooks = tuple(header_hooks)
+        self.completion_hooks = tuple((hook, inspect.iscoroutinefunction(hook)) for hook in completion_hooks)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        for hook in self.start_hooks:
+            hook(scope)
+        state: MutableMapping[str, int] = {"status": 500}
+        header_hooks = self.header_hooks
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                if header_hooks:
+                    elapsed = perf_counter() - start
+                    raw = list(message.get("headers", ()))
+                    for hook in header_hooks:
+                        hook(scope, raw, elapsed)
+                    message["headers"] = raw
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if self.completion_hooks:
+                elapsed = perf_counter() - start
+                for hook, is_async in self.completion_hooks:
+                    if is_async:
+                        await hook(scope, state["status"], elapsed)
+                    else:
+                        hook(scope, state["status"], elapsed)
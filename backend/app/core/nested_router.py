@@ -0,0 +1,105 @@
+# app/core/nested_router.py
+from fastapi import APIRouter, Depends, HTTPException, Path, Response, status
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from typing import Callable, List, Optional, Type
+from app.config.database import get_db
+from app.core.auth_bearer import JWTBearer
+from app.core.pagination import PageParams, paginate
+from app.repositories.base import BaseRepository
+
+
+def nested_crud_router(
+    *,
+    repo: BaseRepository,
+    parent_repo: BaseRepository,
+    create_schema: Type[BaseModel],
+    out_schema: Type[BaseModel],
+    owner_col: str,
+    id_param: str,
+    singular: str,
+    plural: str,
+    not_found: str,
+    parent_param: str = "user_id",
+    parent_label: str = "user",
+    parent_not_found: str = "Usuario no encontrado",
+    owner_label: str = "Employee ID",
+    validate: Optional[Callable[[BaseModel], None]] = None,
+) -> APIRouter:
+    """
+    CRUD de un recurso hijo bajo ``/{parent_param}/...``, para incluir con
+    ``include_router`` en el router del padre.
+
+    - ``owner_col`` es la columna del hijo que apunta al padre; el ``id`` del
+      cuerpo debe coincidir con el de la ruta (``400`` si no).
+    - Obtener, actualizar y eliminar buscan el registro por ``id`` y dueño en
+      una sola consulta (``get_owned``), sin cargar antes al padre.
+    - El listado usa ``paginate`` filtrado por dueño, como el resto de
+      listados (``skip``/``limit``/``cursor``/``fields``/``count``).
+    - ``validate`` se llama con el cuerpo al crear y actualizar, y puede
+      lanzar ``HTTPException``.
+
+    ``repo`` y ``parent_repo`` son instancias compartidas por todas las
+    solicitudes. Los nombres de las rutas (``create_{singular}_for_{parent_label}``,
+    ``list_{plural}_for_{parent_label}``, ...) y de sus parámetros son los
+    del OpenAPI, así que deben mantenerse estables.
+    """
+    router = APIRouter(dependencies=[Depends(JWTBearer())])
+    suffix = f"_for_{parent_label}"
+    mismatch = f"{owner_label} in payload must match {parent_param} in path"
+
+    def check_payload(parent_id: int, payload: BaseModel) -> None:
+        if getattr(payload, owner_col) != parent_id:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=mismatch)
+        if validate is not None:
+            validate(payload)
+
+    def get_owned_or_404(db: Session, id: int, parent_id: int):
+        obj = repo.get_owned(db=db, id=id, owner_col=owner_col, owner_id=parent_id)
+        if not obj:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+        return obj
+
+    def create(payload: create_schema, parent_id: int = Path(alias=parent_param), db: Session = Depends(get_db)):
+        check_payload(parent_id, payload)
+        if not parent_repo.exists(db=db, id=parent_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=parent_not_found)
+        return repo.create(db=db, obj_in=payload)
+
+    def list_(
+        response: Response,
+        parent_id: int = Path(alias=parent_param),
+        page: PageParams = Depends(),
+        db: Session = Depends(get_db),
+    ):
+        if not parent_repo.exists(db=db, id=parent_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=parent_not_found)
+        return paginate(repo, db, response, page, schema=out_schema, filters={owner_col: parent_id})
+
+    def get(parent_id: int = Path(alias=parent_param), id: int = Path(alias=id_param), db: Session = Depends(get_db)):
+        return get_owned_or_404(db, id, parent_id)
+
+    def update(
+        payload: create_schema,
+        parent_id: int = Path(alias=parent_param),
+        id: int = Path(alias=id_param),
+        db: Session = Depends(get_db),
+    ):
+        check_payload(parent_id, payload)
+        obj = get_owned_or_404(db, id, parent_id)
+        return repo.update(db=db, db_obj=obj, obj_in=payload)
+
+    def delete(parent_id: int = Path(alias=parent_param), id: int = Path(alias=id_param), db: Session = Depends(get_db)):
+        obj = get_owned_or_404(db, id, parent_id)
+        # El registro ya está en la sesión: delete no vuelve a consultarlo
+        repo.delete(db=db, id=obj.id)
+
+    item = "/{" + id_param + "}"
+    router.add_api_route("/", create, methods=["POST"], response_model=out_schema,
+                         status_code=status.HTTP_201_CREATED, name=f"create_{singular}{suffix}")
+    router.add_api_route("/", list_, methods=["GET"], response_model=List[out_schema], name=f"list_{plural}{suffix}")
+    router.add_api_route(item, get, methods=["GET"], response_model=out_schema, name=f"get_{singular}{suffix}")
+    router.add_api_route(item, update, methods=["PUT"], response_model=out_schema, name=f"update_{singular}{suffix}")
+    router.add_api_route(item, delete, methods=["DELETE"], status_code=status.HTTP_204_NO_CONTENT,
+                         name=f"delete_{singular}{suffix}")
+    return router
@@ -0,0 +1,120 @@
+# app/core/pagination.py
+from fastapi import HTTPException, Response, status
+from functools import lru_cache
+from pydantic import BaseModel, TypeAdapter, create_model
+from sqlalchemy.orm import Session
+from typing import Any, Dict, FrozenSet, List, Literal, Optional, Type
+from app.core.responses import fast_serializer, json_response
+from app.repositories.base import BaseRepository, InvalidCursorError, InvalidFieldError
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+PAGE_HEADER = "X-Page"
+PER_PAGE_HEADER = "X-Per-Page"
+
+CountMode = Literal["window", "approx", "exact", "none"]
+
+# Serializar listados directamente desde las filas cuando el esquema lo permite
+FAST_SERIALIZATION = True
+
+
+class PageParams:
+    """Parámetros de consulta comunes a todos los listados"""
+    def __init__(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        count: CountMode = "window",
+    ):
+        self.skip = skip
+        self.limit = limit
+        self.cursor = cursor
+        self.count = count
+        self.fields = [name.strip() for name in fields.split(",") if name.strip()] if fields else None
+
+
+@lru_cache(maxsize=256)
+def partial_model(schema: Type[BaseModel], fields: FrozenSet[str]) -> Type[BaseModel]:
+    """Versión de ``schema`` que solo declara ``fields`` (mismos tipos y valores por defecto)"""
+    definitions = {
+        name: (info.annotation, info)
+        for name, info in schema.model_fields.items()
+        if name in fields
+    }
+    return create_model(f"{schema.__name__}Partial", **definitions)
+
+
+@lru_cache(maxsize=256)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def paginate(
+    repo: BaseRepository,
+    db: Session,
+    response: Response,
+    page: PageParams,
+    schema: Type[BaseModel],
+    filters: Optional[Dict[str, Any]] = None,
+    order_by: Optional[str] = None,
+) -> Any:
+    """
+    Página de un listado. Con ``cursor`` se usa paginación por keyset y se
+    ignora ``skip``; el cursor de la siguiente página se devuelve en el
+    encabezado ``X-Next-Cursor`` (ausente en la última página).
+
+    El total se calcula según ``count`` (ver ``BaseRepository.get_page``) y se
+    devuelve en ``X-Total-Count`` junto con ``X-Page`` y ``X-Per-Page``.
+
+    Con ``fields`` solo se leen esas columnas y la respuesta se serializa
+    con un modelo parcial de ``schema``, sin pasar por ``response_model``.
+
+    Sin ``fields``, si todos los campos de ``schema`` son columnas del modelo
+    con el mismo tipo (``fast_serializer``), se leen solo esas columnas y las
+    filas se serializan con orjson tal cual: ni objetos ORM, ni validación
+    por fila, ni segundo paso de codificación.
+    """
+    if page.fields:
+        unknown = [name for name in page.fields if name not in schema.model_fields]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Campos no válidos: {', '.join(unknown)}",
+            )
+
+    fast = FAST_SERIALIZATION and not page.fields and fast_serializer(schema, repo.model)
+
+    try:
+        items, total = repo.get_page(
+            db=db,
+            skip=page.skip,
+            limit=page.limit,
+            filters=filters,
+            order_by=order_by,
+            cursor=page.cursor,
+            fields=list(fast.fields) if fast else page.fields,
+            count=page.count,
+        )
+    except (InvalidCursorError, InvalidFieldError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    next_cursor = repo.next_cursor(items, page.limit, order_by)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    if total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+    if not page.cursor and page.limit > 0:
+        response.headers[PAGE_HEADER] = str(page.skip // page.limit + 1)
+    response.headers[PER_PAGE_HEADER] = str(page.limit)
+
+    # Devolver un Response directo evita la validación completa del response_model
+    if fast:
+        return json_response(fast.dumps(items), response)
+    if not page.fields:
+        return items
+
+    model = partial_model(schema, frozenset(page.fields))
+    body = _list_adapter(model).dump_json(_list_adapter(model).validate_python(items))
+    return json_response(body, response)
@@ -0,0 +1,135 @@
+# app/core/query_counter.py
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Fuera de producción: qué hacer cuando una solicitud repite la misma SELECT
+N_PLUS_ONE_ACTION = "off" if settings.ENVIRONMENT == "production" else settings.QUERY_N_PLUS_ONE_ACTION
+N_PLUS_ONE_THRESHOLD = settings.QUERY_N_PLUS_ONE_THRESHOLD
+# Opción de ejecución para sentencias que se repiten a propósito (recorridos por bloques)
+REPEATS_OPTION = "expected_repeats"
+
+
+class NPlusOneError(RuntimeError):
+    """La misma SELECT se ejecutó N_PLUS_ONE_THRESHOLD veces en una solicitud"""
+
+
+class QueryStats:
+    """Consultas SQL ejecutadas durante una solicitud y el tiempo que tardaron"""
+    __slots__ = ("count", "duration", "scope", "statements")
+
+    def __init__(self, scope=None, track_statements: bool = False):
+        self.count = 0
+        self.duration = 0.0
+        self.scope = scope
+        # Veces que se ejecutó cada SELECT (solo si se buscan N+1)
+        self.statements: Optional[Dict[str, int]] = {} if track_statements else None
+
+    @property
+    def path(self) -> Optional[str]:
+        return self.scope["path"] if self.scope else None
+
+    @property
+    def route(self) -> Optional[str]:
+        """Plantilla de la ruta (/users/{user_id}) una vez resuelta, o la URL"""
+        if not self.scope:
+            return None
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.scope["path"]
+
+
+# Se fija al empezar cada solicitud; los hilos del threadpool reciben una copia
+# del contexto que apunta al mismo objeto, así que también suman aquí
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def begin_request(scope=None) -> QueryStats:
+    """Empieza a contar consultas para la solicitud actual (start hook del middleware)"""
+    stats = QueryStats(scope, track_statements=N_PLUS_ONE_ACTION != "off")
+    _current.set(stats)
+    return stats
+
+
+def current() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def _check_repeated(stats: QueryStats, statement: str) -> None:
+    if statement.lstrip()[:6].upper() != "SELECT":
+        return
+    n = stats.statements.get(statement, 0) + 1
+    stats.statements[statement] = n
+    if n != N_PLUS_ONE_THRESHOLD:
+        return
+    # Típico de relaciones lazy recorridas al serializar (from_attributes)
+    message = f"Possible N+1 on {stats.path}: same statement executed {n} times: {' '.join(statement.split())[:300]}"
+    if N_PLUS_ONE_ACTION == "raise":
+        raise NPlusOneError(message)
+    logger.warning(message)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    started = conn.info.get("query_started")
+    stats.count += 1
+    if started:
+        stats.duration += perf_counter() - started.pop()
+    if stats.statements is not None and not executemany and not (
+        context is not None and context.execution_options.get(REPEATS_OPTION)
+    ):
+        _check_repeated(stats, statement)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if _current.get() is None or conn is None:
+        return
+    started = conn.info.get("query_started")
+    if started:
+        started.pop()
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[List[str]]:
+    """
+    Falla con AssertionError si el bloque ejecuta más de ``limit`` consultas.
+
+    Cuenta en todos los hilos (también los de TestClient y el threadpool),
+    así que sirve para fijar un presupuesto por endpoint en las pruebas::
+
+        with assert_max_queries(2):
+            client.get("/api/v1/users/1", headers=headers)
+    """
+    executed: List[str] = []
+    lock = threading.Lock()
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        with lock:
+            executed.append(statement)
+
+    event.listen(Engine, "after_cursor_execute", _record)
+    try:
+        yield executed
+    finally:
+        event.remove(Engine, "after_cursor_execute", _record)
+    if len(executed) > limit:
+        listing = "\n".join(f"  {i}. {' '.join(sql.split())[:200]}" for i, sql in enumerate(executed, 1))
+        raise AssertionError(f"Expected at most {limit} queries, got {len(executed)}:\n{listing}")
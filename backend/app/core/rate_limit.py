@@ -0,0 +1,346 @@
+# app/core/rate_limit.py
+import fcntl
+import hashlib
+import ipaddress
+import json
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config.settings import settings
+from app.core.security import refresh_token_family
+from app.core.token_cache import token_cache
+
+# Una cubeta: (hash de la clave, tokens disponibles, última actualización)
+_SLOT = struct.Struct("<Qdd")
+# Casillas que se prueban por clave antes de reutilizar la más antigua
+PROBES = 8
+
+
+class Limit:
+    """Cubeta de tokens: hasta ``capacity`` solicitudes seguidas, recargando ``capacity`` cada ``period`` s"""
+    __slots__ = ("name", "capacity", "rate")
+
+    def __init__(self, name: str, capacity: int, period: float):
+        self.name = name
+        self.capacity = float(capacity)
+        self.rate = capacity / period
+
+
+class SharedTokenBuckets:
+    """
+    Cubetas de tokens compartidas por todos los workers de la máquina.
+
+    Viven en un archivo mapeado en memoria (``/dev/shm`` si existe): una tabla
+    de ``slots`` casillas de 24 bytes dividida en ``stripes`` franjas. Cada
+    clave cae en una franja y solo se bloquea esa (``threading.Lock`` dentro
+    del proceso más un ``lockf`` sobre un byte de la franja entre procesos),
+    así que claves distintas rara vez compiten. Si las casillas de una clave
+    están ocupadas se reutiliza la menos reciente: en el peor caso una clave
+    olvidada vuelve a empezar con la cubeta llena.
+    """
+
+    def __init__(self, path: str, slots: int, stripes: int):
+        stripes = max(1, min(stripes, slots))
+        self.path = path
+        self.stripe_size = max(PROBES, slots // stripes)
+        self.stripes = stripes
+        self.slots = self.stripe_size * stripes
+        self._thread_locks = [threading.Lock() for _ in range(stripes)]
+        self._fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        self._pid: Optional[int] = None
+        self._open_lock = threading.Lock()
+
+    def _open(self) -> mmap.mmap:
+        if self._map is not None and self._pid == os.getpid():
+            return self._map
+        with self._open_lock:
+            if self._map is None or self._pid != os.getpid():
+                size = self.slots * _SLOT.size
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                if os.fstat(fd).st_size < size:
+                    # Todo a cero = casillas vacías; ftruncate no borra lo que ya escribió otro worker
+                    os.ftruncate(fd, size)
+                self._fd, self._map, self._pid = fd, mmap.mmap(fd, size), os.getpid()
+        return self._map
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        # 0 marca una casilla vacía
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") | 1
+
+    def _lock(self, stripe: int) -> None:
+        self._thread_locks[stripe].acquire()
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, stripe * self.stripe_size * _SLOT.size)
+
+    def _unlock(self, stripe: int) -> None:
+        fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, stripe * self.stripe_size * _SLOT.size)
+        self._thread_locks[stripe].release()
+
+    def _find(self, data: mmap.mmap, key_hash: int, stripe: int, taken) -> Tuple[int, Optional[Tuple[float, float]]]:
+        """Casilla de la clave dentro de su franja y su estado (None si no estaba)"""
+        start = stripe * self.stripe_size
+        first = key_hash % self.stripe_size
+        oldest, oldest_at = None, math.inf
+        for i in range(PROBES):
+            index = start + (first + i) % self.stripe_size
+            if index in taken:
+                continue
+            slot_hash, tokens, updated = _SLOT.unpack_from(data, index * _SLOT.size)
+            if slot_hash == key_hash:
+                return index, (tokens, updated)
+            if slot_hash == 0:
+                return index, None
+            if updated < oldest_at:
+                oldest, oldest_at = index, updated
+        return oldest, None
+
+    def hit(self, key: str, limits: Sequence[Limit]) -> float:
+        """
+        Consume un token de cada cubeta de ``key`` (una por límite) si todas
+        tienen; si no, no consume nada y devuelve los segundos hasta que lo haya.
+        """
+        return self.hit_many([(key, limit) for limit in limits])
+
+    def hit_many(self, buckets: Sequence[Tuple[str, Limit]]) -> float:
+        """Como ``hit``, para cubetas de varias claves a la vez (todas o ninguna)"""
+        data = self._open()
+        now = time.time()
+        entries = []
+        for key, limit in buckets:
+            key_hash = self._hash(f"{key}|{limit.name}")
+            entries.append((key_hash, (key_hash // self.stripe_size) % self.stripes, limit))
+        stripes = sorted({stripe for _, stripe, _ in entries})
+        for stripe in stripes:
+            self._lock(stripe)
+        try:
+            states: List[Tuple[int, int, float]] = []
+            wait = 0.0
+            for key_hash, stripe, limit in entries:
+                index, state = self._find(data, key_hash, stripe, {taken for taken, _, _ in states})
+                if state is None:
+                    tokens = limit.capacity
+                else:
+                    tokens = min(limit.capacity, state[0] + max(now - state[1], 0.0) * limit.rate)
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / limit.rate)
+                states.append((index, key_hash, tokens))
+            if wait:
+                return wait
+            for index, key_hash, tokens in states:
+                _SLOT.pack_into(data, index * _SLOT.size, key_hash, tokens - 1, now)
+            return 0.0
+        finally:
+            for stripe in reversed(stripes):
+                self._unlock(stripe)
+
+
+class ClientAddress:
+    """
+    IP del cliente de una solicitud.
+
+    Si la conexión viene de un proxy de confianza (``trusted_proxies``, IPs o
+    redes), se toma ``X-Forwarded-For`` recorriéndolo de derecha a izquierda y
+    saltando los proxies de confianza: la primera dirección que no lo es es el
+    cliente. De cualquier otro origen el encabezado se ignora, porque el
+    cliente podría escribir lo que quisiera.
+    """
+
+    def __init__(self, trusted_proxies: Sequence[str] = ()):
+        self.trusted = [ipaddress.ip_network(proxy.strip(), strict=False) for proxy in trusted_proxies if proxy.strip()]
+
+    def _is_trusted(self, address: str) -> bool:
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in network for network in self.trusted)
+
+    def __call__(self, scope: Scope) -> str:
+        client = scope.get("client")
+        peer = client[0] if client else "unknown"
+        if not self.trusted or not self._is_trusted(peer):
+            return peer
+        forwarded = [
+            value.decode("latin-1")
+            for name, value in scope["headers"] if name == b"x-forwarded-for"
+        ]
+        hops = [hop.strip() for value in forwarded for hop in value.split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not self._is_trusted(hop):
+                return hop
+        return hops[0] if hops else peer
+
+
+# Clave de una solicitud para path_keys: recibe el scope, el cuerpo ya leído y la IP del cliente
+KeyFunc = Callable[[Scope, bytes, str], Optional[str]]
+# Cuerpo máximo que se lee para calcular una clave; más grande, se usa la IP
+MAX_KEY_BODY = 16 * 1024
+
+
+def login_key(scope: Scope, body: bytes, ip: str) -> Optional[str]:
+    """IP del cliente más el email del cuerpo (normalizado), o None si no lo tiene"""
+    try:
+        email = json.loads(body).get("email")
+    except (ValueError, AttributeError):
+        return None
+    if not isinstance(email, str) or not email.strip():
+        return None
+    return f"ip:{ip}|email:{email.strip().lower()}"
+
+
+def refresh_token_key(scope: Scope, body: bytes, ip: str) -> Optional[str]:
+    """Familia firmada del refresh token del cuerpo (una por sesión), o None si no la tiene"""
+    try:
+        token = json.loads(body).get("refresh_token")
+    except (ValueError, AttributeError):
+        return None
+    family_id = refresh_token_family(token) if isinstance(token, str) else None
+    return f"family:{family_id}" if family_id else None
+
+
+class RateLimitMiddleware:
+    """
+    Middleware ASGI que rechaza con 429 antes de enrutar (antes de bcrypt o la base de datos).
+
+    Las rutas de ``path_limits`` usan sus propios límites, por la clave de
+    ``path_keys`` si la ruta tiene una (calculada con el cuerpo de la
+    solicitud) o si no por IP; el resto, ``default_limits`` por usuario del
+    token (o IP si no hay token válido). Los ``path_ip_limits`` de una ruta
+    se aplican además por IP, como tope para todas las claves de esa IP.
+    La IP sale de ``client_address``.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        buckets: SharedTokenBuckets,
+        default_limits: Sequence[Limit],
+        path_limits: Optional[Dict[str, Sequence[Limit]]] = None,
+        path_keys: Optional[Dict[str, KeyFunc]] = None,
+        path_ip_limits: Optional[Dict[str, Sequence[Limit]]] = None,
+        client_address: Optional[ClientAddress] = None,
+    ):
+        self.app = app
+        self.buckets = buckets
+        self.default_limits = tuple(default_limits)
+        self.path_limits = dict(path_limits or {})
+        self.path_keys = dict(path_keys or {})
+        self.path_ip_limits = dict(path_ip_limits or {})
+        self.client_address = client_address or ClientAddress()
+
+    def _subject_or_ip(self, scope: Scope) -> str:
+        """``sub`` de un JWT válido (verificado, vía la caché de tokens) o la IP del cliente"""
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and token:
+                    try:
+                        sub = token_cache.decode(token).get("sub")
+                    except Exception:
+                        break
+                    if sub is not None:
+                        return f"sub:{sub}"
+                break
+        return f"ip:{self.client_address(scope)}"
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> Tuple[List[Message], bytes]:
+        """Lee el cuerpo (hasta MAX_KEY_BODY) y devuelve los mensajes para repetirlos a la aplicación"""
+        messages: List[Message] = []
+        body = b""
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            body += message.get("body", b"")
+            if not message.get("more_body") or len(body) > MAX_KEY_BODY:
+                break
+        return messages, body if len(body) <= MAX_KEY_BODY else b""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        limits = self.path_limits.get(path)
+        if limits is not None:
+            ip = self.client_address(scope)
+            key = None
+            key_func = self.path_keys.get(path)
+            if key_func is not None:
+                messages, body = await self._read_body(receive)
+                key = key_func(scope, body, ip)
+                receive = _replay(messages, receive)
+            buckets = [(f"{key or 'ip:' + ip}|{path}", limit) for limit in limits]
+            buckets += [(f"ip:{ip}|{path}|backstop", limit) for limit in self.path_ip_limits.get(path, ())]
+        else:
+            buckets = [(self._subject_or_ip(scope), limit) for limit in self.default_limits]
+
+        wait = self.buckets.hit_many(buckets)
+        if not wait:
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": "Demasiadas solicitudes, intente más tarde"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(math.ceil(wait)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def _replay(messages: List[Message], receive: Receive) -> Receive:
+    """``receive`` que entrega primero los mensajes ya leídos"""
+    pending = list(messages)
+
+    async def replay() -> Message:
+        if pending:
+            return pending.pop(0)
+        return await receive()
+
+    return replay
+
+
+rate_limit_buckets = SharedTokenBuckets(
+    settings.RATE_LIMIT_FILE or os.path.join(
+        "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "mdm_rate_limit"
+    ),
+    slots=settings.RATE_LIMIT_SLOTS,
+    stripes=settings.RATE_LIMIT_STRIPES,
+)
+
+DEFAULT_LIMITS = (
+    Limit("minute", settings.RATE_LIMIT_PER_MINUTE, 60),
+    Limit("hour", settings.RATE_LIMIT_PER_HOUR, 3600),
+)
+
+LOGIN_LIMITS = (
+    Limit("minute", settings.RATE_LIMIT_LOGIN_PER_MINUTE, 60),
+    Limit("hour", settings.RATE_LIMIT_LOGIN_PER_HOUR, 3600),
+)
+
+LOGIN_IP_LIMITS = (
+    Limit("minute", settings.RATE_LIMIT_LOGIN_IP_PER_MINUTE, 60),
+    Limit("hour", settings.RATE_LIMIT_LOGIN_IP_PER_HOUR, 3600),
+)
+
+REFRESH_LIMITS = (
+    Limit("minute", settings.RATE_LIMIT_REFRESH_PER_MINUTE, 60),
+    Limit("hour", settings.RATE_LIMIT_REFRESH_PER_HOUR, 3600),
+)
+
+client_address = ClientAddress(settings.RATE_LIMIT_TRUSTED_PROXIES)
@@ -0,0 +1,265 @@
+# app/core/response_cache.py
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+from fastapi import Request, Response, status
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.config.database import SessionLocal
+from app.config.replicas import is_write
+from app.config.settings import settings
+
+# Una casilla: (versión, instante del último cambio)
+_SLOT = struct.Struct("<Qd")
+# Casillas de la tabla compartida; dos tablas en la misma casilla solo comparten invalidaciones
+VERSION_SLOTS = 256
+# Versión que cambia con escrituras de SQL directo cuya tabla no se conoce; toda entrada depende de ella
+ANY_TABLE = "*"
+
+# Encabezados de la respuesta original que se guardan y se repiten en los aciertos
+_KEPT_HEADERS = ("content-type", "x-total-count", "x-page", "x-per-page", "x-next-cursor")
+
+
+class EntityVersions:
+    """
+    Contador de versión por tabla, incrementado al confirmar cambios en ella.
+
+    Con ``path`` los contadores viven en un archivo mapeado en memoria
+    (``/dev/shm`` si existe) y todos los workers de la máquina ven los
+    incrementos de los demás al momento; leer una versión es leer 8 bytes.
+    Sin ``path`` son locales al proceso.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._local: Dict[str, Tuple[int, float]] = {}
+        self._map: Optional[mmap.mmap] = None
+        self._fd: Optional[int] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _open(self) -> mmap.mmap:
+        if self._map is not None and self._pid == os.getpid():
+            return self._map
+        with self._lock:
+            if self._map is None or self._pid != os.getpid():
+                size = VERSION_SLOTS * _SLOT.size
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                if os.fstat(fd).st_size < size:
+                    os.ftruncate(fd, size)
+                self._fd, self._map, self._pid = fd, mmap.mmap(fd, size), os.getpid()
+        return self._map
+
+    @staticmethod
+    def _offset(table: str) -> int:
+        slot = int.from_bytes(hashlib.blake2b(table.encode(), digest_size=4).digest(), "little") % VERSION_SLOTS
+        return slot * _SLOT.size
+
+    def _read(self, table: str) -> Tuple[int, float]:
+        if not self.path:
+            return self._local.get(table, (0, 0.0))
+        return _SLOT.unpack_from(self._open(), self._offset(table))
+
+    def get(self, table: str) -> int:
+        return self._read(table)[0]
+
+    def changed_within(self, tables: Sequence[str], seconds: float) -> bool:
+        """True si alguna de ``tables`` cambió hace menos de ``seconds``"""
+        now = time.time()
+        return any(now - self._read(table)[1] < seconds for table in tables)
+
+    def bump(self, tables: Sequence[str]) -> None:
+        now = time.time()
+        if not self.path:
+            with self._lock:
+                for table in tables:
+                    self._local[table] = (self._local.get(table, (0, 0.0))[0] + 1, now)
+            return
+        data = self._open()
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            try:
+                for table in set(tables):
+                    offset = self._offset(table)
+                    version, _ = _SLOT.unpack_from(data, offset)
+                    _SLOT.pack_into(data, offset, version + 1, now)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match usa comparación débil: se ignora el prefijo W/
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+
+class ResponseCache:
+    """
+    LRU en memoria de respuestas GET ya serializadas, con ETag fuerte.
+
+    Cada entrada se guarda junto con la versión de las tablas de las que
+    depende (``EntityVersions``) y deja de valer en cuanto alguna cambia, o
+    a los ``ttl`` segundos como red de seguridad para escrituras hechas
+    fuera de la API. El ETag es el hash del cuerpo, así que es el mismo en
+    todos los workers y un ``If-None-Match`` coincidente se responde con
+    ``304`` sin consultar la base de datos ni serializar nada.
+    """
+
+    def __init__(self, versions: EntityVersions, max_bytes: int, ttl: float):
+        self.versions = versions
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Tuple[int, ...], float, str, bytes, Dict[str, str]]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    def _lookup(self, key: Tuple[str, str], versions: Tuple[int, ...]):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == versions and now - entry[1] < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+                self._remove(key)
+            self.misses += 1
+        return None
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry[3])
+
+    def _store(self, key: Tuple[str, str], versions: Tuple[int, ...], etag: str, body: bytes, headers: Dict[str, str]) -> None:
+        if len(body) > self.max_bytes // 8:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (versions, time.monotonic(), etag, body, headers)
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _respond(self, request: Request, etag: str, body: bytes, headers: Dict[str, str]) -> Response:
+        headers = dict(headers, etag=etag)
+        headers["cache-control"] = "private, no-cache"
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            with self._lock:
+                self.not_modified += 1
+            headers.pop("content-type", None)
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=body, headers=headers)
+
+    def serve(self, request: Request, db: Session, tables: Sequence[str], build: Callable[[], Any]) -> Any:
+        """
+        Respuesta de ``build`` para esta URL, desde la caché si las versiones
+        de ``tables`` no cambiaron desde que se guardó.
+
+        Solo se guardan respuestas 200 ya serializadas (``Response``); las
+        demás se devuelven tal cual. Tampoco se guarda lo leído de una réplica
+        si ``tables`` cambió hace menos que el retraso máximo admitido, porque
+        podría ser anterior al cambio.
+        """
+        if self.max_bytes <= 0:
+            return build()
+        key = (request.url.path, request.url.query)
+        # Versiones leídas antes de consultar: si algo cambia mientras tanto,
+        # la entrada queda con la versión vieja y el siguiente acceso la descarta
+        tables = (*tables, ANY_TABLE)
+        versions = tuple(self.versions.get(table) for table in tables)
+        entry = self._lookup(key, versions)
+        if entry is not None:
+            return self._respond(request, entry[2], entry[3], entry[4])
+
+        result = build()
+        if not isinstance(result, Response) or result.status_code != status.HTTP_200_OK:
+            return result
+        body = bytes(result.body)
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        headers = {name: result.headers[name] for name in _KEPT_HEADERS if name in result.headers}
+        stale_replica = db.info.get("replica") is not None and self.versions.changed_within(
+            tables, settings.DB_REPLICA_MAX_LAG_SECONDS
+        )
+        if not stale_replica:
+            self._store(key, versions, etag, body, headers)
+        return self._respond(request, etag, body, headers)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "shared_versions": bool(self.versions.path),
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+def track_versions(session_class, versions: EntityVersions) -> None:
+    """Incrementa en ``versions`` las tablas en las que ``session_class`` confirma cambios"""
+
+    @event.listens_for(session_class, "after_flush")
+    def _after_flush(session, flush_context):
+        tables = session.info.setdefault("changed_tables", set())
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            tables.add(type(obj).__table__.name)
+
+    @event.listens_for(session_class, "after_commit")
+    def _after_commit(session):
+        tables = session.info.pop("changed_tables", None)
+        if tables:
+            versions.bump(sorted(tables))
+
+    @event.listens_for(session_class, "after_rollback")
+    def _after_rollback(session):
+        session.info.pop("changed_tables", None)
+
+    @event.listens_for(session_class, "do_orm_execute")
+    def _do_orm_execute(state):
+        # UPDATE/DELETE/INSERT masivos no pasan por el flush
+        if state.is_insert or state.is_update or state.is_delete:
+            table = getattr(state.statement, "table", None)
+            if table is not None:
+                state.session.info.setdefault("changed_tables", set()).add(table.name)
+        elif is_write(state.statement):
+            # SQL de escritura sin tabla conocida: invalida todo lo cacheado
+            state.session.info.setdefault("changed_tables", set()).add(ANY_TABLE)
+
+
+entity_versions = EntityVersions(
+    (settings.RESPONSE_CACHE_VERSIONS_FILE or os.path.join(
+        "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "mdm_entity_versions"
+    )) if settings.RESPONSE_CACHE_SHARED else None
+)
+response_cache = ResponseCache(
+    entity_versions,
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES if settings.RESPONSE_CACHE_ENABLED else 0,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+track_versions(SessionLocal, entity_versions)
@@ -0,0 +1,131 @@
+# app/core/responses.py
+import types
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, EmailStr, TypeAdapter
+
+JSON_MEDIA_TYPE = "application/json"
+# Valores distintos que recuerda cada conversión de campo (p. ej. correos)
+CONVERTER_CACHE_SIZE = 16384
+
+# OPT_UTC_Z: "Z" para UTC, igual que Pydantic
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def _default(value: Any) -> Any:
+    # Los esquemas declaran los importes como float: mismo resultado que Pydantic
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """JSON con orjson; fechas, horas y Decimal sin conversión previa"""
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """Respuesta por defecto de la API: como JSONResponse pero serializada con orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# Tipo del esquema -> tipos de columna que lo producen sin conversión
+_COMPATIBLE: Dict[Any, Tuple[type, ...]] = {
+    int: (int,),
+    float: (float, Decimal, int),
+    bool: (bool,),
+    str: (str,),
+    date: (date,),
+    datetime: (datetime,),
+    time: (time,),
+}
+
+# Tipos que Pydantic normaliza (EmailStr pasa el dominio a minúsculas): se
+# validan solo esos valores, con caché porque los mismos se repiten entre listados
+_CONVERTED: Dict[Any, Tuple[type, ...]] = {
+    EmailStr: (str,),
+}
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+class RowSerializer:
+    """Serializa filas (dicts de columnas) con la misma salida que ``schema``"""
+    __slots__ = ("fields", "converters")
+
+    def __init__(self, fields: Tuple[str, ...], converters: Tuple[Tuple[str, Callable[[Any], Any]], ...]):
+        self.fields = fields
+        self.converters = converters
+
+    def dumps(self, rows: List[Dict[str, Any]]) -> bytes:
+        # Mismo orden de claves que el esquema; fuera las columnas extra (la del orden)
+        fields = self.fields
+        out = [{name: row[name] for name in fields} for row in rows]
+        for name, convert in self.converters:
+            for row in out:
+                if row[name] is not None:
+                    row[name] = convert(row[name])
+        return dumps(out)
+
+
+@lru_cache(maxsize=256)
+def fast_serializer(schema: Type[BaseModel], model: type) -> Optional[RowSerializer]:
+    """
+    Serializador directo de filas de ``model`` para ``schema``, si es posible.
+
+    Lo es cuando todos los campos del esquema salen de columnas del modelo con
+    el mismo tipo: una fila de la base de datos ya tiene la forma de la
+    respuesta y no hace falta validar cada objeto con Pydantic. Devuelve None
+    si algún campo no es una columna, tiene alias, validadores o
+    serializadores, o su tipo no coincide con el de la columna.
+    """
+    decorators = schema.__pydantic_decorators__
+    if (
+        decorators.validators or decorators.field_validators or decorators.root_validators
+        or decorators.model_validators or decorators.field_serializers
+        or decorators.model_serializers or decorators.computed_fields
+    ):
+        return None
+    columns = model.__table__.c
+    converters = []
+    for name, info in schema.model_fields.items():
+        if info.alias or info.serialization_alias or name not in columns:
+            return None
+        annotation = _unwrap_optional(info.annotation)
+        try:
+            python_type = columns[name].type.python_type
+        except NotImplementedError:
+            return None
+        if python_type in _COMPATIBLE.get(annotation, ()):
+            continue
+        if python_type in _CONVERTED.get(annotation, ()):
+            converters.append((name, lru_cache(maxsize=CONVERTER_CACHE_SIZE)(TypeAdapter(annotation).validate_python)))
+            continue
+        return None
+    return RowSerializer(tuple(schema.model_fields), tuple(converters))
+
+
+def json_response(body: bytes, response: Response) -> Response:
+    """
+    Respuesta con ``body`` ya serializado. Se copian los encabezados fijados
+    en ``response`` porque FastAPI no los fusiona cuando el endpoint devuelve
+    un Response propio.
+    """
+    return Response(
+        content=body,
+        media_type=JSON_MEDIA_TYPE,
+        headers={key: value for key, value in response.headers.items() if key.lower() != "content-length"},
+    )
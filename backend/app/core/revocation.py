@@ -0,0 +1,209 @@
+# app/core/revocation.py
+import fcntl
+import heapq
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import event, inspect
+from app.config.database import SessionLocal
+from app.config.settings import settings
+from app.core.security import ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.token_cache import token_cache
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Estados de empleado que invalidan sus tokens
+REVOKING_STATUSES = ("TERMINATED",)
+
+# El archivo se reescribe sin entradas expiradas al superar este tamaño
+COMPACT_BYTES = 1024 * 1024
+
+
+class RevocationStore:
+    """
+    Tokens revocados, compartidos entre workers mediante un archivo JSONL.
+
+    Dos tipos de entrada:
+    - ``jti``: un token concreto (logout), hasta su ``exp``.
+    - ``sub``: todos los tokens de un usuario emitidos antes de un instante
+      (baja, bloqueo), hasta que caduque el último token posible.
+
+    Cada worker guarda las entradas vigentes en memoria (dicts, comprobación
+    O(1)) y lee lo que otros workers añadieron al archivo como mucho cada
+    ``sync_interval`` segundos. Las entradas caducadas se descartan por orden
+    de expiración con un heap. El archivo hace de sustituto local de Redis.
+    """
+
+    def __init__(self, path: str, sync_interval: float, max_token_lifetime: float):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.max_token_lifetime = max_token_lifetime
+        self._jtis: Dict[str, float] = {}
+        self._subjects: Dict[str, Tuple[float, float]] = {}
+        self._expiry: List[Tuple[float, str, str]] = []
+        self._inode: Optional[int] = None
+        self._offset = 0
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+
+    # --- Consulta ---
+
+    def is_revoked(self, payload: Dict[str, Any]) -> bool:
+        self._sync()
+        jti = payload.get("jti")
+        if jti and jti in self._jtis:
+            return True
+        subject = self._subjects.get(str(payload.get("sub")))
+        if subject is not None:
+            return payload.get("iat", 0) <= subject[0]
+        return False
+
+    # --- Revocación ---
+
+    def revoke_token(self, payload: Dict[str, Any]) -> None:
+        """Revoca el token de ``payload`` (necesita ``jti``) hasta su ``exp``"""
+        jti = payload.get("jti")
+        if not jti:
+            return
+        exp = float(payload.get("exp") or time.time() + self.max_token_lifetime)
+        self._write({"t": "jti", "id": jti, "exp": exp})
+
+    def revoke_subject(self, sub: Any) -> None:
+        """Revoca todos los tokens ya emitidos para el usuario ``sub``"""
+        now = time.time()
+        self._write({"t": "sub", "id": str(sub), "before": now, "exp": now + self.max_token_lifetime})
+        token_cache.invalidate_subject(sub)
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._apply(entry)
+        line = (json.dumps(entry, separators=(",", ":")) + "\n").encode()
+        try:
+            while True:
+                fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                    # Otro worker pudo compactar (reemplazar el archivo) mientras esperábamos
+                    if os.fstat(fd).st_ino != os.stat(self.path).st_ino:
+                        continue
+                    os.write(fd, line)
+                    if os.fstat(fd).st_size > COMPACT_BYTES:
+                        self._compact()
+                    break
+                finally:
+                    os.close(fd)
+        except OSError as exc:
+            logger.error(f"Could not persist token revocation: {exc}")
+
+    def _compact(self) -> None:
+        """Reescribe el archivo solo con entradas vigentes (con el lock ya tomado)"""
+        now = time.time()
+        with open(self.path, "rb") as source:
+            lines = [line for line in source if line.endswith(b"\n")]
+        live = []
+        for line in lines:
+            try:
+                if json.loads(line)["exp"] > now:
+                    live.append(line)
+            except (ValueError, KeyError):
+                continue
+        directory = os.path.dirname(os.path.abspath(self.path))
+        tmp_fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".revocations")
+        with os.fdopen(tmp_fd, "wb") as target:
+            target.writelines(live)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, self.path)
+
+    # --- Estado en memoria ---
+
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        exp = float(entry["exp"])
+        if exp <= time.time():
+            return
+        if entry["t"] == "jti":
+            self._jtis[entry["id"]] = max(exp, self._jtis.get(entry["id"], 0))
+        elif entry["t"] == "sub":
+            before, current_exp = self._subjects.get(entry["id"], (0.0, 0.0))
+            self._subjects[entry["id"]] = (max(before, float(entry["before"])), max(exp, current_exp))
+        else:
+            return
+        heapq.heappush(self._expiry, (exp, entry["t"], entry["id"]))
+
+    def _prune(self) -> None:
+        now = time.time()
+        while self._expiry and self._expiry[0][0] <= now:
+            exp, kind, key = heapq.heappop(self._expiry)
+            if kind == "jti" and self._jtis.get(key) == exp:
+                del self._jtis[key]
+            elif kind == "sub" and key in self._subjects and self._subjects[key][1] == exp:
+                del self._subjects[key]
+
+    def _sync(self) -> None:
+        now = time.monotonic()
+        if now - self._synced_at < self.sync_interval:
+            return
+        with self._lock:
+            self._synced_at = now
+            self._prune()
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                return
+            if stat.st_ino != self._inode or stat.st_size < self._offset:
+                # Archivo nuevo o compactado: se vuelve a leer entero
+                self._inode = stat.st_ino
+                self._offset = 0
+            if stat.st_size == self._offset:
+                return
+            try:
+                with open(self.path, "rb") as source:
+                    source.seek(self._offset)
+                    data = source.read()
+            except OSError as exc:
+                logger.error(f"Could not read token revocations: {exc}")
+                return
+            complete = data.rfind(b"\n") + 1
+            for line in data[:complete].splitlines():
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError):
+                    continue
+            self._offset += complete
+
+    def stats(self) -> Dict[str, Any]:
+        self._sync()
+        return {"tokens": len(self._jtis), "subjects": len(self._subjects), "path": self.path}
+
+
+def track_terminations(session_class, store: RevocationStore, model, status_column: str, statuses) -> None:
+    """Revoca los tokens de un usuario cuando su estado pasa a uno de ``statuses`` (al confirmar)"""
+
+    @event.listens_for(session_class, "after_flush")
+    def _after_flush(session, flush_context):
+        for obj in session.dirty:
+            if isinstance(obj, model):
+                history = inspect(obj).attrs[status_column].history
+                if history.added and history.added[0] in statuses:
+                    session.info.setdefault("revoke_subjects", set()).add(obj.id)
+
+    @event.listens_for(session_class, "after_commit")
+    def _after_commit(session):
+        for sub in session.info.pop("revoke_subjects", ()):
+            store.revoke_subject(sub)
+
+    @event.listens_for(session_class, "after_rollback")
+    def _after_rollback(session):
+        session.info.pop("revoke_subjects", None)
+
+
+revocations = RevocationStore(
+    settings.TOKEN_REVOCATION_FILE or os.path.join(tempfile.gettempdir(), "mdm_token_revocations.jsonl"),
+    sync_interval=settings.TOKEN_REVOCATION_SYNC_SECONDS,
+    max_token_lifetime=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+track_terminations(SessionLocal, revocations, User, "employee_status", REVOKING_STATUSES)
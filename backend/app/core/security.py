@@ -1,14 +1,20 @@
 # app/core/security.py
+import hashlib
+import hmac
+import secrets
+import uuid
 from datetime import datetime, timedelta
 from jose import jwt
 from passlib.context import CryptContext
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from app.config.settings import settings
 
-pwd_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Los hashes con otro costo se consideran obsoletos y se rehacen al iniciar sesión
+pwd_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 1 día
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES
+REFRESH_TOKEN_EXPIRE_DAYS = settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS
 
 def hash_password(password: str) -> str:
     return pwd_ctx.hash(password)
@@ -18,9 +24,39 @@ def verify_password(plain: str, hashed: str) -> bool:
 
 def create_access_token(data: Dict[str, Any], expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
+    now = datetime.utcnow()
+    expire = now + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+    # jti identifica el token para revocarlo; iat permite revocar todos los anteriores a un instante
+    to_encode.setdefault("jti", uuid.uuid4().hex)
+    to_encode.update({"exp": expire, "iat": now})
     return jwt.encode(to_encode, settings.JWT_SECRET, algorithm=ALGORITHM)
 
 def decode_access_token(token: str) -> Dict[str, Any]:
     return jwt.decode(token, settings.JWT_SECRET, algorithms=[ALGORITHM])
+
+def _family_tag(family_id: str) -> str:
+    return hmac.new(settings.JWT_SECRET.encode(), f"refresh-family:{family_id}".encode(), hashlib.sha256).hexdigest()[:16]
+
+def create_refresh_token(family_id: str) -> Tuple[str, str]:
+    """
+    Token para el cliente y su hash para guardar en la base de datos.
+
+    El token lleva delante su familia firmada (``familia.firma.aleatorio``)
+    para que el límite de solicitudes de /auth/refresh pueda agrupar por
+    sesión sin consultar la base de datos; la parte aleatoria sigue siendo
+    de 256 bits.
+    """
+    token = f"{family_id}.{_family_tag(family_id)}.{secrets.token_urlsafe(32)}"
+    return token, hash_refresh_token(token)
+
+def refresh_token_family(token: str) -> Optional[str]:
+    """Familia de un refresh token si su firma es válida (None en tokens antiguos o alterados)"""
+    family_id, _, rest = token.partition(".")
+    tag, _, random_part = rest.partition(".")
+    if not family_id or not random_part or not hmac.compare_digest(tag, _family_tag(family_id)):
+        return None
+    return family_id
+
+def hash_refresh_token(token: str) -> str:
+    # El token es aleatorio de 256 bits: basta SHA-256, sin el costo de bcrypt
+    return hashlib.sha256(token.encode()).hexdigest()
@@ -0,0 +1,203 @@
+# app/core/slow_queries.py
+import hashlib
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+from functools import lru_cache
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config.settings import settings
+from app.core import query_counter
+
+logger = logging.getLogger(__name__)
+
+# Opción de ejecución que excluye una sentencia del registro (el propio EXPLAIN)
+SKIP_OPTION = "skip_slow_query_log"
+
+# Fingerprints distintos que se conservan; al superarlo se olvida el de menor tiempo total
+MAX_FINGERPRINTS = 500
+# EXPLAIN pendientes como mucho; si la base está saturada no se le añade más carga
+MAX_PENDING_EXPLAINS = 16
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\?|(?<![:\w]):\w+")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+# Parámetros cuyo nombre sugiere datos personales: se ocultan aunque sean números o fechas
+_SENSITIVE = re.compile(r"pass|hash|token|email|phone|curp|rfc|nss|address|salary|account|birth|name", re.I)
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> Tuple[str, str]:
+    """(id, SQL normalizado): literales y marcadores -> ?, listas IN -> (...)"""
+    sql = _STRING.sub("?", statement)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("(...)", sql)
+    sql = _SPACE.sub(" ", sql).strip()
+    return hashlib.sha1(sql.encode()).hexdigest()[:16], sql
+
+
+def _redact_value(key: Optional[str], value: Any) -> Any:
+    if value is None or isinstance(value, bool):
+        return value
+    sensitive = key is not None and _SENSITIVE.search(key) is not None
+    if isinstance(value, (str, bytes)):
+        # El texto es donde vive casi todo el dato personal: solo tipo y longitud
+        return f"<{type(value).__name__} len={len(value)}>"
+    if isinstance(value, (int, float, Decimal)):
+        return "<redacted>" if sensitive else (str(value) if isinstance(value, Decimal) else value)
+    if isinstance(value, (date, datetime, dt_time)):
+        return "<redacted>" if sensitive else value.isoformat()
+    return f"<{type(value).__name__}>"
+
+
+def redact(parameters: Any) -> Any:
+    """Parámetros de una sentencia sin datos personales (tipos y longitudes de los textos)"""
+    if isinstance(parameters, dict):
+        return {key: _redact_value(key, value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: basta la primera fila
+            return {"rows": len(parameters), "first": redact(parameters[0])}
+        return [_redact_value(None, value) for value in parameters]
+    return _redact_value(None, parameters)
+
+
+class SlowQueryLog:
+    """
+    Registro de sentencias que tardan más de ``threshold`` segundos.
+
+    Cada una se registra con su fingerprint (SQL normalizado), parámetros sin
+    datos personales y la ruta que la lanzó, y se acumula por fingerprint
+    (veces, tiempo total y máximo, rutas) en memoria del proceso. La primera
+    vez que un fingerprint es lento en MariaDB/MySQL se captura su ``EXPLAIN``
+    en un hilo aparte, con una conexión propia, sin retrasar la solicitud.
+    """
+
+    def __init__(self, threshold: float, explain: bool):
+        self.threshold = threshold
+        self.explain = explain
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        self._pending_explains = 0
+
+    def observe(self, conn, statement: str, parameters: Any, elapsed: float) -> None:
+        fp_id, normalized = fingerprint(statement)
+        stats = query_counter.current()
+        route = stats.route if stats is not None else None
+        redacted = redact(parameters)
+        logger.warning(
+            f"Slow query {elapsed * 1000:.1f}ms [{fp_id}] route={route or '-'} "
+            f"sql={normalized[:1000]} params={redacted}"
+        )
+        with self._lock:
+            entry = self._entries.get(fp_id)
+            if entry is None:
+                if len(self._entries) >= MAX_FINGERPRINTS:
+                    coldest = min(self._entries, key=lambda k: self._entries[k]["total_seconds"])
+                    del self._entries[coldest]
+                entry = self._entries[fp_id] = {
+                    "fingerprint": fp_id,
+                    "sql": normalized,
+                    "count": 0,
+                    "total_seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "routes": {},
+                    "sample_params": redacted,
+                    "explain": None,
+                }
+            entry["count"] += 1
+            entry["total_seconds"] += elapsed
+            entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+            entry["last_seen"] = time.time()
+            if route:
+                entry["routes"][route] = entry["routes"].get(route, 0) + 1
+            wants_explain = (
+                self.explain
+                and entry["explain"] is None
+                and conn.dialect.name in ("mysql", "mariadb")
+                and not conn.dialect.is_async
+                and normalized[:6].upper() == "SELECT"
+                and self._pending_explains < MAX_PENDING_EXPLAINS
+            )
+            if wants_explain:
+                entry["explain"] = "pending"
+                self._pending_explains += 1
+        if wants_explain:
+            self._explainer.submit(self._run_explain, conn.engine, fp_id, statement, parameters)
+
+    def _run_explain(self, engine, fp_id: str, statement: str, parameters: Any) -> None:
+        try:
+            with engine.connect() as conn:
+                result = conn.execution_options(**{SKIP_OPTION: True}).exec_driver_sql(
+                    f"EXPLAIN {statement}", parameters
+                )
+                plan: Any = [
+                    {key: (value if isinstance(value, (int, float)) or value is None else str(value))
+                     for key, value in row.items()}
+                    for row in result.mappings()
+                ]
+        except Exception as exc:
+            # El mensaje del driver puede citar valores de los parámetros: solo el tipo
+            logger.debug(f"EXPLAIN failed for {fp_id}: {exc}")
+            plan = f"EXPLAIN failed: {type(exc).__name__}"
+        with self._lock:
+            self._pending_explains -= 1
+            entry = self._entries.get(fp_id)
+            if entry is not None:
+                entry["explain"] = plan
+
+    def top(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Fingerprints con más tiempo total acumulado"""
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda e: e["total_seconds"], reverse=True)[:limit]
+            return [
+                dict(
+                    entry,
+                    total_seconds=round(entry["total_seconds"], 6),
+                    max_seconds=round(entry["max_seconds"], 6),
+                    avg_seconds=round(entry["total_seconds"] / entry["count"], 6),
+                    routes=dict(sorted(entry["routes"].items(), key=lambda item: -item[1])),
+                )
+                for entry in entries
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_SECONDS, explain=settings.SLOW_QUERY_EXPLAIN)
+
+
+if slow_query_log.threshold > 0:
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_started", []).append(perf_counter())
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("slow_query_started")
+        if not started:
+            return
+        elapsed = perf_counter() - started.pop()
+        if elapsed >= slow_query_log.threshold and not (context is not None and context.execution_options.get(SKIP_OPTION)):
+            slow_query_log.observe(conn, statement, parameters, elapsed)
+
+    @event.listens_for(Engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        started = conn.info.get("slow_query_started") if conn is not None else None
+        if started:
+            started.pop()
@@ -0,0 +1,34 @@
+# app/core/startup.py
+import importlib
+import pkgutil
+from time import perf_counter
+from sqlalchemy.orm import configure_mappers
+
+MODELS_PACKAGE = "app.models"
+
+
+def load_models() -> int:
+    """
+    Importa todos los módulos de ``app.models``.
+
+    Con los routers cargados bajo demanda ya no hay garantía de que algún
+    import haya traído cada modelo, y tanto ``configure_mappers`` (relaciones
+    declaradas por nombre) como ``create_all`` necesitan verlos todos.
+    """
+    package = importlib.import_module(MODELS_PACKAGE)
+    modules = [name for _, name, is_pkg in pkgutil.iter_modules(package.__path__) if not is_pkg]
+    for name in modules:
+        importlib.import_module(f"{MODELS_PACKAGE}.{name}")
+    return len(modules)
+
+
+def warm_up_orm() -> float:
+    """
+    Configura ya los mappers de SQLAlchemy (relaciones, columnas, backrefs);
+    si no, los configura la primera consulta de cada worker. Devuelve los
+    segundos que tardó.
+    """
+    started = perf_counter()
+    load_models()
+    configure_mappers()
+    return perf_counter() - started
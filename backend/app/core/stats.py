@@ -0,0 +1,239 @@
+# app/core/stats.py
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple, Type
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+from app.config.database import SessionLocal
+from app.config.replicas import is_write
+from app.config.settings import settings
+from app.models.absence_request import AbsenceRequest
+from app.models.auditoria_horarios import AuditoriaHorarios
+from app.models.employee_benefit import EmployeeBenefit
+from app.models.horario_base import HorarioBase
+from app.models.notification import Notification
+from app.models.payroll_history import PayrollHistory
+from app.models.turno import Turno
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Nombre en el resumen -> (modelo, columna de estado para el desglose o None)
+STAT_ENTITIES: Dict[str, Tuple[Type, Optional[str]]] = {
+    "users": (User, "employee_status"),
+    "absence_requests": (AbsenceRequest, "status"),
+    "schedules": (HorarioBase, None),
+    "payrolls": (PayrollHistory, "payment_status"),
+    "audits": (AuditoriaHorarios, "estado"),
+    "notifications": (Notification, "is_read"),
+    "turnos": (Turno, "activo"),
+    "benefits": (EmployeeBenefit, "is_active"),
+}
+
+_ALL = "_all"
+
+
+def _label(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+class StatsCache:
+    """
+    Conteos por entidad y estado, en memoria del proceso.
+
+    Se recalculan con un ``GROUP BY`` por entidad cada ``reconcile_interval``
+    segundos (o antes si una escritura masiva los invalida), en un hilo
+    aparte: ``summary`` responde con los conteos que hay mientras tanto.
+    Entre reconciliaciones, las altas, bajas y cambios de estado hechos con
+    el ORM se aplican como deltas al confirmar la transacción.
+
+    Cada reconciliación abre una generación nueva antes de leer. Un delta
+    cuya transacción empezó a confirmarse en una generación anterior ya está
+    en la lectura y se descarta; los de la generación en curso se suman
+    encima del resultado. Los conteos son de cada worker: las escrituras de
+    otros workers solo se ven tras la siguiente reconciliación.
+    """
+
+    def __init__(self, entities: Dict[str, Tuple[Type, Optional[str]]], reconcile_interval: float):
+        self.entities = entities
+        self.reconcile_interval = reconcile_interval
+        self._by_model = {model: name for name, (model, _) in entities.items()}
+        self._by_table = {model.__table__.name: name for name, (model, _) in entities.items()}
+        self._counts: Dict[str, Counter] = {}
+        self._reconciled_at: Optional[float] = None
+        self._reconciled_wall: Optional[datetime] = None
+        self._stale = False
+        self._generation = 0
+        # Deltas aplicados durante una reconciliación en curso (None si no hay ninguna)
+        self._pending: Optional[Dict[str, Counter]] = None
+        self._lock = threading.Lock()
+        self._reconcile_lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def summary(self, db: Session) -> Dict[str, Any]:
+        """Totales y desglose por estado; la reconciliación corre en segundo plano"""
+        if self._reconciled_at is None:
+            # Primera lectura: todavía no hay conteos que servir
+            with self._reconcile_lock:
+                if self._reconciled_at is None:
+                    self.reconcile(db)
+        elif self._needs_reconcile() and self._reconcile_lock.acquire(blocking=False):
+            threading.Thread(target=self._reconcile_in_background, name="stats-reconcile", daemon=True).start()
+        with self._lock:
+            counts = {}
+            for name, (_, column) in self.entities.items():
+                counter = self._counts.get(name, Counter())
+                entry: Dict[str, Any] = {"total": max(sum(counter.values()), 0)}
+                if column:
+                    entry["by_status"] = {label: n for label, n in sorted(counter.items()) if n > 0}
+                counts[name] = entry
+            reconciled_at = self._reconciled_wall
+        return {"counts": counts, "reconciled_at": reconciled_at}
+
+    def _needs_reconcile(self) -> bool:
+        return (
+            self._stale
+            or self._reconciled_at is None
+            or time.monotonic() - self._reconciled_at >= self.reconcile_interval
+        )
+
+    def _reconcile_in_background(self) -> None:
+        # Se llama con _reconcile_lock tomado
+        db = SessionLocal()
+        try:
+            self.reconcile(db)
+        except Exception as exc:
+            logger.error(f"Stats reconcile failed: {exc}")
+        finally:
+            db.close()
+            self._reconcile_lock.release()
+
+    def reconcile(self, db: Session) -> None:
+        """
+        Sustituye los conteos por los de la base de datos más los deltas
+        confirmados mientras se leían. Las consultas van en una sola
+        transacción de ``db``, así que todas ven la misma instantánea.
+        """
+        with self._lock:
+            self._generation += 1
+            self._pending = {}
+            # Una escritura masiva durante la lectura lo vuelve a marcar
+            self._stale = False
+        try:
+            fresh: Dict[str, Counter] = {}
+            for name, (model, column) in self.entities.items():
+                if column:
+                    attr = getattr(model, column)
+                    rows = db.query(attr, func.count(model.id)).group_by(attr).all()
+                    fresh[name] = Counter({_label(value): n for value, n in rows})
+                else:
+                    fresh[name] = Counter({_ALL: db.query(func.count(model.id)).scalar()})
+        except Exception:
+            with self._lock:
+                # Los deltas descartados en esta generación se recuperan en el próximo intento
+                self._pending = None
+                self._stale = True
+            raise
+        with self._lock:
+            for name, delta in self._pending.items():
+                fresh.setdefault(name, Counter()).update(delta)
+            self._counts = fresh
+            self._pending = None
+            self._reconciled_at = time.monotonic()
+            self._reconciled_wall = datetime.now(timezone.utc)
+
+    def apply(self, deltas: Dict[str, Counter], generation: int) -> None:
+        """Deltas de una transacción que empezó a confirmarse en ``generation``"""
+        with self._lock:
+            if generation != self._generation:
+                # Confirmada antes de la última lectura, que ya la incluye
+                return
+            for name, delta in deltas.items():
+                self._counts.setdefault(name, Counter()).update(delta)
+                if self._pending is not None:
+                    self._pending.setdefault(name, Counter()).update(delta)
+
+    def mark_stale(self) -> None:
+        self._stale = True
+
+    def collect(self, session: Session) -> Dict[str, Counter]:
+        """Deltas de un flush: filas nuevas, borradas y con estado cambiado"""
+        deltas: Dict[str, Counter] = {}
+
+        def bump(name: str, label: str, n: int):
+            deltas.setdefault(name, Counter())[label] += n
+
+        for obj in session.new:
+            name = self._by_model.get(type(obj))
+            if name:
+                column = self.entities[name][1]
+                bump(name, _label(getattr(obj, column)) if column else _ALL, 1)
+        for obj in session.deleted:
+            name = self._by_model.get(type(obj))
+            if name:
+                column = self.entities[name][1]
+                if column:
+                    history = inspect(obj).attrs[column].history
+                    old = history.deleted[0] if history.deleted else getattr(obj, column)
+                    bump(name, _label(old), -1)
+                else:
+                    bump(name, _ALL, -1)
+        for obj in session.dirty:
+            name = self._by_model.get(type(obj))
+            column = self.entities[name][1] if name else None
+            if column:
+                history = inspect(obj).attrs[column].history
+                if history.deleted and history.added:
+                    bump(name, _label(history.deleted[0]), -1)
+                    bump(name, _label(history.added[0]), 1)
+        return deltas
+
+
+def track_changes(session_class, cache: StatsCache) -> None:
+    """Mantiene ``cache`` al día con las escrituras hechas por ``session_class``"""
+
+    @event.listens_for(session_class, "after_flush")
+    def _after_flush(session, flush_context):
+        pending = session.info.setdefault("stats_deltas", {})
+        for name, delta in cache.collect(session).items():
+            pending.setdefault(name, Counter()).update(delta)
+
+    @event.listens_for(session_class, "before_commit")
+    def _before_commit(session):
+        session.info["stats_generation"] = cache.generation
+
+    @event.listens_for(session_class, "after_commit")
+    def _after_commit(session):
+        deltas = session.info.pop("stats_deltas", None)
+        generation = session.info.pop("stats_generation", cache.generation)
+        if deltas:
+            cache.apply(deltas, generation)
+
+    @event.listens_for(session_class, "after_rollback")
+    def _after_rollback(session):
+        session.info.pop("stats_deltas", None)
+        session.info.pop("stats_generation", None)
+
+    @event.listens_for(session_class, "do_orm_execute")
+    def _do_orm_execute(state):
+        # UPDATE/DELETE/INSERT masivos no pasan por el flush: recalcular en la próxima lectura
+        if state.is_insert or state.is_update or state.is_delete:
+            table = getattr(state.statement, "table", None)
+            if table is None or table.name in cache._by_table:
+                cache.mark_stale()
+        elif is_write(state.statement):
+            cache.mark_stale()
+
+
+stats_cache = StatsCache(STAT_ENTITIES, settings.STATS_RECONCILE_SECONDS)
+track_changes(SessionLocal, stats_cache)
@@ -0,0 +1,57 @@
+# app/core/streaming.py
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from typing import Any, Dict, Iterable, Iterator, Optional, Type
+from app.config.database import read_session
+from app.repositories.base import BaseRepository
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def iter_rows(
+    repo: BaseRepository,
+    filters: Optional[Dict[str, Any]] = None,
+    chunk_size: int = 1000,
+) -> Iterator[Any]:
+    """
+    Recorre una tabla completa con su propia sesión.
+
+    La sesión de ``get_db`` no sirve aquí: la respuesta se sigue enviando
+    después de que el endpoint retorna, así que el generador abre y cierra
+    la suya (en una réplica de lectura si hay alguna). Entre bloques la
+    sesión no tiene transacción abierta ni conexión del pool (ver
+    ``BaseRepository.iter_all``).
+    """
+    db = read_session()
+    try:
+        yield from repo.iter_all(db, filters=filters, chunk_size=chunk_size)
+    finally:
+        db.close()
+
+
+def _ndjson_lines(rows: Iterable[Any], schema: Type[BaseModel], batch_size: int) -> Iterator[bytes]:
+    batch = []
+    for row in rows:
+        batch.append(schema.model_validate(row).model_dump_json())
+        if len(batch) >= batch_size:
+            yield ("\n".join(batch) + "\n").encode()
+            batch = []
+    if batch:
+        yield ("\n".join(batch) + "\n").encode()
+
+
+def ndjson_response(
+    rows: Iterable[Any],
+    schema: Type[BaseModel],
+    filename: Optional[str] = None,
+    batch_size: int = 500,
+) -> StreamingResponse:
+    """Envía ``rows`` como NDJSON (un objeto JSON por línea) sin materializar la lista"""
+    headers = {}
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return StreamingResponse(
+        _ndjson_lines(rows, schema, batch_size),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers=headers,
+    )
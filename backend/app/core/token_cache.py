@@ -0,0 +1,96 @@
+# app/core/token_cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.config.settings import settings
+from app.core.security import decode_access_token
+
+
+class TokenCache:
+    """
+    LRU de tokens ya verificados: hash SHA-256 del token -> payload.
+
+    Cada entrada vale hasta el ``exp`` del propio token, así que un acierto
+    nunca acepta un token que ``jwt.decode`` rechazaría por expirado. Con
+    ``max_size`` entradas se expulsa la menos usada. ``invalidate`` y
+    ``invalidate_subject`` permiten sacar tokens al cerrar sesión o revocarlos.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """Payload del token; solo se verifica la firma si no está en caché"""
+        if self.max_size <= 0:
+            return decode_access_token(token)
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(entry[1])
+                del self._entries[key]
+            self.misses += 1
+
+        # Firma inválida o token expirado: JWTError, y no se guarda nada
+        payload = decode_access_token(token)
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)) and exp > now:
+            with self._lock:
+                self._entries[key] = (float(exp), payload)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return dict(payload)
+
+    def invalidate(self, token: str) -> None:
+        """Olvida un token concreto (p. ej. al cerrar sesión)"""
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+    def invalidate_where(self, predicate: Callable[[Dict[str, Any]], bool]) -> int:
+        """Olvida los tokens cuyo payload cumple ``predicate``; devuelve cuántos"""
+        with self._lock:
+            keys = [key for key, (_, payload) in self._entries.items() if predicate(payload)]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def invalidate_subject(self, sub: Any) -> int:
+        """Olvida todos los tokens de un usuario (baja, cambio de rol, revocación)"""
+        return self.invalidate_where(lambda payload: payload.get("sub") == str(sub))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+token_cache = TokenCache(settings.JWT_CACHE_MAX_SIZE)
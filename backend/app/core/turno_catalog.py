@@ -0,0 +1,151 @@
+# app/core/turno_catalog.py
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.orm import Session
+from app.config.database import SessionLocal
+from app.config.settings import settings
+from app.core.response_cache import EntityVersions, entity_versions
+from app.models.turno import Turno
+from app.schemas.turno_schema import TurnoOut
+
+TABLE = Turno.__table__.name
+# Un id o código desconocido provoca como mucho una recarga por este intervalo
+MISS_RELOAD_SECONDS = 1.0
+
+
+class TurnoCatalog:
+    """
+    Todos los turnos en memoria, por ``id`` y por ``codigo``.
+
+    La tabla es pequeña, así que se carga entera (al arrancar o en el primer
+    uso) y se recarga cuando cambia su versión en ``EntityVersions``: con las
+    versiones compartidas, una escritura en cualquier worker invalida el
+    catálogo de todos. Las escrituras del router de turnos se aplican además
+    directamente (``put`` / ``remove``), sin recargar, si nadie más escribió
+    entre tanto. Sin versiones compartidas, los cambios de otros workers se
+    ven como mucho a los ``max_age`` segundos o al pedir un id desconocido.
+
+    Los ``TurnoOut`` devueltos son compartidos: no se deben modificar.
+    """
+
+    def __init__(self, versions: EntityVersions, max_age: float):
+        self.versions = versions
+        self.max_age = max_age
+        self._by_id: Dict[int, TurnoOut] = {}
+        self._by_codigo: Dict[str, TurnoOut] = {}
+        self._version: Optional[int] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self.loads = 0
+
+    def load(self) -> int:
+        """Lee todos los turnos del primario; devuelve cuántos hay"""
+        version = self.versions.get(TABLE)
+        db: Session = SessionLocal()
+        try:
+            turnos = [TurnoOut.model_validate(obj) for obj in db.query(Turno).all()]
+        finally:
+            db.close()
+        with self._lock:
+            self._by_id = {turno.id: turno for turno in turnos}
+            self._by_codigo = {turno.codigo: turno for turno in turnos}
+            # Versión leída antes de consultar: un cambio concurrente fuerza otra recarga
+            self._version = version
+            self._loaded_at = time.monotonic()
+            self.loads += 1
+        return len(turnos)
+
+    def _stale(self) -> bool:
+        return self._version != self.versions.get(TABLE) or time.monotonic() - self._loaded_at >= self.max_age
+
+    def _fresh(self) -> None:
+        if self._stale():
+            # Un solo hilo recarga; los demás esperan y usan su resultado
+            with self._load_lock:
+                if self._stale():
+                    self.load()
+
+    def _reload_on_miss(self) -> bool:
+        with self._load_lock:
+            if time.monotonic() - self._loaded_at < MISS_RELOAD_SECONDS:
+                return False
+            self.load()
+            return True
+
+    def get(self, id: int) -> Optional[TurnoOut]:
+        self._fresh()
+        turno = self._by_id.get(id)
+        if turno is None and self._reload_on_miss():
+            turno = self._by_id.get(id)
+        return turno
+
+    def get_by_codigo(self, codigo: str) -> Optional[TurnoOut]:
+        self._fresh()
+        turno = self._by_codigo.get(codigo)
+        if turno is None and self._reload_on_miss():
+            turno = self._by_codigo.get(codigo)
+        return turno
+
+    def resolve(self, ids: Iterable[int]) -> Dict[int, TurnoOut]:
+        """Turnos de ``ids`` (los que existan) en una sola pasada, sin consultas"""
+        self._fresh()
+        ids = set(ids)
+        by_id = self._by_id
+        found = {id: by_id[id] for id in ids if id in by_id}
+        if len(found) < len(ids) and self._reload_on_miss():
+            by_id = self._by_id
+            found = {id: by_id[id] for id in ids if id in by_id}
+        return found
+
+    def all(self) -> List[TurnoOut]:
+        self._fresh()
+        return sorted(self._by_id.values(), key=lambda turno: turno.id)
+
+    def _write_through(self, apply) -> None:
+        # El commit ya subió la versión: si solo la subió este cambio, basta aplicarlo.
+        # Se cambian copias de los dicts para no alterar los que otro hilo esté leyendo.
+        current = self.versions.get(TABLE)
+        with self._lock:
+            if self._version is not None and current == self._version + 1:
+                by_id, by_codigo = dict(self._by_id), dict(self._by_codigo)
+                apply(by_id, by_codigo)
+                self._by_id, self._by_codigo, self._version = by_id, by_codigo, current
+                return
+            self._version = None
+
+    def put(self, obj: Turno) -> TurnoOut:
+        """Alta o cambio ya confirmado en la base de datos"""
+        turno = TurnoOut.model_validate(obj)
+
+        def apply(by_id, by_codigo):
+            previous = by_id.get(turno.id)
+            if previous is not None and by_codigo.get(previous.codigo) is previous:
+                del by_codigo[previous.codigo]
+            by_id[turno.id] = turno
+            by_codigo[turno.codigo] = turno
+
+        self._write_through(apply)
+        return turno
+
+    def remove(self, id: int) -> None:
+        """Baja ya confirmada en la base de datos"""
+
+        def apply(by_id, by_codigo):
+            previous = by_id.pop(id, None)
+            if previous is not None and by_codigo.get(previous.codigo) is previous:
+                del by_codigo[previous.codigo]
+
+        self._write_through(apply)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "turnos": len(self._by_id),
+            "version": self._version,
+            "loads": self.loads,
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+        }
+
+
+turno_catalog = TurnoCatalog(entity_versions, max_age=settings.TURNO_CATALOG_MAX_AGE_SECONDS)
@@ -7,19 +7,27 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-import time
+from fastapi.concurrency import run_in_threadpool
+import asyncio
 import logging
 
 from app.config.settings import settings
-from app.config.database import engine, Base
-from app.core.middleware import AuditMiddleware, SecurityHeadersMiddleware
-from app.api.v1 import (
-    auth, users, emergency_contacts,
-    horarios_base, turnos, dependents, employee_documents, job_history, time_off_balances, employee_benefits, horarios_excepcion, auditoria_horarios, payroll_history, absence_requests, approval_history, notifications
+from app.config.database import engine, Base, dispose_async_engine
+from app.core.middleware import HTTPObserverMiddleware, process_time_header, security_headers, server_timing_header
+from app.core.audit import audit_sink
+from app.core.metrics import metrics_registry
+from app.core import query_counter, slow_queries  # noqa: F401  (slow_queries registers its engine listeners)
+from app.core.responses import ORJSONResponse
+from app.core.rate_limit import (
+    DEFAULT_LIMITS, LOGIN_IP_LIMITS, LOGIN_LIMITS, REFRESH_LIMITS, RateLimitMiddleware, client_address,
+    login_key, rate_limit_buckets, refresh_token_key,
 )
+from app.core.pool_metrics import warm_up_pool
+from app.core.hashing import password_hasher
+from app.core.lazy_routers import LazyRouters
+from app.core.startup import warm_up_orm
+from app.core.turno_catalog import turno_catalog
+from app.api.v1 import metrics
 
 
 import sys, os
@@ -32,9 +40,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address)
-
 # Create FastAPI app
 app = FastAPI(
     title="Master Admin HRIS API",
@@ -43,11 +48,20 @@ app = FastAPI(
     docs_url="/api/docs" if settings.ENVIRONMENT != "production" else None,
     redoc_url="/api/redoc" if settings.ENVIRONMENT != "production" else None,
     openapi_url="/api/openapi.json" if settings.ENVIRONMENT != "production" else None,
+    default_response_class=ORJSONResponse,
 )
 
-# Add rate limiter
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Rate limiting (innermost, so 429 responses still get CORS and security headers)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        buckets=rate_limit_buckets,
+        default_limits=DEFAULT_LIMITS,
+        path_limits={"/api/v1/auth/login": LOGIN_LIMITS, "/api/v1/auth/refresh": REFRESH_LIMITS},
+        path_keys={"/api/v1/auth/login": login_key, "/api/v1/auth/refresh": refresh_token_key},
+        path_ip_limits={"/api/v1/auth/login": LOGIN_IP_LIMITS},
+        client_address=client_address,
+    )
 
 # CORS Configuration
 app.add_middleware(
@@ -56,15 +70,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
     allow_headers=["*"],
-    expose_headers=["X-Total-Count", "X-Page", "X-Per-Page"],
+    expose_headers=["X-Total-Count", "X-Page", "X-Per-Page", "X-Next-Cursor", "Server-Timing", "Retry-After", "ETag"],
 )
 
-# Security Headers Middleware
-app.add_middleware(SecurityHeadersMiddleware)
-
-# Audit Logging Middleware
-app.add_middleware(AuditMiddleware)
-
 # Trusted Host Middleware (Production only)
 if settings.ENVIRONMENT == "production":
     app.add_middleware(
@@ -72,14 +80,23 @@ if settings.ENVIRONMENT == "production":
         allowed_hosts=settings.ALLOWED_HOSTS
     )
 
-# Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+# Security headers, X-Process-Time, metrics and audit logging in a single pure-ASGI layer
+start_hooks = [query_counter.begin_request]
+header_hooks = [security_headers(), process_time_header()]
+completion_hooks = []
+if settings.SERVER_TIMING_ENABLED:
+    header_hooks.append(server_timing_header())
+if settings.METRICS_ENABLED:
+    start_hooks.append(metrics_registry.start_request)
+    completion_hooks.append(metrics_registry.finish_request)
+if settings.AUDIT_LOG_ENABLED:
+    completion_hooks.append(audit_sink.record)
+app.add_middleware(
+    HTTPObserverMiddleware,
+    start_hooks=start_hooks,
+    header_hooks=header_hooks,
+    completion_hooks=completion_hooks,
+)
 
 # Exception handlers
 @app.exception_handler(RequestValidationError)
@@ -106,38 +123,82 @@ async def startup_event():
     logger.info("Starting Master Admin HRIS API...")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"Database: {settings.DATABASE_URL.split('@')[1] if '@' in settings.DATABASE_URL else 'configured'}")
-    
+
+    # Import every model and configure the ORM mappers here, not on the first query
+    elapsed = await run_in_threadpool(warm_up_orm)
+    logger.info(f"ORM mappers configured in {elapsed * 1000:.1f}ms")
+
     # Create tables (in production, use Alembic migrations)
     if settings.ENVIRONMENT == "development":
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created/verified")
 
+    # Open the pool's connections now instead of on the first requests
+    if settings.DATABASE_POOL_WARMUP:
+        try:
+            opened = await run_in_threadpool(warm_up_pool, engine, settings.DATABASE_POOL_SIZE)
+            logger.info(f"Database pool warmed up ({opened} connections)")
+        except Exception as exc:
+            logger.warning(f"Database pool warm-up failed: {exc}")
+
+    # Shift catalog in memory, so schedule endpoints don't query turnos
+    try:
+        loaded = await run_in_threadpool(turno_catalog.load)
+        logger.info(f"Turno catalog loaded ({loaded} shifts)")
+    except Exception as exc:
+        logger.warning(f"Turno catalog load failed, will retry on first use: {exc}")
+
+    # Background writer for the audit_log table
+    if settings.AUDIT_LOG_ENABLED:
+        await audit_sink.start()
+
+    # Periodic metrics snapshot so /metrics in any worker sees this one
+    if settings.METRICS_ENABLED:
+        await metrics_registry.start()
+
+    # Load the remaining routers in the background once the worker is serving
+    if routers.pending and settings.LAZY_ROUTERS_PRELOAD:
+        app.state.router_preload = asyncio.create_task(routers.preload())
+
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Master Admin HRIS API...")
-
-# API Routes
-app.include_router(auth.router, prefix="/api/v1/auth", tags=["Auth"])
-app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
-app.include_router(horarios_base.router, prefix="/api/v1/horarios-base", tags=["Base Schedules"])
-app.include_router(emergency_contacts.router, prefix="/api/v1/emergency-contacts", tags=["Emergency Contacts"])
-app.include_router(dependents.router, prefix="/api/v1/dependents", tags=["Dependents"])
-app.include_router(employee_documents.router, prefix="/api/v1/documents", tags=["Documents"])
-app.include_router(
-    job_history.router, 
-    prefix="/api/v1/users/{user_id}/job-history", 
+    if getattr(app.state, "router_preload", None) is not None:
+        app.state.router_preload.cancel()
+    await audit_sink.stop()
+    await metrics_registry.stop()
+    await dispose_async_engine()
+    password_hasher.shutdown()
+
+# API Routes (with LAZY_ROUTERS each module is imported on the first request to its prefix)
+routers = LazyRouters(app, lazy=settings.LAZY_ROUTERS)
+routers.include("app.api.v1.auth", prefix="/api/v1/auth", tags=["Auth"])
+routers.include("app.api.v1.users", prefix="/api/v1/users", tags=["Users"])
+routers.include("app.api.v1.horarios_base", prefix="/api/v1/horarios-base", tags=["Base Schedules"])
+routers.include("app.api.v1.emergency_contacts", prefix="/api/v1/emergency-contacts", tags=["Emergency Contacts"])
+routers.include("app.api.v1.dependents", prefix="/api/v1/dependents", tags=["Dependents"])
+routers.include("app.api.v1.employee_documents", prefix="/api/v1/documents", tags=["Documents"])
+routers.include(
+    "app.api.v1.job_history",
+    prefix="/api/v1/users/{user_id}/job-history",
     tags=["Job History"]
 )
-app.include_router(turnos.router, prefix="/api/v1/turnos", tags=["Turnos"])
-app.include_router(time_off_balances.router, prefix="/api/v1/time-off-balances", tags=["Time Off Balances"])
-app.include_router(employee_benefits.router, prefix="/api/v1/benefits", tags=["Benefits"])
-app.include_router(horarios_excepcion.router, prefix="/api/v1/horarios-excepcion", tags=["Schedule Exceptions"])
-app.include_router(auditoria_horarios.router, prefix="/api/v1/auditoria-horarios", tags=["Schedule Audit"])
-app.include_router(payroll_history.router, prefix="/api/v1/payroll", tags=["Payroll"])
-app.include_router(absence_requests.router, prefix="/api/v1/absence-requests", tags=["Absence Requests"])
-app.include_router(approval_history.router, prefix="/api/v1/approval-history", tags=["Approval History"])
-app.include_router(notifications.router, prefix="/api/v1/notifications", tags=["Notifications"])
+routers.include("app.api.v1.turnos", prefix="/api/v1/turnos", tags=["Turnos"])
+routers.include("app.api.v1.time_off_balances", prefix="/api/v1/time-off-balances", tags=["Time Off Balances"])
+routers.include("app.api.v1.employee_benefits", prefix="/api/v1/benefits", tags=["Benefits"])
+routers.include("app.api.v1.horarios_excepcion", prefix="/api/v1/horarios-excepcion", tags=["Schedule Exceptions"])
+routers.include("app.api.v1.auditoria_horarios", prefix="/api/v1/auditoria-horarios", tags=["Schedule Audit"])
+routers.include("app.api.v1.payroll_history", prefix="/api/v1/payroll", tags=["Payroll"])
+routers.include("app.api.v1.absence_requests", prefix="/api/v1/absence-requests", tags=["Absence Requests"])
+routers.include("app.api.v1.approval_history", prefix="/api/v1/approval-history", tags=["Approval History"])
+routers.include("app.api.v1.notifications", prefix="/api/v1/notifications", tags=["Notifications"])
+routers.include("app.api.v1.system", prefix="/api/v1/system", tags=["System"])
+routers.include("app.api.v1.stats", prefix="/api/v1/stats", tags=["Stats"])
+if settings.METRICS_ENABLED:
+    if settings.ENVIRONMENT == "production" and not settings.METRICS_TOKEN:
+        raise RuntimeError("METRICS_TOKEN is required in production when METRICS_ENABLED is set")
+    app.include_router(metrics.router, tags=["System"])
 
 # Root endpoint
 @app.get("/")
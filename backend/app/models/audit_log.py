@@ -0,0 +1,20 @@
+# app/models/audit_log.py
+from sqlalchemy import Column, String, Integer, Float, DateTime, Index
+from app.models.base import BaseModel
+
+class AuditLog(BaseModel):
+    __tablename__ = "audit_log"
+
+    # Sin clave foránea: el registro se conserva aunque se borre el usuario
+    user_id = Column(Integer, nullable=True, index=True)
+    method = Column(String(10), nullable=False)
+    path = Column(String(500), nullable=False)
+    status_code = Column(Integer, nullable=False)
+    latency_ms = Column(Float, nullable=False)
+    client_ip = Column(String(45), nullable=True)
+    user_agent = Column(String(255), nullable=True)
+
+    __table_args__ = (
+        # Purga por antigüedad (AUDIT_LOG_RETENTION_DAYS)
+        Index("idx_audit_log_created", "created_at"),
+    )
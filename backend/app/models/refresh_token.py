@@ -0,0 +1,15 @@
+# app/models/refresh_token.py
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from app.models.base import BaseModel
+
+class RefreshToken(BaseModel):
+    __tablename__ = "refresh_tokens"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Todos los tokens obtenidos por rotación desde un mismo login comparten familia
+    family_id = Column(String(32), nullable=False, index=True)
+    # SHA-256 del token; el token en claro solo lo tiene el cliente
+    token_hash = Column(String(64), nullable=False, unique=True)
+    expires_at = Column(DateTime, nullable=False)
+    used_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
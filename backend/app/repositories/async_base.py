@@ -0,0 +1,276 @@
+"""
+Async variant of the base repository, for ``async def`` routes using ``get_async_db``
+"""
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from sqlalchemy import func, or_, select, text, update as sql_update
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.encoders import jsonable_encoder
+
+from app.repositories.base import APPROX_COUNT_TTL, BaseRepository, ModelType, _approx_counts
+
+
+class AsyncBaseRepository(BaseRepository[ModelType]):
+    """
+    Same operations as ``BaseRepository`` awaited on an ``AsyncSession``.
+
+    Query building (filters, ordering, keyset cursors, projections) is shared
+    with the sync repository, so a route can move to ``async def`` without
+    changing what it returns. Subclass it next to the sync repository:
+
+        class TurnoAsyncRepository(AsyncBaseRepository[Turno]):
+            def __init__(self):
+                super().__init__(Turno)
+    """
+
+    async def get(self, db: AsyncSession, id: int) -> Optional[ModelType]:
+        """Get a single record by ID"""
+        return await db.get(self.model, id)
+
+    async def get_many(self, db: AsyncSession, ids: List[int]) -> List[ModelType]:
+        """Get several records by ID in a single query (missing IDs are skipped)"""
+        if not ids:
+            return []
+        result = await db.execute(select(self.model).where(self.model.id.in_(set(ids))))
+        return list(result.scalars().all())
+
+    async def get_owned(self, db: AsyncSession, id: int, owner_col: str, owner_id: int) -> Optional[ModelType]:
+        """Get a record by ID only if it belongs to ``owner_id``"""
+        result = await db.execute(
+            select(self.model).where(
+                self.model.id == id,
+                getattr(self.model, owner_col) == owner_id
+            )
+        )
+        return result.scalars().first()
+
+    async def get_multi(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[Any]:
+        """Get multiple records with pagination and filters (see ``BaseRepository.get_multi``)"""
+        stmt = self._list_statement(filters, order_by, cursor, fields)
+        if not cursor:
+            stmt = stmt.offset(skip)
+        result = await db.execute(stmt.limit(limit))
+        if fields:
+            return [row._asdict() for row in result.all()]
+        return list(result.scalars().all())
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        count: str = "window"
+    ) -> Tuple[List[Any], Optional[int]]:
+        """Page plus total number of rows (see ``BaseRepository.get_page``)"""
+        total = None
+        if count == "approx":
+            total = None if filters else await self.approximate_count(db)
+            if total is None:
+                count = "exact"
+
+        if count == "window" and not cursor:
+            total_column = func.count().over().label("_total")
+            stmt = self._list_statement(filters, order_by, None, fields, extra_columns=[total_column])
+            rows = (await db.execute(stmt.offset(skip).limit(limit))).all()
+            if rows:
+                total = rows[0]._total
+            else:
+                total = await self.count(db, filters=filters) if skip else 0
+            if fields:
+                items = [row._asdict() for row in rows]
+                for item in items:
+                    del item["_total"]
+            else:
+                items = [row[0] for row in rows]
+            return items, total
+
+        items = await self.get_multi(
+            db, skip=skip, limit=limit, filters=filters, order_by=order_by, cursor=cursor, fields=fields
+        )
+        if count == "exact":
+            total = await self.count(db, filters=filters)
+        return items, total
+
+    async def approximate_count(self, db: AsyncSession) -> Optional[int]:
+        """Row estimate kept by InnoDB in information_schema; None when not on MariaDB"""
+        if db.get_bind().dialect.name not in ("mysql", "mariadb"):
+            return None
+        table_name = self.model.__table__.name
+        now = time.monotonic()
+        cached = _approx_counts.get(table_name)
+        if cached and now - cached[0] < APPROX_COUNT_TTL:
+            return cached[1]
+        value = (await db.execute(
+            text(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :name"
+            ),
+            {"name": table_name},
+        )).scalar()
+        if value is None:
+            return None
+        _approx_counts[table_name] = (now, int(value))
+        return int(value)
+
+    def _list_statement(
+        self,
+        filters: Optional[Dict[str, Any]],
+        order_by: Optional[str],
+        cursor: Optional[str],
+        fields: Optional[List[str]],
+        extra_columns: Optional[List[Any]] = None
+    ):
+        """``select()`` equivalent of ``BaseRepository._list_query``"""
+        column, descending = self._order_column(order_by)
+        stmt = self._apply_filters(select(*self._entities(fields, column), *(extra_columns or [])), filters)
+        if cursor:
+            stmt = stmt.where(self._keyset_filter(column, descending, order_by, cursor))
+        return stmt.order_by(*self._order_clauses(column, descending))
+
+    async def iter_all(
+        self,
+        db: AsyncSession,
+        filters: Optional[Dict[str, Any]] = None,
+        chunk_size: int = 1000
+    ) -> AsyncIterator[ModelType]:
+        """Walk every matching row in keyset chunks of ``chunk_size`` (see ``BaseRepository.iter_all``)"""
+        cursor = None
+        while True:
+            chunk = await self.get_multi(db, limit=chunk_size, filters=filters, cursor=cursor)
+            for obj in chunk:
+                yield obj
+            cursor = self.next_cursor(chunk, chunk_size)
+            for obj in chunk:
+                db.expunge(obj)
+            if not cursor:
+                break
+
+    async def stream(
+        self,
+        db: AsyncSession,
+        filters: Optional[Dict[str, Any]] = None,
+        chunk_size: int = 1000
+    ) -> AsyncIterator[ModelType]:
+        """Walk every matching row over a single server-side cursor"""
+        stmt = self._apply_filters(select(self.model), filters).order_by(self.model.id)
+        result = await db.stream_scalars(stmt.execution_options(yield_per=chunk_size))
+        async for obj in result:
+            yield obj
+
+    async def create(self, db: AsyncSession, obj_in: Dict[str, Any]) -> ModelType:
+        """Create a new record"""
+        obj_in_data = jsonable_encoder(obj_in)
+        db_obj = self.model(**obj_in_data)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        db_obj: ModelType,
+        obj_in: Dict[str, Any]
+    ) -> ModelType:
+        """Update an existing record"""
+        obj_data = jsonable_encoder(db_obj)
+        update_data = obj_in if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=True)
+
+        for field in obj_data:
+            if field in update_data:
+                setattr(db_obj, field, update_data[field])
+
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def delete(self, db: AsyncSession, id: int) -> ModelType:
+        """Delete a record"""
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
+        return obj
+
+    async def count(self, db: AsyncSession, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count records with optional filters"""
+        stmt = self._apply_filters(select(func.count(self.model.id)), filters)
+        return (await db.execute(stmt)).scalar()
+
+    async def search(
+        self,
+        db: AsyncSession,
+        search_term: str,
+        search_fields: List[str],
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[ModelType]:
+        """Search records across multiple fields"""
+        stmt = select(self.model)
+
+        if search_term:
+            search_filters = [
+                getattr(self.model, field).ilike(f"%{search_term}%")
+                for field in search_fields
+                if hasattr(self.model, field)
+            ]
+            if search_filters:
+                stmt = stmt.where(or_(*search_filters))
+
+        result = await db.execute(stmt.offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def bulk_create(self, db: AsyncSession, objects: List[Dict[str, Any]]) -> List[ModelType]:
+        """Bulk create multiple records"""
+        db_objects = [self.model(**obj) for obj in objects]
+        db.add_all(db_objects)
+        await db.commit()
+        return db_objects
+
+    async def bulk_update(self, db: AsyncSession, updates: List[Dict[str, Any]]) -> int:
+        """Bulk update multiple records"""
+        count = 0
+        for values in updates:
+            if 'id' in values:
+                obj_id = values.pop('id')
+                await db.execute(
+                    sql_update(self.model).where(self.model.id == obj_id).values(**values)
+                )
+                count += 1
+        await db.commit()
+        return count
+
+    async def bulk_upsert(
+        self,
+        db: AsyncSession,
+        rows: List[Dict[str, Any]],
+        conflict_keys: List[str],
+        chunk_size: int = 1000
+    ) -> Dict[str, int]:
+        """
+        Insert or update ``rows`` matched on ``conflict_keys`` (see ``BaseRepository.bulk_upsert``).
+
+        The dialect-specific statements are run through ``run_sync`` on the
+        session's connection instead of being duplicated here.
+        """
+        return await db.run_sync(
+            lambda session: BaseRepository.bulk_upsert(self, session, rows, conflict_keys, chunk_size)
+        )
+
+    async def exists(self, db: AsyncSession, id: int) -> bool:
+        """Check if a record exists"""
+        stmt = select(select(self.model.id).where(self.model.id == id).exists())
+        return (await db.execute(stmt)).scalar()
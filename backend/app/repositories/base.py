@@ -1,20 +1,64 @@
 """
 Base Repository with CRUD operations
 """
-from typing import Generic, TypeVar, Type, Optional, List, Dict, Any
+import base64
+import json
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Generic, TypeVar, Type, Optional, List, Dict, Any, Tuple, Iterator
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, and_
+from sqlalchemy import func, or_, and_, select, text, tuple_
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from fastapi.encoders import jsonable_encoder
 
+from app.core.query_counter import REPEATS_OPTION
 from app.models.base import BaseModel
 
 ModelType = TypeVar("ModelType", bound=BaseModel)
 
+# Seconds an information_schema row estimate is reused before asking again
+APPROX_COUNT_TTL = 60
+_approx_counts: Dict[str, Tuple[float, int]] = {}
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not match the query"""
+
+
+class InvalidFieldError(ValueError):
+    """Raised when a projection names something that is not a column of the model"""
+
+
+def encode_cursor(order_by: Optional[str], key: Any, id: int) -> str:
+    """Build an opaque keyset cursor for the row ``(key, id)``"""
+    if isinstance(key, (date, datetime)):
+        key = key.isoformat()
+    elif isinstance(key, Decimal):
+        key = str(key)
+    raw = json.dumps({"o": order_by, "k": key, "i": id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Dict[str, Any]:
+    """Decode a cursor produced by ``encode_cursor``"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(data, dict) or not isinstance(data.get("i"), int):
+            raise ValueError(token)
+        return data
+    except ValueError as exc:
+        raise InvalidCursorError("Cursor inválido") from exc
+
 
 class BaseRepository(Generic[ModelType]):
     """
     Base repository with common CRUD operations
     """
+
+    # Keep multi-row statements under the driver / server bind-parameter limits
+    MAX_BIND_PARAMS = 30000
     
     def __init__(self, model: Type[ModelType]):
         self.model = model
@@ -22,6 +66,24 @@ class BaseRepository(Generic[ModelType]):
     def get(self, db: Session, id: int) -> Optional[ModelType]:
         """Get a single record by ID"""
         return db.query(self.model).filter(self.model.id == id).first()
+
+    def get_many(self, db: Session, ids: List[int]) -> List[ModelType]:
+        """Get several records by ID in a single query (missing IDs are skipped)"""
+        if not ids:
+            return []
+        return db.query(self.model).filter(self.model.id.in_(set(ids))).all()
+
+    def get_owned(self, db: Session, id: int, owner_col: str, owner_id: int) -> Optional[ModelType]:
+        """
+        Get a record by ID only if it belongs to ``owner_id``.
+
+        Existence and ownership are checked by the same primary-key lookup, so
+        nested routes don't need to load the owner row first.
+        """
+        return db.query(self.model).filter(
+            self.model.id == id,
+            getattr(self.model, owner_col) == owner_id
+        ).first()
     
     def get_multi(
         self,
@@ -29,12 +91,212 @@ class BaseRepository(Generic[ModelType]):
         skip: int = 0,
         limit: int = 100,
         filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[Any]:
+        """
+        Get multiple records with pagination and filters.
+
+        Rows are always ordered by ``(order_by, id)``. When ``cursor`` is given
+        the page starts right after the row it points to (keyset pagination)
+        and ``skip`` is ignored, so deep pages cost the same as the first one.
+
+        When ``fields`` is given only those columns (plus ``id`` and the sort
+        column) are selected and plain dicts are returned instead of ORM objects.
+        """
+        query = self._list_query(db, filters, order_by, cursor, fields)
+        if not cursor:
+            query = query.offset(skip)
+        rows = query.limit(limit).all()
+        if fields:
+            return [row._asdict() for row in rows]
+        return rows
+
+    def get_page(
+        self,
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        count: str = "window"
+    ) -> Tuple[List[Any], Optional[int]]:
+        """
+        Same page as ``get_multi`` plus the total number of matching rows.
+
+        ``count`` picks how the total is obtained:
+
+        - ``"window"``: ``COUNT(*) OVER()`` in the page query itself, one round
+          trip. With a cursor it would only count the rows after it, so no
+          total is returned in keyset mode.
+        - ``"approx"``: the table estimate from ``information_schema`` (MariaDB,
+          cached ``APPROX_COUNT_TTL`` seconds). Only valid without filters;
+          otherwise an exact count is used.
+        - ``"exact"``: a separate ``COUNT(*)`` with the same filters.
+        - ``"none"``: no total.
+        """
+        total = None
+        if count == "approx":
+            total = None if filters else self.approximate_count(db)
+            if total is None:
+                count = "exact"
+
+        if count == "window" and not cursor:
+            total_column = func.count().over().label("_total")
+            query = self._list_query(db, filters, order_by, None, fields, extra_columns=[total_column])
+            rows = query.offset(skip).limit(limit).all()
+            if rows:
+                total = rows[0]._total
+            else:
+                total = self.count(db, filters=filters) if skip else 0
+            if fields:
+                items = [row._asdict() for row in rows]
+                for item in items:
+                    del item["_total"]
+            else:
+                items = [row[0] for row in rows]
+            return items, total
+
+        items = self.get_multi(
+            db, skip=skip, limit=limit, filters=filters, order_by=order_by, cursor=cursor, fields=fields
+        )
+        if count == "exact":
+            total = self.count(db, filters=filters)
+        return items, total
+
+    def approximate_count(self, db: Session) -> Optional[int]:
+        """Row estimate kept by InnoDB in information_schema; None when not on MariaDB"""
+        if db.get_bind().dialect.name not in ("mysql", "mariadb"):
+            return None
+        table_name = self.model.__table__.name
+        now = time.monotonic()
+        cached = _approx_counts.get(table_name)
+        if cached and now - cached[0] < APPROX_COUNT_TTL:
+            return cached[1]
+        value = db.execute(
+            text(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :name"
+            ),
+            {"name": table_name},
+        ).scalar()
+        if value is None:
+            return None
+        _approx_counts[table_name] = (now, int(value))
+        return int(value)
+
+    def _list_query(
+        self,
+        db: Session,
+        filters: Optional[Dict[str, Any]],
+        order_by: Optional[str],
+        cursor: Optional[str],
+        fields: Optional[List[str]],
+        extra_columns: Optional[List[Any]] = None
+    ):
+        """Filtered, ordered query shared by get_multi and get_page (no offset/limit)"""
+        column, descending = self._order_column(order_by)
+        entities = self._entities(fields, column)
+        query = self._apply_filters(db.query(*entities, *(extra_columns or [])), filters)
+
+        if cursor:
+            query = query.filter(self._keyset_filter(column, descending, order_by, cursor))
+        return query.order_by(*self._order_clauses(column, descending))
+
+    def _entities(self, fields: Optional[List[str]], order_column) -> List[Any]:
+        """The model itself, or the projected columns when ``fields`` is given"""
+        if fields:
+            return [getattr(self.model, name) for name in self._projection(fields, order_column)]
+        return [self.model]
+
+    def _order_clauses(self, column, descending: bool) -> List[Any]:
+        """ORDER BY for ``(column, id)``, both in the same direction"""
+        id_column = self.model.id.desc() if descending else self.model.id
+        if column is not None:
+            return [column.desc() if descending else column, id_column]
+        return [id_column]
+
+    def next_cursor(
+        self,
+        items: List[Any],
+        limit: int,
         order_by: Optional[str] = None
-    ) -> List[ModelType]:
-        """Get multiple records with pagination and filters"""
-        query = db.query(self.model)
-        
-        # Apply filters
+    ) -> Optional[str]:
+        """Cursor for the page following ``items``, or None on the last page"""
+        if not items or len(items) < limit:
+            return None
+        column, _ = self._order_column(order_by)
+        last = items[-1]
+        if isinstance(last, dict):
+            key = last[column.key] if column is not None else None
+            return encode_cursor(order_by, key, last["id"])
+        key = getattr(last, column.key) if column is not None else None
+        return encode_cursor(order_by, key, last.id)
+
+    def _projection(self, fields: List[str], order_column) -> List[str]:
+        """Column names to select for ``fields``; id and the sort column are always included"""
+        table = self.model.__table__
+        unknown = [name for name in fields if name not in table.c]
+        if unknown:
+            raise InvalidFieldError(f"Campos no válidos: {', '.join(unknown)}")
+        selected = ["id"] + [name for name in fields if name != "id"]
+        if order_column is not None and order_column.key not in selected:
+            selected.append(order_column.key)
+        return selected
+
+    def iter_all(
+        self,
+        db: Session,
+        filters: Optional[Dict[str, Any]] = None,
+        chunk_size: int = 1000
+    ) -> Iterator[ModelType]:
+        """
+        Walk every matching row in keyset chunks of ``chunk_size``.
+
+        Each chunk is a short independent query. Before the chunk is handed
+        to the caller its rows are expunged and the transaction is rolled
+        back, so the connection goes back to the pool (and MariaDB drops the
+        read snapshot) while the caller is slow, e.g. during a download.
+        Memory stays bounded by a single chunk. The rollback discards any
+        pending work, so ``db`` must be a session dedicated to the walk.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        cursor = None
+        while True:
+            # Same statement once per chunk by design: not an N+1
+            query = self._list_query(db, filters, None, cursor, None).execution_options(**{REPEATS_OPTION: True})
+            chunk = query.limit(chunk_size).all()
+            cursor = self.next_cursor(chunk, chunk_size)
+            for obj in chunk:
+                db.expunge(obj)
+            db.rollback()
+            yield from chunk
+            if not cursor:
+                break
+
+    def stream(
+        self,
+        db: Session,
+        filters: Optional[Dict[str, Any]] = None,
+        chunk_size: int = 1000
+    ) -> Iterator[ModelType]:
+        """
+        Walk every matching row over a single server-side cursor.
+
+        With pymysql this uses ``SSCursor``: rows are fetched from MariaDB as
+        they are consumed instead of being buffered by the driver. The
+        connection stays busy until the iterator is exhausted, so prefer
+        ``iter_all`` when the consumer is a remote client.
+        """
+        query = self._apply_filters(db.query(self.model), filters).order_by(self.model.id)
+        yield from query.execution_options(stream_results=True).yield_per(chunk_size)
+
+    def _apply_filters(self, query, filters: Optional[Dict[str, Any]]):
+        """Apply equality / IN filters for known model attributes"""
         if filters:
             for key, value in filters.items():
                 if hasattr(self.model, key):
@@ -42,15 +304,59 @@ class BaseRepository(Generic[ModelType]):
                         query = query.filter(getattr(self.model, key).in_(value))
                     else:
                         query = query.filter(getattr(self.model, key) == value)
-        
-        # Apply ordering
-        if order_by:
-            if order_by.startswith('-'):
-                query = query.order_by(getattr(self.model, order_by[1:]).desc())
-            else:
-                query = query.order_by(getattr(self.model, order_by))
-        
-        return query.offset(skip).limit(limit).all()
+        return query
+
+    def _order_column(self, order_by: Optional[str]) -> Tuple[Any, bool]:
+        """Resolve ``order_by`` ("field" or "-field") to (column, descending)"""
+        if not order_by:
+            return None, False
+        descending = order_by.startswith('-')
+        name = order_by[1:] if descending else order_by
+        if name == 'id':
+            return None, descending
+        return getattr(self.model, name), descending
+
+    def _keyset_filter(self, column, descending: bool, order_by: Optional[str], cursor: str):
+        """WHERE clause selecting the rows that sort after the cursor position"""
+        data = decode_cursor(cursor)
+        if data.get("o") != order_by:
+            raise InvalidCursorError("El cursor no corresponde al orden solicitado")
+
+        last_id = data["i"]
+        after_id = self.model.id < last_id if descending else self.model.id > last_id
+        if column is None:
+            return after_id
+
+        key = self._coerce_key(column, data.get("k"))
+        # MariaDB sorts NULLs first in ascending order and last in descending order
+        if key is None:
+            if descending:
+                return and_(column.is_(None), after_id)
+            return or_(column.isnot(None), and_(column.is_(None), after_id))
+
+        after_key = column < key if descending else column > key
+        condition = or_(after_key, and_(column == key, after_id))
+        if descending:
+            condition = or_(condition, column.is_(None))
+        return condition
+
+    @staticmethod
+    def _coerce_key(column, value: Any) -> Any:
+        """Turn a JSON cursor value back into the column's Python type"""
+        if value is None:
+            return None
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return value
+        try:
+            if python_type in (date, datetime):
+                return python_type.fromisoformat(value)
+            if python_type is Decimal:
+                return Decimal(value)
+        except (TypeError, ValueError, ArithmeticError) as exc:
+            raise InvalidCursorError("Cursor inválido") from exc
+        return value
     
     def create(self, db: Session, obj_in: Dict[str, Any]) -> ModelType:
         """Create a new record"""
@@ -89,13 +395,7 @@ class BaseRepository(Generic[ModelType]):
     
     def count(self, db: Session, filters: Optional[Dict[str, Any]] = None) -> int:
         """Count records with optional filters"""
-        query = db.query(func.count(self.model.id))
-        
-        if filters:
-            for key, value in filters.items():
-                if hasattr(self.model, key):
-                    query = query.filter(getattr(self.model, key) == value)
-        
+        query = self._apply_filters(db.query(func.count(self.model.id)), filters)
         return query.scalar()
     
     def search(
@@ -140,6 +440,131 @@ class BaseRepository(Generic[ModelType]):
         db.commit()
         return count
     
+    def bulk_upsert(
+        self,
+        db: Session,
+        rows: List[Dict[str, Any]],
+        conflict_keys: List[str],
+        chunk_size: int = 1000
+    ) -> Dict[str, int]:
+        """
+        Insert or update ``rows`` matched on ``conflict_keys`` (e.g. ``["payroll_number"]``).
+
+        Rows are written with one multi-row statement per chunk:
+        ``INSERT ... ON DUPLICATE KEY UPDATE`` on MariaDB, ``MERGE`` on Oracle and
+        ``INSERT ... ON CONFLICT DO UPDATE`` on SQLite/PostgreSQL. Every row must
+        carry the same columns; when a key appears twice the last row wins.
+        On MariaDB any unique index triggers the update, so ``conflict_keys``
+        should name the unique column the data is keyed on.
+
+        Returns ``{"inserted": n, "updated": m}``.
+        """
+        if not rows:
+            return {"inserted": 0, "updated": 0}
+
+        table = self.model.__table__
+        columns = [name for name in rows[0] if name in table.c]
+        missing = [key for key in conflict_keys if key not in columns]
+        if missing:
+            raise ValueError(f"Las filas no incluyen las columnas clave: {', '.join(missing)}")
+        if any(set(row) != set(rows[0]) for row in rows):
+            raise ValueError("Todas las filas deben tener las mismas columnas")
+
+        # Deduplicate on the conflict key so MERGE never matches a target row twice
+        unique_rows: Dict[Tuple, Dict[str, Any]] = {}
+        for row in rows:
+            unique_rows[tuple(row[key] for key in conflict_keys)] = {name: row[name] for name in columns}
+        values = list(unique_rows.values())
+
+        update_columns = [name for name in columns if name not in conflict_keys and name != "id"]
+        per_chunk = max(1, min(chunk_size, self.MAX_BIND_PARAMS // len(columns)))
+        dialect = db.get_bind().dialect.name
+
+        inserted = updated = 0
+        for start in range(0, len(values), per_chunk):
+            chunk = values[start:start + per_chunk]
+            existing = self._count_existing(db, chunk, conflict_keys)
+
+            if dialect in ("mysql", "mariadb"):
+                self._upsert_mysql(db, chunk, conflict_keys, update_columns)
+            elif dialect == "oracle":
+                self._merge_oracle(db, chunk, columns, conflict_keys, update_columns)
+            elif dialect in ("sqlite", "postgresql"):
+                self._upsert_on_conflict(db, dialect, chunk, conflict_keys, update_columns)
+            else:
+                raise NotImplementedError(f"bulk_upsert no soporta el dialecto {dialect}")
+
+            updated += existing
+            inserted += len(chunk) - existing
+
+        db.commit()
+        return {"inserted": inserted, "updated": updated}
+
+    def _count_existing(self, db: Session, chunk: List[Dict[str, Any]], conflict_keys: List[str]) -> int:
+        """How many rows of ``chunk`` already exist, matched on ``conflict_keys``"""
+        table = self.model.__table__
+        if len(conflict_keys) == 1:
+            key = conflict_keys[0]
+            condition = table.c[key].in_([row[key] for row in chunk])
+        else:
+            condition = tuple_(*[table.c[key] for key in conflict_keys]).in_(
+                [tuple(row[key] for key in conflict_keys) for row in chunk]
+            )
+        return db.execute(select(func.count()).select_from(table).where(condition)).scalar()
+
+    def _upsert_mysql(self, db: Session, chunk, conflict_keys, update_columns) -> None:
+        table = self.model.__table__
+        stmt = mysql.insert(table).values(chunk)
+        set_ = {name: stmt.inserted[name] for name in update_columns}
+        if "updated_at" in table.c and "updated_at" not in set_:
+            set_["updated_at"] = func.current_timestamp()
+        if not set_:
+            set_ = {conflict_keys[0]: table.c[conflict_keys[0]]}
+        db.execute(stmt.on_duplicate_key_update(set_))
+
+    def _upsert_on_conflict(self, db: Session, dialect: str, chunk, conflict_keys, update_columns) -> None:
+        table = self.model.__table__
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert(table).values(chunk)
+        set_ = {name: stmt.excluded[name] for name in update_columns}
+        if "updated_at" in table.c and "updated_at" not in set_:
+            set_["updated_at"] = func.current_timestamp()
+        db.execute(stmt.on_conflict_do_update(index_elements=conflict_keys, set_=set_))
+
+    def _merge_oracle(self, db: Session, chunk, columns, conflict_keys, update_columns) -> None:
+        table = self.model.__table__
+        quote = db.get_bind().dialect.identifier_preparer.quote
+
+        params: Dict[str, Any] = {}
+        selects = []
+        for i, row in enumerate(chunk):
+            fields = []
+            for j, name in enumerate(columns):
+                params[f"p{i}_{j}"] = row[name]
+                fields.append(f":p{i}_{j} AS {quote(name)}")
+            selects.append(f"SELECT {', '.join(fields)} FROM dual")
+
+        on = " AND ".join(f"t.{quote(key)} = s.{quote(key)}" for key in conflict_keys)
+        set_ = [f"t.{quote(name)} = s.{quote(name)}" for name in update_columns]
+        insert_columns = [quote(name) for name in columns]
+        insert_values = [f"s.{quote(name)}" for name in columns]
+        if "id" not in columns:
+            # schema.sql creates one sequence per table (seq_<table>) instead of identity columns
+            insert_columns.append("id")
+            insert_values.append(f"seq_{table.name}.NEXTVAL")
+        for name in ("created_at", "updated_at"):
+            if name in table.c and name not in columns:
+                insert_columns.append(name)
+                insert_values.append("CURRENT_TIMESTAMP")
+        if "updated_at" in table.c and "updated_at" not in columns:
+            set_.append("t.updated_at = CURRENT_TIMESTAMP")
+
+        sql = f"MERGE INTO {quote(table.name)} t USING ({' UNION ALL '.join(selects)}) s ON ({on})"
+        if set_:
+            sql += f" WHEN MATCHED THEN UPDATE SET {', '.join(set_)}"
+        sql += f" WHEN NOT MATCHED THEN INSERT ({', '.join(insert_columns)}) VALUES ({', '.join(insert_values)})"
+        db.execute(text(sql), params)
+    
     def exists(self, db: Session, id: int) -> bool:
         """Check if a record exists"""
         return db.query(
@@ -0,0 +1,25 @@
+# app/repositories/refresh_token_repository.py
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.repositories.base import BaseRepository
+from app.models.refresh_token import RefreshToken
+from typing import Optional
+
+class RefreshTokenRepository(BaseRepository[RefreshToken]):
+    def __init__(self):
+        super().__init__(RefreshToken)
+
+    def get_by_hash(self, db: Session, token_hash: str, for_update: bool = False) -> Optional[RefreshToken]:
+        query = db.query(self.model).filter(self.model.token_hash == token_hash)
+        if for_update:
+            # Dos refresh simultáneos con el mismo token se serializan: el segundo cuenta como reuso
+            query = query.with_for_update()
+        return query.first()
+
+    def revoke_family(self, db: Session, family_id: str) -> int:
+        count = db.query(self.model).filter(
+            self.model.family_id == family_id,
+            self.model.revoked_at.is_(None)
+        ).update({self.model.revoked_at: datetime.utcnow()}, synchronize_session=False)
+        db.commit()
+        return count
@@ -9,3 +9,7 @@ class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
     expires_in: int | None = None
+    refresh_token: str | None = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
@@ -0,0 +1,105 @@
+"""
+Benchmark: acceso sync (threadpool) vs async a la base de datos.
+
+Las rutas `def` de FastAPI corren en el threadpool de AnyIO (40 hilos por
+defecto), así que con más peticiones concurrentes que hilos el resto espera
+turno aunque la CPU esté libre. Este script reproduce ambos caminos contra la
+misma base de datos y la misma consulta de listado:
+
+- sync:  BaseRepository + SessionLocal dentro de anyio.to_thread.run_sync
+- async: AsyncBaseRepository + AsyncSession en el event loop
+
+Uso (desde backend/, con el .env apuntando a MariaDB):
+
+    python -m benchmarks.async_db --concurrency 200 --requests 5000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+import anyio
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+load_dotenv()
+
+from app.config.settings import settings  # noqa: E402
+from app.models.turno import Turno  # noqa: E402
+from app.repositories.async_base import AsyncBaseRepository  # noqa: E402
+from app.repositories.base import BaseRepository  # noqa: E402
+
+
+async def run_load(call: Callable[[], Awaitable[None]], total: int, concurrency: int) -> dict:
+    """Lanza ``total`` llamadas con como máximo ``concurrency`` en vuelo"""
+    latencies: List[float] = []
+    pending = iter(range(total))
+
+    async def worker():
+        for _ in pending:
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def main(args):
+    pool = dict(pool_size=args.pool_size, max_overflow=0, pool_timeout=60)
+
+    sync_engine = create_engine(settings.DATABASE_URL, **pool)
+    SyncSession = sessionmaker(bind=sync_engine, autoflush=False)
+    sync_repo = BaseRepository(Turno)
+
+    async_engine = create_async_engine(settings.ASYNC_DATABASE_URL, **pool)
+    AsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    async_repo = AsyncBaseRepository(Turno)
+
+    def sync_query():
+        db = SyncSession()
+        try:
+            sync_repo.get_multi(db, limit=args.limit)
+        finally:
+            db.close()
+
+    async def sync_call():
+        await anyio.to_thread.run_sync(sync_query)
+
+    async def async_call():
+        async with AsyncSession() as db:
+            await async_repo.get_multi(db, limit=args.limit)
+
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    print(f"concurrencia={args.concurrency} peticiones={args.requests} "
+          f"pool={args.pool_size} hilos={limiter.total_tokens:.0f}")
+
+    for name, call in (("sync", sync_call), ("async", async_call)):
+        await run_load(call, min(args.requests, 200), args.concurrency)  # calentar el pool
+        result = await run_load(call, args.requests, args.concurrency)
+        print(f"{name:>5}: {result['rps']:8.1f} req/s  p50={result['p50_ms']:.1f}ms  "
+              f"p95={result['p95_ms']:.1f}ms  p99={result['p99_ms']:.1f}ms")
+
+    sync_engine.dispose()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--pool-size", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20, help="filas por consulta")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,84 @@
+"""
+Benchmark: serialización de listados, Pydantic + json vs filas + orjson.
+
+Pide los mismos listados a la aplicación completa (vía TestClient, sin red)
+con ``pagination.FAST_SERIALIZATION`` apagado y encendido:
+
+- apagado: objetos ORM -> validación del response_model -> jsonable_encoder
+  -> json.dumps (el camino de FastAPI),
+- encendido: solo las columnas del esquema como dicts -> orjson.
+
+Comprueba antes que ambos caminos devuelven exactamente los mismos bytes.
+Limitación de tasa y auditoría se desactivan para medir solo el listado.
+
+Uso (desde backend/, con el .env apuntando a MariaDB con datos):
+
+    python -m benchmarks.list_serialization --repeat 50
+"""
+import argparse
+import os
+import statistics
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["AUDIT_LOG_ENABLED"] = "false"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core import pagination  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.main import app  # noqa: E402
+
+URLS = ("/api/v1/users/?limit=1000", "/api/v1/payroll/?limit=1000")
+
+
+def measure(client: TestClient, url: str, headers: dict, repeat: int) -> dict:
+    for _ in range(3):
+        client.get(url, headers=headers)
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000,
+        "rows": len(response.json()),
+        "bytes": len(response.content),
+    }
+
+
+def main(args):
+    token = create_access_token({"sub": str(args.user_id), "role": "admin"})
+    headers = {"Authorization": f"Bearer {token}"}
+    with TestClient(app) as client:
+        for url in args.urls:
+            pagination.FAST_SERIALIZATION = False
+            slow_body = client.get(url, headers=headers).content
+            pagination.FAST_SERIALIZATION = True
+            fast_body = client.get(url, headers=headers).content
+            if slow_body != fast_body:
+                print(f"{url}: ¡las respuestas difieren!")
+
+            pagination.FAST_SERIALIZATION = False
+            slow = measure(client, url, headers, args.repeat)
+            pagination.FAST_SERIALIZATION = True
+            fast = measure(client, url, headers, args.repeat)
+
+            print(f"{url}  filas={fast['rows']} bytes={fast['bytes']}")
+            for label, result in (("pydantic + json", slow), ("filas + orjson", fast)):
+                print(f"  {label:<16} p50={result['p50_ms']:8.2f} ms  p95={result['p95_ms']:8.2f} ms")
+            print(f"  mejora p50: x{slow['p50_ms'] / fast['p50_ms']:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--user-id", type=int, default=1, help="sub del token de prueba")
+    parser.add_argument("urls", nargs="*", default=list(URLS))
+    main(parser.parse_args())
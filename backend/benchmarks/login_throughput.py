@@ -0,0 +1,60 @@
+"""
+Benchmark: verificaciones bcrypt por segundo según el número de hilos del pool de hashing.
+
+Simula una avalancha de logins (cambio de turno) contra PasswordHasher con
+1, 2, 4, ... hilos hasta el número de núcleos, con el costo de BCRYPT_ROUNDS.
+Sirve para elegir PASSWORD_HASH_WORKERS y PASSWORD_HASH_MAX_PENDING: el
+rendimiento debería crecer casi lineal hasta los núcleos físicos.
+
+Uso (desde backend/):
+
+    python -m benchmarks.login_throughput --logins 400
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.config.settings import settings  # noqa: E402
+from app.core.hashing import PasswordHasher  # noqa: E402
+from app.core.security import pwd_ctx  # noqa: E402
+
+
+def worker_counts(max_workers: int):
+    n = 1
+    while n < max_workers:
+        yield n
+        n *= 2
+    yield max_workers
+
+
+async def run(workers: int, logins: int, hashed: str) -> float:
+    hasher = PasswordHasher(workers=workers, max_pending=logins)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(hasher.verify_and_update("password", hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    hasher.shutdown()
+    assert all(valid for valid, _ in results)
+    return logins / elapsed
+
+
+async def main(args):
+    cores = os.cpu_count() or 1
+    hashed = pwd_ctx.hash("password")
+    print(f"bcrypt rounds={settings.BCRYPT_ROUNDS} núcleos={cores} logins={args.logins}")
+    baseline = None
+    for workers in worker_counts(args.max_workers or cores):
+        rate = await run(workers, args.logins, hashed)
+        baseline = baseline or rate
+        print(f"hilos={workers:>3}: {rate:8.1f} logins/s  ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--max-workers", type=int, default=0, help="0 = número de núcleos")
+    asyncio.run(main(parser.parse_args()))
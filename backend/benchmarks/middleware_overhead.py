@@ -0,0 +1,148 @@
+"""
+Benchmark: costo por solicitud de la capa de middleware HTTP.
+
+Compara, sobre una ruta mínima y llamando a la aplicación ASGI directamente
+(sin red ni servidor), tres configuraciones:
+
+- sin middleware (referencia),
+- la pila anterior: SecurityHeaders + Audit + ``@app.middleware("http")``,
+  los tres sobre ``BaseHTTPMiddleware``,
+- ``HTTPObserverMiddleware`` con los mismos encabezados y la misma línea
+  de auditoría por ``print`` (la de producción va por ``AuditSink``).
+
+La salida de auditoría se descarta para que no cuente la consola.
+
+Uso (desde backend/):
+
+    python -m benchmarks.middleware_overhead --requests 20000
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from fastapi import FastAPI, Request  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from app.core.middleware import (  # noqa: E402
+    SECURITY_HEADERS,
+    HTTPObserverMiddleware,
+    process_time_header,
+    security_headers,
+)
+
+
+class LegacyAuditMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        process_time = round(time.time() - start_time, 3)
+        user_agent = request.headers.get("user-agent", "unknown")
+        print(f"[AUDIT] {request.method} {request.url.path} - {response.status_code} ({process_time}s) | {user_agent}")
+        return response
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        for name, value in SECURITY_HEADERS.items():
+            response.headers[name] = value
+        return response
+
+
+def print_audit(scope, status, elapsed):
+    user_agent = dict(scope["headers"]).get(b"user-agent", b"unknown").decode("latin-1")
+    print(f"[AUDIT] {scope['method']} {scope['path']} - {status} ({round(elapsed, 3)}s) | {user_agent}")
+
+
+def make_app(variant: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    if variant == "legacy":
+        app.add_middleware(LegacySecurityHeadersMiddleware)
+        app.add_middleware(LegacyAuditMiddleware)
+
+        @app.middleware("http")
+        async def add_process_time_header(request: Request, call_next):
+            start_time = time.time()
+            response = await call_next(request)
+            response.headers["X-Process-Time"] = str(time.time() - start_time)
+            return response
+
+    elif variant == "asgi":
+        app.add_middleware(
+            HTTPObserverMiddleware,
+            header_hooks=[security_headers(), process_time_header()],
+            completion_hooks=[print_audit],
+        )
+    return app
+
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/ping",
+    "raw_path": b"/ping",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"testserver"), (b"user-agent", b"benchmark")],
+    "client": ("127.0.0.1", 50000),
+    "server": ("testserver", 80),
+}
+
+
+async def call(app: FastAPI) -> int:
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(dict(SCOPE), receive, send)
+    return status
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    for _ in range(min(requests, 500)):
+        await call(app)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main(args):
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for variant in ("none", "legacy", "asgi"):
+            app = make_app(variant)
+            assert await call(app) == 200
+            results[variant] = await measure(app, args.requests)
+
+    base = results["none"]
+    print(f"solicitudes={args.requests}")
+    for variant, label in (("none", "sin middleware"), ("legacy", "BaseHTTPMiddleware x3"), ("asgi", "HTTPObserverMiddleware")):
+        overhead = results[variant] - base
+        print(f"{label:<24} {results[variant]:8.1f} µs/solicitud  (+{overhead:6.1f} µs)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=10000)
+    asyncio.run(main(parser.parse_args()))
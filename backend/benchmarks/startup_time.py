@@ -0,0 +1,208 @@
+"""
+Benchmark: arranque de un worker e importación por módulo.
+
+Lanza procesos nuevos (como hace uvicorn con --workers o al reiniciar) con
+LAZY_ROUTERS encendido y apagado, y mide en cada uno:
+
+- importar ``app.main``,
+- el startup de la aplicación (mappers, pool, auditoría, métricas),
+- la primera solicitud a cada ``--path`` (con un router perezoso incluye
+  importarlo),
+- tiempo hasta la primera respuesta desde que se lanzó el proceso.
+
+Con ``--imports`` muestra además los módulos que más tardan en importarse
+(``python -X importtime``), agrupando las dependencias por paquete.
+``--budget-ms`` hace fallar el script si importar ``app.main`` con routers
+perezosos supera ese tiempo, y ``--record`` añade el resultado a un archivo
+JSON lines para seguir la evolución entre versiones.
+
+Uso (desde backend/):
+
+    python -m benchmarks.startup_time --runs 5 --imports
+    python -m benchmarks.startup_time --path /api/v1/turnos/ --record startup.jsonl
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def _first_requests(paths: List[str]) -> Dict[str, float]:
+    """Dentro del proceso hijo: importar, arrancar y atender la primera solicitud"""
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    from app.main import app
+    timings["import_ms"] = (time.perf_counter() - started) * 1000
+
+    from app.core.security import create_access_token
+    token = create_access_token({"sub": "1", "role": "admin"}).encode()
+
+    lifespan_in: asyncio.Queue = asyncio.Queue()
+    lifespan_out: asyncio.Queue = asyncio.Queue()
+    started = time.perf_counter()
+    lifespan = asyncio.create_task(app({"type": "lifespan", "asgi": {"version": "3.0"}}, lifespan_in.get, lifespan_out.put))
+    await lifespan_in.put({"type": "lifespan.startup"})
+    message = await lifespan_out.get()
+    assert message["type"] == "lifespan.startup.complete", message
+    timings["startup_ms"] = (time.perf_counter() - started) * 1000
+
+    for path in paths:
+        status = 0
+        route, _, query = path.partition("?")
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        started = time.perf_counter()
+        request = app({
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": route,
+            "raw_path": route.encode(),
+            "root_path": "",
+            "query_string": query.encode(),
+            "headers": [(b"host", b"localhost"), (b"authorization", b"Bearer " + token)],
+            "client": ("127.0.0.1", 50000),
+            "server": ("localhost", 8000),
+        }, receive, send)
+        try:
+            await request
+        except Exception:
+            # Starlette vuelve a lanzar la excepción después de enviar el 500
+            pass
+        timings[f"GET {path}"] = (time.perf_counter() - started) * 1000
+        timings[f"GET {path} status"] = status
+    timings["ready_at"] = time.time()
+
+    await lifespan_in.put({"type": "lifespan.shutdown"})
+    await lifespan_out.get()
+    await lifespan
+    return timings
+
+
+def child(paths: List[str]) -> None:
+    timings = asyncio.run(_first_requests(paths))
+    sys.stdout.write("\n" + json.dumps(timings) + "\n")
+
+
+def run_worker(lazy: bool, paths: List[str]) -> Dict[str, float]:
+    env = dict(os.environ, LAZY_ROUTERS=str(lazy), LAZY_ROUTERS_PRELOAD="False")
+    spawned = time.time()
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup_time", "--child", *sum((["--path", p] for p in paths), [])],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode:
+        sys.exit(f"El proceso con LAZY_ROUTERS={lazy} falló:\n{result.stderr[-3000:]}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["first_response_ms"] = (timings.pop("ready_at") - spawned) * 1000
+    return timings
+
+
+def import_profile(lazy: bool) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """(ms de importar app.main, [(módulo, µs propios, µs acumulados)]) según ``-X importtime``"""
+    env = dict(os.environ, LAZY_ROUTERS=str(lazy))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    total = next(cumulative for name, _, cumulative in modules if name == "app.main")
+    return total / 1000, modules
+
+
+def print_import_profile(modules: List[Tuple[str, int, int]], top: int) -> None:
+    own = sorted((m for m in modules if m[0].split(".")[0] == "app"), key=lambda m: -m[1])[:top]
+    packages: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in modules:
+        if name.split(".")[0] != "app":
+            packages[name.split(".")[0]] += self_us
+    print(f"  módulos de la aplicación (top {top}, ms propios / acumulados):")
+    for name, self_us, cumulative_us in own:
+        print(f"    {name:<44} {self_us / 1000:7.1f} {cumulative_us / 1000:8.1f}")
+    print(f"  dependencias por paquete (top {top}, ms):")
+    for name, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"    {name:<44} {self_us / 1000:7.1f}")
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main(args):
+    record = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "revision": git_revision(), "runs": args.runs, "modes": {}}
+    exit_code = 0
+    for lazy in (True, False):
+        mode = "lazy" if lazy else "eager"
+        runs = [run_worker(lazy, args.path) for _ in range(args.runs)]
+        medians = {key: statistics.median(run[key] for run in runs) for key in runs[0] if not key.endswith("status")}
+        print(f"LAZY_ROUTERS={lazy}  (mediana de {args.runs} procesos)")
+        for key, value in medians.items():
+            print(f"  {key:<40} {value:8.1f} ms")
+        for key in runs[0]:
+            if key.endswith("status"):
+                print(f"  {key:<40} {runs[0][key]}")
+        record["modes"][mode] = {key: round(value, 1) for key, value in medians.items()}
+
+        if args.imports or (lazy and args.budget_ms):
+            total_ms, modules = import_profile(lazy)
+            record["modes"][mode]["importtime_ms"] = round(total_ms, 1)
+            print(f"  import app.main según -X importtime: {total_ms:.1f} ms")
+            if args.imports:
+                print_import_profile(modules, args.top)
+            if lazy and args.budget_ms and total_ms > args.budget_ms:
+                print(f"  ¡supera el presupuesto de {args.budget_ms:.0f} ms!")
+                exit_code = 1
+        print()
+
+    if args.record:
+        with open(args.record, "a", encoding="utf-8") as output:
+            output.write(json.dumps(record) + "\n")
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3, help="procesos por modo")
+    parser.add_argument("--path", action="append", help="ruta de la primera solicitud (repetible; por defecto /)")
+    parser.add_argument("--imports", action="store_true", help="mostrar el tiempo de importación por módulo")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=0, help="máximo para importar app.main con LAZY_ROUTERS")
+    parser.add_argument("--record", help="archivo JSON lines al que añadir el resultado")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.path = args.path or ["/"]
+    if args.child:
+        child(args.path)
+    else:
+        main(args)
@@ -25,6 +25,8 @@ CREATE SEQUENCE seq_employee_benefits START WITH 1 INCREMENT BY 1 NOCACHE;
 CREATE SEQUENCE seq_time_off_balances START WITH 1 INCREMENT BY 1 NOCACHE;
 CREATE SEQUENCE seq_payroll_history START WITH 1 INCREMENT BY 1 NOCACHE;
 CREATE SEQUENCE seq_job_history START WITH 1 INCREMENT BY 1 NOCACHE;
+CREATE SEQUENCE seq_refresh_tokens START WITH 1 INCREMENT BY 1 NOCACHE;
+CREATE SEQUENCE seq_audit_log START WITH 1 INCREMENT BY 1 NOCACHE;
 
 -- ============================================================================
 -- TABLE: users
@@ -676,6 +678,89 @@ CREATE INDEX idx_payroll_period ON payroll_history(payroll_period);
 
 
 
+
+
+-- ============================================================================
+
+-- TABLE: refresh_tokens
+
+-- ============================================================================
+
+
+
+CREATE TABLE refresh_tokens (
+
+    id                  NUMBER(10) PRIMARY KEY,
+
+    user_id             NUMBER(10) NOT NULL,
+
+    family_id           VARCHAR2(32) NOT NULL,
+
+    token_hash          CHAR(64) NOT NULL,
+
+    expires_at          TIMESTAMP NOT NULL,
+
+    used_at             TIMESTAMP,
+
+    revoked_at          TIMESTAMP,
+
+    created_at          TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    updated_at          TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT uk_refresh_token_hash UNIQUE (token_hash),
+
+    CONSTRAINT fk_refresh_token_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+
+);
+
+
+
+CREATE INDEX idx_refresh_tokens_user ON refresh_tokens(user_id);
+
+CREATE INDEX idx_refresh_tokens_family ON refresh_tokens(family_id);
+
+
+
+-- ============================================================================
+
+-- TABLE: audit_log
+
+-- ============================================================================
+
+
+CREATE TABLE audit_log (
+
+    id                  NUMBER(10) PRIMARY KEY,
+
+    user_id             NUMBER(10),
+
+    method              VARCHAR2(10) NOT NULL,
+
+    path                VARCHAR2(500) NOT NULL,
+
+    status_code         NUMBER(3) NOT NULL,
+
+    latency_ms          NUMBER(12,3) NOT NULL,
+
+    client_ip           VARCHAR2(45),
+
+    user_agent          VARCHAR2(255),
+
+    created_at          TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    updated_at          TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+
+);
+
+
+
+CREATE INDEX idx_audit_log_user ON audit_log(user_id);
+
+CREATE INDEX idx_audit_log_created ON audit_log(created_at);
+
+
+
 -- ============================================================================
 
 -- TRIGGERS
@@ -1098,6 +1183,56 @@ END;
 
 
 
+
+
+CREATE OR REPLACE TRIGGER trg_refresh_tokens_bi
+
+BEFORE INSERT ON refresh_tokens FOR EACH ROW
+
+BEGIN
+
+    IF :NEW.id IS NULL THEN
+
+        SELECT seq_refresh_tokens.NEXTVAL INTO :NEW.id FROM dual;
+
+    END IF;
+
+    :NEW.created_at := CURRENT_TIMESTAMP;
+
+    :NEW.updated_at := CURRENT_TIMESTAMP;
+
+END;
+
+/
+
+
+
+CREATE OR REPLACE TRIGGER trg_audit_log_bi
+
+BEFORE INSERT ON audit_log FOR EACH ROW
+
+BEGIN
+
+    IF :NEW.id IS NULL THEN
+
+        SELECT seq_audit_log.NEXTVAL INTO :NEW.id FROM dual;
+
+    END IF;
+
+    IF :NEW.created_at IS NULL THEN
+
+        :NEW.created_at := CURRENT_TIMESTAMP;
+
+    END IF;
+
+    :NEW.updated_at := CURRENT_TIMESTAMP;
+
+END;
+
+/
+
+
+
 -- ============================================================================
 
 -- INITIAL DATA - turnos
@@ -464,6 +464,45 @@ ALTER TABLE payroll_history
   ADD CONSTRAINT fk_payroll_employee FOREIGN KEY (employee_id) REFERENCES users(id),
   ADD CONSTRAINT fk_payroll_created_by FOREIGN KEY (created_by) REFERENCES users(id);
 
+-- ============================================================================
+-- TABLE: refresh_tokens
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    id                  INT AUTO_INCREMENT PRIMARY KEY,
+    user_id             INT NOT NULL,
+    family_id           VARCHAR(32) NOT NULL,
+    token_hash          CHAR(64) NOT NULL,
+    expires_at          DATETIME NOT NULL,
+    used_at             DATETIME,
+    revoked_at          DATETIME,
+    created_at          DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at          DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    UNIQUE KEY uk_refresh_token_hash (token_hash),
+    INDEX idx_refresh_tokens_user (user_id),
+    INDEX idx_refresh_tokens_family (family_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+ALTER TABLE refresh_tokens
+  ADD CONSTRAINT fk_refresh_token_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE;
+
+-- ============================================================================
+-- TABLE: audit_log
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS audit_log (
+    id                  INT AUTO_INCREMENT PRIMARY KEY,
+    user_id             INT,
+    method              VARCHAR(10) NOT NULL,
+    path                VARCHAR(500) NOT NULL,
+    status_code         INT NOT NULL,
+    latency_ms          DOUBLE NOT NULL,
+    client_ip           VARCHAR(45),
+    user_agent          VARCHAR(255),
+    created_at          DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at          DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_audit_log_user (user_id),
+    INDEX idx_audit_log_created (created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
 -- ============================================================================
 -- INITIAL DATA - turnos
 -- ============================================================================
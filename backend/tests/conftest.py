@@ -0,0 +1,95 @@
+# tests/conftest.py
+"""
+La aplicación contra SQLite en memoria, sin MariaDB ni archivos compartidos.
+
+Las variables se fijan antes de importar ``app``: ``settings`` se lee al
+importar y exige la configuración de la base de datos y ``JWT_SECRET``.
+"""
+import datetime
+import os
+import sys
+import tempfile
+
+import pytest
+
+os.environ.update({
+    "DB_TYPE": "mysql",
+    "DB_HOST": "localhost",
+    "DB_PORT": "3306",
+    "DB_NAME": "test",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "JWT_SECRET": "test-secret",
+    "ENVIRONMENT": "test",
+    "DATABASE_POOL_WARMUP": "False",
+    "RATE_LIMIT_ENABLED": "False",
+    "RESPONSE_CACHE_SHARED": "False",
+    "METRICS_ENABLED": "False",
+    "AUDIT_LOG_ENABLED": "False",
+    "QUERY_N_PLUS_ONE_ACTION": "raise",
+    "BCRYPT_ROUNDS": "4",
+    "TOKEN_REVOCATION_FILE": os.path.join(tempfile.mkdtemp(), "revoked_tokens.jsonl"),
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+import app.config.database as database  # noqa: E402
+
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+database.engine = engine
+database.SessionLocal.configure(bind=engine)
+
+from app.core.security import create_access_token  # noqa: E402
+from app.core.startup import load_models  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.payroll_history import PayrollHistory  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+load_models()
+
+
+@pytest.fixture()
+def db():
+    database.Base.metadata.create_all(engine)
+    session = database.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        database.Base.metadata.drop_all(engine)
+
+
+@pytest.fixture()
+def client(db):
+    return TestClient(app)
+
+
+@pytest.fixture()
+def auth_headers():
+    token = create_access_token({"sub": "1", "email": "admin@example.com", "role": "admin"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture()
+def payroll_rows(db):
+    """Un empleado con ``n`` registros de nómina"""
+    def create(n: int) -> int:
+        user = User(name="Empleado", email="empleado@example.com", password_hash="x")
+        db.add(user)
+        db.commit()
+        db.add_all([
+            PayrollHistory(
+                employee_id=user.id,
+                payroll_period=f"P{i}",
+                period_start=datetime.date(2024, 1, 1),
+                period_end=datetime.date(2024, 1, 14),
+                base_salary=1000,
+            )
+            for i in range(n)
+        ])
+        db.commit()
+        return user.id
+    return create
@@ -0,0 +1,98 @@
+# tests/test_auth.py
+import pytest
+
+from app.core.security import hash_password
+from app.models.user import User
+
+EMAIL = "empleado@example.com"
+PASSWORD = "secreto-123"
+
+
+@pytest.fixture()
+def login(client, db):
+    """Inicia sesión con un empleado nuevo y devuelve la respuesta de /auth/login"""
+    db.add(User(name="Empleado", email=EMAIL, password_hash=hash_password(PASSWORD)))
+    db.commit()
+
+    def run():
+        response = client.post("/api/v1/auth/login", json={"email": EMAIL, "password": PASSWORD})
+        assert response.status_code == 200
+        return response.json()
+    return run
+
+
+def refresh(client, token):
+    return client.post("/api/v1/auth/refresh", json={"refresh_token": token})
+
+
+def test_refresh_rotates_the_token(client, login):
+    first = login()["refresh_token"]
+
+    response = refresh(client, first)
+
+    assert response.status_code == 200
+    second = response.json()["refresh_token"]
+    assert second != first
+    assert refresh(client, second).status_code == 200
+
+
+def test_reused_refresh_token_revokes_the_family(client, login):
+    first = login()["refresh_token"]
+    second = refresh(client, first).json()["refresh_token"]
+
+    reused = refresh(client, first)
+    assert reused.status_code == 401
+    assert reused.json()["detail"] == "Refresh token reutilizado, sesión revocada"
+    # El token más nuevo de la misma sesión también deja de valer
+    assert refresh(client, second).status_code == 401
+
+
+def test_reuse_leaves_other_sessions_alone(client, login):
+    other = login()["refresh_token"]
+    first = login()["refresh_token"]
+    refresh(client, first)
+
+    assert refresh(client, first).status_code == 401
+    assert refresh(client, other).status_code == 200
+
+
+def test_refresh_after_logout(client, login):
+    tokens = login()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    response = client.post("/api/v1/auth/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers)
+
+    assert response.status_code == 204
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+    # El access token queda revocado también
+    assert client.get("/api/v1/users/", headers=headers).status_code == 403
+
+
+def test_logout_cannot_revoke_another_users_session(client, login, db):
+    victim = login()["refresh_token"]
+    db.add(User(name="Otro", email="otro@example.com", password_hash=hash_password(PASSWORD)))
+    db.commit()
+    attacker = client.post("/api/v1/auth/login", json={"email": "otro@example.com", "password": PASSWORD}).json()
+
+    client.post(
+        "/api/v1/auth/logout",
+        json={"refresh_token": victim},
+        headers={"Authorization": f"Bearer {attacker['access_token']}"},
+    )
+
+    assert refresh(client, victim).status_code == 200
+
+
+@pytest.mark.parametrize("token", ["", "basura", "abc.def.ghi", "a" * 500])
+def test_malformed_refresh_token(client, login, token):
+    login()
+    assert refresh(client, token).status_code == 401
+
+
+def test_refresh_token_with_a_forged_family(client, login):
+    family, tag, secret = login()["refresh_token"].split(".")
+    assert refresh(client, f"{'0' * len(family)}.{tag}.{secret}").status_code == 401
+
+
+def test_refresh_without_a_token(client):
+    assert client.post("/api/v1/auth/refresh", json={}).status_code == 422
@@ -0,0 +1,129 @@
+# tests/test_bulk_upsert.py
+import os
+import re
+
+import pytest
+from sqlalchemy.dialects import mysql, oracle
+
+from app.config.database import Base
+from app.models.horario_base import HorarioBase
+from app.models.user import User
+from app.repositories.horario_base_repository import HorarioBaseRepository
+from app.repositories.user_repository import UserRepository
+
+SCHEMA_SQL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "schema.sql")
+
+
+def employee(email, name="Empleado", payroll_number=None):
+    return {"email": email, "name": name, "password_hash": "x", "payroll_number": payroll_number}
+
+
+class RecordingSession:
+    """Sesión falsa con el dialecto dado: guarda lo que se ejecuta sin conectarse"""
+
+    def __init__(self, dialect):
+        self.dialect = dialect
+        self.executed = []
+
+    def get_bind(self):
+        return self
+
+    def execute(self, statement, params=None):
+        self.executed.append((statement, params))
+
+
+def test_counts_inserts_and_updates(db):
+    repo = UserRepository()
+    assert repo.bulk_upsert(db, [employee("a@example.com"), employee("b@example.com")], ["email"]) == {
+        "inserted": 2, "updated": 0,
+    }
+
+    result = repo.bulk_upsert(
+        db, [employee("a@example.com", name="Ana"), employee("c@example.com")], ["email"]
+    )
+
+    assert result == {"inserted": 1, "updated": 1}
+    names = {user.email: user.name for user in db.query(User).all()}
+    assert names == {"a@example.com": "Ana", "b@example.com": "Empleado", "c@example.com": "Empleado"}
+
+
+def test_last_duplicate_in_the_input_wins(db):
+    result = UserRepository().bulk_upsert(
+        db, [employee("a@example.com", name="Primero"), employee("a@example.com", name="Último")], ["email"]
+    )
+
+    assert result == {"inserted": 1, "updated": 0}
+    assert db.query(User).one().name == "Último"
+
+
+def test_matches_on_a_composite_key(db):
+    user = User(name="Empleado", email="empleado@example.com", password_hash="x")
+    db.add(user)
+    db.commit()
+    repo = HorarioBaseRepository()
+    repo.bulk_upsert(db, [{"empleado_id": user.id, "dia_semana": day, "turno_id": 1} for day in (0, 1)],
+                     ["empleado_id", "dia_semana"])
+
+    result = repo.bulk_upsert(
+        db,
+        [{"empleado_id": user.id, "dia_semana": 1, "turno_id": 2},
+         {"empleado_id": user.id, "dia_semana": 2, "turno_id": 2}],
+        ["empleado_id", "dia_semana"],
+    )
+
+    assert result == {"inserted": 1, "updated": 1}
+    turnos = {h.dia_semana: h.turno_id for h in db.query(HorarioBase).all()}
+    assert turnos == {0: 1, 1: 2, 2: 2}
+
+
+def test_counts_across_chunk_boundaries(db):
+    repo = UserRepository()
+    repo.bulk_upsert(db, [employee(f"u{i}@example.com") for i in range(3)], ["email"])
+
+    # 5 filas en cubetas de 2: las existentes caen en la primera y en la segunda
+    rows = [employee(f"u{i}@example.com", name="Nuevo") for i in range(5)]
+    result = repo.bulk_upsert(db, rows, ["email"], chunk_size=2)
+
+    assert result == {"inserted": 2, "updated": 3}
+    assert db.query(User).count() == 5
+    assert {user.name for user in db.query(User).all()} == {"Nuevo"}
+
+
+def test_rejects_rows_without_the_conflict_key(db):
+    with pytest.raises(ValueError):
+        UserRepository().bulk_upsert(db, [{"email": "a@example.com", "name": "x"}], ["payroll_number"])
+
+
+def test_mariadb_statement_compiles():
+    session = RecordingSession(mysql.dialect())
+    UserRepository()._upsert_mysql(session, [employee("a@example.com")], ["email"], ["name", "password_hash"])
+
+    statement, _ = session.executed[0]
+    sql = str(statement.compile(dialect=mysql.dialect()))
+    assert sql.startswith("INSERT INTO users")
+    assert "ON DUPLICATE KEY UPDATE name = VALUES(name), password_hash = VALUES(password_hash)" in sql
+    assert "updated_at = CURRENT_TIMESTAMP" in sql
+
+
+def test_oracle_merge_statement():
+    session = RecordingSession(oracle.dialect())
+    rows = [employee("a@example.com"), employee("b@example.com")]
+    columns = list(rows[0])
+    UserRepository()._merge_oracle(session, rows, columns, ["email"], ["name", "password_hash", "payroll_number"])
+
+    statement, params = session.executed[0]
+    sql = str(statement)
+    assert sql.startswith("MERGE INTO users t USING (SELECT :p0_0 AS email")
+    assert " UNION ALL SELECT :p1_0 AS email" in sql
+    assert "ON (t.email = s.email)" in sql
+    assert "WHEN MATCHED THEN UPDATE SET t.name = s.name" in sql
+    assert "VALUES (s.email, s.name, s.password_hash, s.payroll_number, seq_users.NEXTVAL" in sql
+    assert params["p1_0"] == "b@example.com"
+    # Cada parámetro del SQL tiene su valor
+    assert set(re.findall(r":(p\d+_\d+)", sql)) == set(params)
+
+
+def test_every_table_has_the_oracle_sequence_merge_relies_on():
+    with open(SCHEMA_SQL) as source:
+        sequences = set(re.findall(r"CREATE SEQUENCE seq_(\w+)", source.read()))
+    assert set(Base.metadata.tables) <= sequences
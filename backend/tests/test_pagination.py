@@ -0,0 +1,174 @@
+# tests/test_pagination.py
+import pytest
+
+from app.core import pagination
+from app.core.response_cache import response_cache
+from app.models.user import User
+from app.repositories.base import InvalidCursorError
+from app.repositories.user_repository import UserRepository
+
+TURNO = {"nombre": "Matutino", "codigo": "MAT", "hora_inicio": "06:00:00", "hora_fin": "14:00:00"}
+
+
+def walk(client, url, headers):
+    """Todas las páginas de ``url`` siguiendo X-Next-Cursor"""
+    pages = []
+    response = client.get(url, headers=headers)
+    while True:
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+        response = client.get(f"{url}&cursor={cursor}", headers=headers)
+
+
+def test_total_count_and_page_headers(client, auth_headers, payroll_rows):
+    payroll_rows(25)
+    response = client.get("/api/v1/payroll/?skip=10&limit=10", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 10
+    assert response.headers["X-Total-Count"] == "25"
+    assert response.headers["X-Page"] == "2"
+    assert response.headers["X-Per-Page"] == "10"
+
+
+@pytest.mark.parametrize("count, expected", [("exact", "25"), ("window", "25"), ("none", None)])
+def test_count_modes(client, auth_headers, payroll_rows, count, expected):
+    payroll_rows(25)
+    response = client.get(f"/api/v1/payroll/?limit=5&count={count}", headers=auth_headers)
+    assert response.headers.get("X-Total-Count") == expected
+
+
+def test_total_count_past_the_last_page(client, auth_headers, payroll_rows):
+    payroll_rows(5)
+    response = client.get("/api/v1/payroll/?skip=10&limit=10", headers=auth_headers)
+    assert response.json() == []
+    assert response.headers["X-Total-Count"] == "5"
+
+
+def test_cursor_walks_every_row_once(client, auth_headers, payroll_rows):
+    payroll_rows(25)
+    pages = walk(client, "/api/v1/payroll/?limit=10", auth_headers)
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    ids = [item["id"] for page in pages for item in page]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 25
+
+
+def test_invalid_cursor_is_rejected(client, auth_headers, payroll_rows):
+    payroll_rows(1)
+    response = client.get("/api/v1/payroll/?cursor=not-a-cursor", headers=auth_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("order_by", ["payroll_number", "-payroll_number", "name", "-id"])
+def test_keyset_matches_offset_order_with_nulls(db, order_by):
+    # NULL mezclados (payroll_number) y claves repetidas (name): el cursor debe
+    # recorrer lo mismo que un ORDER BY completo
+    numbers = [None, "B", "A", None, "C", None, "D", None, "E"]
+    db.add_all([
+        User(name=f"E{i % 3}", email=f"e{i}@example.com", password_hash="x", payroll_number=number)
+        for i, number in enumerate(numbers)
+    ])
+    db.commit()
+    repo = UserRepository()
+    expected = [user.id for user in repo.get_page(db, limit=100, order_by=order_by)[0]]
+
+    walked, cursor = [], None
+    while True:
+        items, _ = repo.get_page(db, limit=2, order_by=order_by, cursor=cursor)
+        walked += [user.id for user in items]
+        cursor = repo.next_cursor(items, 2, order_by)
+        if cursor is None:
+            break
+
+    assert walked == expected
+    assert len(expected) == len(numbers)
+
+
+def test_nulls_sort_first_ascending_and_last_descending(db):
+    db.add_all([
+        User(name="Con", email="con@example.com", password_hash="x", payroll_number="P1"),
+        User(name="Sin", email="sin@example.com", password_hash="x"),
+    ])
+    db.commit()
+    repo = UserRepository()
+
+    ascending, _ = repo.get_page(db, limit=1, order_by="payroll_number")
+    assert ascending[0].payroll_number is None
+    rest, _ = repo.get_page(db, limit=1, order_by="payroll_number",
+                            cursor=repo.next_cursor(ascending, 1, "payroll_number"))
+    assert rest[0].payroll_number == "P1"
+
+    descending, _ = repo.get_page(db, limit=1, order_by="-payroll_number")
+    assert descending[0].payroll_number == "P1"
+    rest, _ = repo.get_page(db, limit=1, order_by="-payroll_number",
+                            cursor=repo.next_cursor(descending, 1, "-payroll_number"))
+    assert rest[0].payroll_number is None
+
+
+def test_cursor_from_another_order_is_rejected(db):
+    db.add(User(name="E", email="e@example.com", password_hash="x"))
+    db.commit()
+    repo = UserRepository()
+    items, _ = repo.get_page(db, limit=1, order_by="name")
+    with pytest.raises(InvalidCursorError):
+        repo.get_page(db, limit=1, order_by="-name", cursor=repo.next_cursor(items, 1, "name"))
+
+
+def test_fields_projection(client, auth_headers, payroll_rows):
+    payroll_rows(3)
+    response = client.get("/api/v1/payroll/?fields=payroll_period,base_salary", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert [set(item) for item in response.json()] == [{"payroll_period", "base_salary"}] * 3
+    assert response.headers["X-Total-Count"] == "3"
+
+
+def test_fields_projection_with_cursor(client, auth_headers, payroll_rows):
+    payroll_rows(5)
+    pages = walk(client, "/api/v1/payroll/?limit=2&fields=payroll_period", auth_headers)
+    assert [item["payroll_period"] for page in pages for item in page] == [f"P{i}" for i in range(5)]
+
+
+def test_unknown_field_is_rejected(client, auth_headers, payroll_rows):
+    payroll_rows(1)
+    response = client.get("/api/v1/payroll/?fields=payroll_period,password_hash", headers=auth_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("url", ["/api/v1/payroll/?limit=50", "/api/v1/users/?limit=50"])
+def test_fast_serializer_matches_the_response_model(client, auth_headers, payroll_rows, monkeypatch, url):
+    payroll_rows(20)
+    fast = client.get(url, headers=auth_headers)
+    monkeypatch.setattr(pagination, "FAST_SERIALIZATION", False)
+    regular = client.get(url, headers=auth_headers)
+
+    assert fast.status_code == regular.status_code == 200
+    assert fast.json() == regular.json()
+    assert fast.headers["X-Total-Count"] == regular.headers["X-Total-Count"]
+
+
+def test_etag_and_not_modified(client, auth_headers):
+    response_cache.clear()
+    assert client.post("/api/v1/turnos/", json=TURNO, headers=auth_headers).status_code == 201
+
+    first = client.get("/api/v1/turnos/", headers=auth_headers)
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    assert first.headers["X-Total-Count"] == "1"
+
+    cached = client.get("/api/v1/turnos/", headers={**auth_headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    # Una escritura cambia la versión de la tabla: el ETag viejo ya no vale
+    client.post("/api/v1/turnos/", json={**TURNO, "codigo": "VES"}, headers=auth_headers)
+    changed = client.get("/api/v1/turnos/", headers={**auth_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()) == 2
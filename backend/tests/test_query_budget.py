@@ -0,0 +1,38 @@
+# tests/test_query_budget.py
+import pytest
+
+from app.core.query_counter import assert_max_queries
+
+
+def test_list_endpoint_runs_a_single_query(client, auth_headers, payroll_rows):
+    payroll_rows(50)
+    with assert_max_queries(1) as executed:
+        response = client.get("/api/v1/payroll/?limit=20", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 20
+    assert len(executed) == 1
+
+
+def test_nested_list_stays_within_budget(client, auth_headers, payroll_rows):
+    user_id = payroll_rows(30)
+    # Existencia del usuario + la página con su total
+    with assert_max_queries(2):
+        response = client.get(f"/api/v1/users/{user_id}/payroll-history/", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["X-Total-Count"] == "30"
+
+
+def test_assert_max_queries_fails_over_budget(client, auth_headers, payroll_rows):
+    user_id = payroll_rows(1)
+    with pytest.raises(AssertionError, match="Expected at most 1 queries, got 2"):
+        with assert_max_queries(1):
+            client.get(f"/api/v1/users/{user_id}/payroll-history/", headers=auth_headers)
+
+
+def test_chunked_export_is_not_reported_as_n_plus_one(client, auth_headers, payroll_rows):
+    # QUERY_N_PLUS_ONE_ACTION=raise: un falso positivo cortaría la descarga
+    payroll_rows(12)
+    with assert_max_queries(13):
+        response = client.get("/api/v1/payroll/export?chunk_size=1", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 12
@@ -9,6 +9,8 @@ if (!isset($_SESSION['token'])) {
 
 define('API_URL', 'http://localhost:8000/api/v1');
 
+require_once __DIR__ . '/api_client.php';
+
 // Get entity type
 $entityType = $_GET['type'] ?? 'users';
 $action = $_GET['action'] ?? 'list';
@@ -141,28 +143,13 @@ $currentEntity = $entities[$entityType] ?? $entities['users'];
 
 // API Helper Function
 function apiCall($endpoint, $method = 'GET', $data = null) {
-    $ch = curl_init(API_URL . $endpoint);
-    curl_setopt($ch, CURLOPT_RETURNTRANSFER, true);
-    curl_setopt($ch, CURLOPT_HTTPHEADER, [
-        'Authorization: Bearer ' . $_SESSION['token'],
-        'Content-Type: application/json'
-    ]);
-    
-    if ($method === 'POST') {
-        curl_setopt($ch, CURLOPT_POST, true);
-        curl_setopt($ch, CURLOPT_POSTFIELDS, json_encode($data));
-    } elseif ($method === 'PUT') {
-        curl_setopt($ch, CURLOPT_CUSTOMREQUEST, 'PUT');
-        curl_setopt($ch, CURLOPT_POSTFIELDS, json_encode($data));
-    } elseif ($method === 'DELETE') {
-        curl_setopt($ch, CURLOPT_CUSTOMREQUEST, 'DELETE');
+    $result = apiRequest($endpoint, $method, $data);
+    // The refresh token expired or was revoked: back to the login page
+    if (!isset($_SESSION['token'])) {
+        header('Location: index.php');
+        exit;
     }
-    
-    $response = curl_exec($ch);
-    $httpCode = curl_getinfo($ch, CURLINFO_HTTP_CODE);
-    curl_close($ch);
-    
-    return ['code' => $httpCode, 'data' => json_decode($response, true)];
+    return $result;
 }
 
 // Handle form submission
@@ -6,11 +6,15 @@ session_start();
 define('API_URL', 'http://localhost:8000/api/v1');
 define('APP_NAME', 'MDM - Master Data Management');
 
+require_once __DIR__ . '/api_client.php';
+
 // Check if user is logged in
 $isLoggedIn = isset($_SESSION['token']);
 
 // Handle logout
 if (isset($_GET['logout'])) {
+    // Revoke the access token and the refresh token family on the API side too
+    apiCall('/auth/logout', 'POST', ['refresh_token' => $_SESSION['refresh_token'] ?? '']);
     session_destroy();
     header('Location: index.php');
     exit;
@@ -24,7 +28,7 @@ if ($_SERVER['REQUEST_METHOD'] === 'POST' && isset($_POST['login'])) {
     $ch = curl_init(API_URL . '/auth/login');
     curl_setopt($ch, CURLOPT_RETURNTRANSFER, true);
     curl_setopt($ch, CURLOPT_POST, true);
-    curl_setopt($ch, CURLOPT_HTTPHEADER, ['Content-Type: application/json']);
+    curl_setopt($ch, CURLOPT_HTTPHEADER, ['Content-Type: application/json', forwardedFor()]);
     curl_setopt($ch, CURLOPT_POSTFIELDS, json_encode([
         'email' => $email,
         'password' => $password
@@ -37,6 +41,7 @@ if ($_SERVER['REQUEST_METHOD'] === 'POST' && isset($_POST['login'])) {
     if ($httpCode === 200) {
         $data = json_decode($response, true);
         $_SESSION['token'] = $data['access_token'];
+        $_SESSION['refresh_token'] = $data['refresh_token'] ?? null;
         $_SESSION['user'] = ['email' => $email];
         header('Location: index.php');
         exit;
@@ -47,31 +52,9 @@ if ($_SERVER['REQUEST_METHOD'] === 'POST' && isset($_POST['login'])) {
 
 // Function to make API calls
 function apiCall($endpoint, $method = 'GET', $data = null) {
-    if (!isset($_SESSION['token'])) return null;
-    
-    $ch = curl_init(API_URL . $endpoint);
-    curl_setopt($ch, CURLOPT_RETURNTRANSFER, true);
-    curl_setopt($ch, CURLOPT_HTTPHEADER, [
-        'Authorization: Bearer ' . $_SESSION['token'],
-        'Content-Type: application/json'
-    ]);
-    
-    if ($method === 'POST') {
-        curl_setopt($ch, CURLOPT_POST, true);
-        curl_setopt($ch, CURLOPT_POSTFIELDS, json_encode($data));
-    } elseif ($method === 'PUT') {
-        curl_setopt($ch, CURLOPT_CUSTOMREQUEST, 'PUT');
-        curl_setopt($ch, CURLOPT_POSTFIELDS, json_encode($data));
-    } elseif ($method === 'DELETE') {
-        curl_setopt($ch, CURLOPT_CUSTOMREQUEST, 'DELETE');
-    }
-    
-    $response = curl_exec($ch);
-    $httpCode = curl_getinfo($ch, CURLINFO_HTTP_CODE);
-    curl_close($ch);
-    
-    if ($httpCode >= 200 && $httpCode < 300) {
-        return json_decode($response, true);
+    $result = apiRequest($endpoint, $method, $data);
+    if ($result['code'] >= 200 && $result['code'] < 300) {
+        return $result['data'];
     }
     return null;
 }
@@ -79,16 +62,11 @@ function apiCall($endpoint, $method = 'GET', $data = null) {
 // Get statistics
 $stats = [];
 if ($isLoggedIn) {
-    $stats = [
-        'users' => count(apiCall('/users/') ?? []),
-        'absence_requests' => count(apiCall('/absence-requests/') ?? []),
-        'schedules' => count(apiCall('/horarios-base/') ?? []),
-        'payrolls' => count(apiCall('/payroll/') ?? []),
-        'audits' => count(apiCall('/auditoria-horarios/') ?? []),
-        'notifications' => count(apiCall('/notifications/') ?? []),
-        'turnos' => count(apiCall('/turnos/') ?? []),
-        'benefits' => count(apiCall('/benefits/') ?? []),
-    ];
+    // One call returns every total (plus per-status breakdowns) instead of eight list downloads
+    $summary = apiCall('/stats/summary')['counts'] ?? [];
+    $stats = array_map(fn($entry) => $entry['total'], $summary);
+    // The session could not be renewed: show the login form again
+    $isLoggedIn = isset($_SESSION['token']);
 }
 
 // MDM Entities Configuration